@@ -1,6 +1,44 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, Q
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import Contact, PhoneNumber
+from .filters import lower_startswith
+from .models import Contact, PhoneNumber, canonical_phone, normalize_email
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids `COUNT(*)` over whole big tables.
+    Notes:
+    - Unfiltered changelists use the planner's row estimate (PostgreSQL `reltuples`)
+      once it is above `estimate_threshold`; page counts may then be slightly off.
+    - Searches and filters, and backends without an estimate, keep the exact count.
+    """
+    estimate_threshold = 10_000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate > self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query") or queryset.query.has_filters():
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
 
 
 class PhoneNumberInline(admin.TabularInline):
@@ -8,13 +46,31 @@ class PhoneNumberInline(admin.TabularInline):
     extra = 1
     verbose_name_plural = "Phone Numbers"
 
+    def get_queryset(self, request):
+        # Each inline row renders str(phone), which reads the contact's name
+        return super().get_queryset(request).select_related("contact")
+
 
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "email_link", "phone_count", "created_at")
-    search_fields = ("name", "email")
+    # Searches by name prefix or exact email, see get_search_results
+    search_fields = ("^name", "=email")
     ordering = ("-created_at",)
     inlines = [PhoneNumberInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(phone_count=Count("phone_numbers"))
+
+    def get_search_results(self, request, queryset, search_term):
+        # Name prefixes are written against Lower(...) in byte order to use contact_name_lower_idx and emails
+        # against the canonical column; the default istartswith / iexact lookups can't use an index
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return queryset.filter(lower_startswith("name", term) | Q(email_canonical=normalize_email(term))), False
 
     def email_link(self, obj):
         return format_html('<a href="mailto:{}">{}</a>', obj.email, obj.email)
@@ -22,5 +78,33 @@ class ContactAdmin(admin.ModelAdmin):
     email_link.admin_order_field = "email"
 
     def phone_count(self, obj):
-        return obj.phone_numbers.count()
-    phone_count.short_description = "Phone Numbers"
\ No newline at end of file
+        return obj.phone_count
+    phone_count.short_description = "Phone Numbers"
+    phone_count.admin_order_field = "phone_count"
+
+
+@admin.register(PhoneNumber)
+class PhoneNumberAdmin(admin.ModelAdmin):
+    list_display = ("id", "number", "type", "contact")
+    list_filter = ("type",)
+    list_select_related = ("contact",)
+    # Searches by exact number or contact name prefix, see get_search_results
+    search_fields = ("=number_canonical", "^contact__name")
+    # A select listing every contact would load the whole table into the form
+    raw_id_fields = ("contact",)
+    ordering = ("id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # Numbers are compared on the canonical column, in any formatting, and contact names the
+        # way ContactAdmin does; the default iexact / istartswith lookups can't use an index.
+        # The name goes through an `IN` subquery: an OR across a JOIN scans every phone number
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = Q(contact__in=Contact.objects.filter(lower_startswith("name", term)).values("pk"))
+        number = canonical_phone(term)
+        if number:
+            condition |= Q(number_canonical=number)
+        return queryset.filter(condition), False
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContactsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contacts'
+
+    def ready(self):
+        # Connect signal receivers
+        from contacts import cache, changes, conditional, events, metrics, search, signals  # noqa: F401
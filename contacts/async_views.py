@@ -0,0 +1,119 @@
+"""
+Async read paths for contacts, for ASGI deployments (`contacts_project/asgi.py`).
+
+Why this exists:
+- DRF views are synchronous: under ASGI every request to `ContactViewSet` holds a
+  thread from the sync pool for its whole duration, including the time spent
+  writing the body to a slow client.
+- These views only await the database (`aiterator()` / `aget()` with the phone
+  numbers prefetched) and keep the event loop thread otherwise.
+
+`contact_events` streams live contact changes as server-sent events (see
+contacts/events.py); under ASGI an open stream holds no thread at all.
+
+Responses match `GET /api/contacts/` and `GET /api/contacts/<id>/` byte for byte:
+same filters, sparse fieldsets, keyset pagination, `ContactSerializer` output and JSON rendering.
+Unlike the DRF views they don't use the response cache or conditional requests,
+which both read the database synchronously.
+"""
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from contacts.events import EventStream, event_filter
+from contacts.filters import ContactFilter
+from contacts.models import Contact, phone_numbers_prefetch
+from contacts.pagination import KeysetPagination
+from contacts.renderers import FastJSONRenderer
+from contacts.serializers import ContactSerializer, sparse_fields
+
+
+def contact_queryset(fields=ContactSerializer.Meta.fields, extra=()):
+    """
+    Contacts with the columns among `fields` (plus any `extra` ones, e.g. the pagination
+    ordering) and, when asked for, their phone numbers prefetched.
+    Nothing the serializer reads is deferred: a deferred load would be a sync query.
+    """
+    queryset = Contact.objects.only(*[field for field in fields if field != "phone_numbers"], *extra)
+    if "phone_numbers" in fields:
+        queryset = queryset.prefetch_related(phone_numbers_prefetch())
+    return queryset
+
+
+def serialize_contacts(contacts, many=False, fields=ContactSerializer.Meta.fields):
+    """
+    The async serializer path: contacts must come from `contact_queryset(fields)`,
+    so building the representation never touches the database.
+    """
+    return ContactSerializer(contacts, many=many, fields=fields).data
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type="application/json")
+
+
+async def contact_list(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    request = Request(request)
+    try:
+        fields = sparse_fields(request.query_params)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+
+    paginator = KeysetPagination()
+    queryset = contact_queryset(fields, extra=paginator.ordering)
+    filterset = ContactFilter(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        return json_response(filterset.errors, status=400)
+
+    try:
+        page = await paginator.apaginate_queryset(filterset.qs, request)
+    except NotFound as exc:
+        return json_response({"detail": exc.detail}, status=404)
+    return json_response(paginator.get_paginated_data(serialize_contacts(page, many=True, fields=fields)))
+
+
+async def contact_detail(request, pk):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    try:
+        fields = sparse_fields(request.GET)
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+    try:
+        contact = await contact_queryset(fields).aget(pk=pk)
+    except Contact.DoesNotExist:
+        return json_response({"detail": "No Contact matches the given query."}, status=404)
+    return json_response(serialize_contacts(contact, fields=fields))
+
+
+def _split_values(values):
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+
+async def contact_events(request):
+    """
+    Server-sent events for contact creates, updates and deletes.
+    Query params: `contact_id` and `email_domain`, repeated or comma separated.
+    ASGI only: a WSGI server would buffer the endless stream and never respond.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not isinstance(request, ASGIRequest):
+        return json_response({"detail": "Event streams need an ASGI server."}, status=501)
+    try:
+        contact_ids = [int(value) for value in _split_values(request.GET.getlist("contact_id"))]
+    except ValueError:
+        return json_response({"contact_id": ["Expected integer ids."]}, status=400)
+    domains = _split_values(request.GET.getlist("email_domain"))
+
+    response = StreamingHttpResponse(EventStream(event_filter(contact_ids, domains)), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stops nginx from buffering the stream
+    return response
+
+
+# Served from the replica when one is configured (see contacts/routers.py)
+contact_list.replica_reads = True
+contact_detail.replica_reads = True
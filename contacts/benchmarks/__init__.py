@@ -0,0 +1,6 @@
+"""
+Load and latency benchmarks for the contacts API.
+
+Run with `python manage.py benchmark` (see contacts/management/commands/benchmark.py).
+Benchmarks run against a throwaway test database, never against the configured one.
+"""
@@ -0,0 +1,112 @@
+"""
+Requests per second of the sync (DRF) and async contact views under uvicorn.
+
+uvicorn serves the project's ASGI application from a background thread, and an
+in-process asyncio load generator drives it: `concurrency` keep-alive HTTP/1.1
+connections, each sending GET requests back to back for `seconds`.
+
+uvicorn is optional: `run_asgi_benchmarks` raises BenchmarkError without it.
+"""
+import asyncio
+import random
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+from contacts.benchmarks.datasets import seed_contacts
+from contacts.benchmarks.runner import BenchmarkError, percentile
+from contacts.models import Contact
+
+SCENARIOS = {
+    "sync_list": lambda ids, rng: "/api/contacts/?page_size=20",
+    "async_list": lambda ids, rng: "/api/async/contacts/?page_size=20",
+    "sync_retrieve": lambda ids, rng: f"/api/contacts/{rng.choice(ids)}/",
+    "async_retrieve": lambda ids, rng: f"/api/async/contacts/{rng.choice(ids)}/",
+}
+
+
+@contextmanager
+def uvicorn_server(host="127.0.0.1"):
+    """Runs the project's ASGI application under uvicorn on a free port; yields the port."""
+    try:
+        import uvicorn
+    except ImportError:
+        raise BenchmarkError("uvicorn is not installed (pip install uvicorn)")
+    from contacts_project.asgi import application
+
+    server = uvicorn.Server(uvicorn.Config(application, host=host, port=0, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise BenchmarkError("uvicorn failed to start")
+        time.sleep(0.01)
+    try:
+        yield server.servers[0].sockets[0].getsockname()[1]
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def read_response(reader):
+    """Reads one HTTP/1.1 response with a Content-Length body. Returns `(status, body)`."""
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _client(host, port, next_path, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+    try:
+        while loop.time() < deadline:
+            started = time.perf_counter()
+            writer.write(f"GET {next_path()} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            status, _ = await read_response(reader)
+            if status >= 400:
+                errors.append(status)
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        writer.close()
+
+
+async def generate_load(host, port, next_path, concurrency, seconds):
+    """Returns `{"requests", "errors", "rps", "p50_ms", "p99_ms", "mean_ms"}`."""
+    latencies, errors = [], []
+    deadline = asyncio.get_running_loop().time() + seconds
+    await asyncio.gather(*(
+        _client(host, port, next_path, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    if not latencies:
+        raise BenchmarkError("No request completed")
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+    }
+
+
+def run_asgi_benchmarks(size, concurrency=32, seconds=5.0, scenarios=None, seed=0, progress=None):
+    """Seeds the current database up to `size` contacts and measures every scenario under uvicorn."""
+    scenarios = scenarios or list(SCENARIOS)
+    seed_contacts(size, seed=seed)
+    ids = list(Contact.objects.values_list("pk", flat=True))
+    rng = random.Random(seed)
+    results = {}
+    with uvicorn_server() as port:
+        for name in scenarios:
+            def next_path(scenario=SCENARIOS[name]):
+                return scenario(ids, rng)
+            results[name] = asyncio.run(generate_load("127.0.0.1", port, next_path, concurrency, seconds))
+            if progress:
+                progress(f"{name:<16} {results[name]}")
+    return {"size": size, "concurrency": concurrency, "seconds": seconds, "results": results}
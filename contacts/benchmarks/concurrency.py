@@ -0,0 +1,129 @@
+"""
+Mixed read/write stress test of the SQLite profiles in settings.SQLITE_PROFILES.
+
+Each profile gets its own temporary database file (WAL needs a real file) registered
+as an extra connection alias. Worker threads then run, until the time is up:
+- reads: a contact page with its phone numbers
+- writes: read-modify-write transactions, the pattern that fails at once with
+  "database is locked" under deferred transactions
+
+Writes go through `update()` / `bulk_create()` on purpose: the `contacts_changed`
+receivers write to the default database, not to the stress alias.
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.test.utils import override_settings
+from contacts.models import Contact, PhoneNumber
+
+
+@contextmanager
+def temporary_sqlite_database(alias, **config):
+    """Registers a fresh, migrated SQLite file as the connection `alias` for the duration of the block."""
+    directory = tempfile.mkdtemp(prefix="contacts-")
+    # configure_settings() fills in every unset key; it insists on a "default" entry
+    connections.settings[alias] = connections.configure_settings({
+        DEFAULT_DB_ALIAS: {},
+        alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": os.path.join(directory, "db.sqlite3"), **config},
+    })[alias]
+    try:
+        # Routers may keep migrations off aliases they don't know about
+        with override_settings(DATABASE_ROUTERS=[]):
+            call_command("migrate", database=alias, verbosity=0)
+        yield alias
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+def stress_database(profile):
+    """A temporary database using the SQLite `profile` (see settings.SQLITE_PROFILES)."""
+    return temporary_sqlite_database(f"stress_{profile}", **settings.SQLITE_PROFILES[profile])
+
+
+def seed(alias, contacts):
+    Contact.objects.using(alias).bulk_create(
+        Contact(name=f"Stress {index}", email=f"stress{index}@example.com", email_canonical=f"stress{index}@example.com")
+        for index in range(contacts)
+    )
+    ids = Contact.objects.using(alias).values_list("pk", flat=True)
+    PhoneNumber.objects.using(alias).bulk_create(
+        PhoneNumber(
+            contact_id=pk, number=f"+44 20 {pk:06d}", number_digits=f"4420{pk:06d}",
+            number_canonical=f"4420{pk:06d}", type="mobile",
+        )
+        for pk in ids
+    )
+    return list(ids)
+
+
+def read(alias, rng, ids):
+    start = rng.choice(ids)
+    list(Contact.objects.using(alias).filter(pk__gte=start).order_by("pk").prefetch_related("phone_numbers")[:20])
+
+
+def write(alias, rng, ids):
+    pk = rng.choice(ids)
+    with transaction.atomic(using=alias):
+        contact = Contact.objects.using(alias).get(pk=pk)
+        Contact.objects.using(alias).filter(pk=pk).update(name=f"{contact.name[:80]} +")
+        PhoneNumber.objects.using(alias).filter(contact_id=pk).update(number=f"+44 20 {rng.randint(0, 999999):06d}")
+
+
+def _worker(alias, ids, seconds, write_ratio, seed_value, totals, lock):
+    rng = random.Random(seed_value)
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            is_write = rng.random() < write_ratio
+            try:
+                write(alias, rng, ids) if is_write else read(alias, rng, ids)
+            except OperationalError as exc:
+                if "locked" not in str(exc):
+                    raise
+                counts["locked"] += 1
+                continue
+            counts["writes" if is_write else "reads"] += 1
+    finally:
+        connections[alias].close()
+    with lock:
+        for key, value in counts.items():
+            totals[key] += value
+
+
+def run_stress(profile, threads=8, seconds=5.0, write_ratio=0.2, contacts=2000):
+    """
+    Returns `{"profile", "reads", "writes", "locked", "ops_per_second"}`, where
+    "locked" counts operations that failed with "database is locked".
+    """
+    with stress_database(profile) as alias:
+        return {"profile": profile, **stress(alias, threads, seconds, write_ratio, contacts)}
+
+
+def stress(alias, threads, seconds, write_ratio, contacts):
+    """Seeds the empty database `alias` and runs the worker threads against it (see run_stress())."""
+    ids = seed(alias, contacts)
+    connections[alias].close()
+    totals = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    workers = [
+        threading.Thread(target=_worker, args=(alias, ids, seconds, write_ratio, index, totals, lock))
+        for index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return {**totals, "ops_per_second": round((totals["reads"] + totals["writes"]) / seconds, 1)}
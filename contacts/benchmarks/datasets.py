@@ -0,0 +1,61 @@
+"""
+Seeded, reproducible datasets for benchmarks.
+
+Contacts are created in batches with `bulk_create` and indexed for search directly,
+so a million rows can be seeded without going through the API.
+"""
+import random
+
+from django.db import transaction
+from contacts.models import Contact, PhoneNumber, canonical_phone, normalize_email, normalize_phone
+from contacts.search import index_contacts
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "David", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy",
+    "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent", "Victor", "Walter", "Yvonne",
+]
+LAST_NAMES = [
+    "Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Robinson", "Wright",
+    "Thompson", "Evans", "Walker", "White", "Roberts", "Green", "Hall", "Wood", "Jackson", "Clarke",
+]
+PHONE_TYPES = [phone_type for phone_type, _ in PhoneNumber.PHONE_TYPES]
+BATCH_SIZE = 5000
+
+
+def make_contact(rng, index):
+    email = f"user{index}@example.com"
+    return Contact(
+        name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}",
+        email=email, email_canonical=normalize_email(email),
+    )
+
+
+def make_phone_numbers(rng, contact):
+    return [
+        PhoneNumber(
+            contact=contact, number=number, number_digits=normalize_phone(number),
+            number_canonical=canonical_phone(number), type=phone_type,
+        )
+        for phone_type in rng.sample(PHONE_TYPES, rng.randint(1, len(PHONE_TYPES)))
+        for number in [f"+44 {rng.randint(1000, 9999)} {rng.randint(100000, 999999)}"]
+    ]
+
+
+def seed_contacts(total, seed=0, progress=None):
+    """
+    Grows the contacts table to `total` rows (existing rows are kept), so that
+    datasets of increasing size can be benchmarked without reseeding.
+    """
+    start = Contact.objects.count()
+    rng = random.Random(f"{seed}:{start}")
+
+    for batch_start in range(start, total, BATCH_SIZE):
+        indexes = range(batch_start, min(batch_start + BATCH_SIZE, total))
+        with transaction.atomic():
+            contacts = Contact.objects.bulk_create([make_contact(rng, index) for index in indexes])
+            PhoneNumber.objects.bulk_create([
+                phone for contact in contacts for phone in make_phone_numbers(rng, contact)
+            ])
+            index_contacts([contact.pk for contact in contacts])
+        if progress is not None:
+            progress(indexes.stop, total)
@@ -0,0 +1,72 @@
+"""
+Encode and decode throughput of the API's JSON renderer and parser against DRF's.
+
+Payloads are synthetic contacts shaped like a ContactSerializer list page, built in
+memory (no database), with `created_at` left as a datetime so the renderer has to
+encode it.
+"""
+import io
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from contacts.benchmarks.datasets import FIRST_NAMES, LAST_NAMES, PHONE_TYPES
+from contacts.parsers import FastJSONParser
+from contacts.renderers import FastJSONRenderer, orjson
+
+CODECS = {
+    "drf": (JSONRenderer, JSONParser),
+    "fast": (FastJSONRenderer, FastJSONParser),
+}
+
+
+def make_payload(size, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": index,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}",
+            "email": f"user{index}@example.com",
+            "created_at": start + timedelta(seconds=index, microseconds=rng.randint(0, 999999)),
+            "phone_numbers": [
+                {"id": index * 3 + offset, "contact": index, "type": phone_type,
+                 "number": f"+44 {rng.randint(1000, 9999)} {rng.randint(100000, 999999)}"}
+                for offset, phone_type in enumerate(rng.sample(PHONE_TYPES, rng.randint(1, len(PHONE_TYPES))))
+            ],
+        }
+        for index in range(size)
+    ]
+
+
+def _best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_json_benchmark(size=10_000, repeat=5, seed=0):
+    """
+    Renders and parses a `size`-contact payload with each codec; keeps the best of `repeat` runs.
+    Returns `{"size", "bytes", "orjson", "results": {codec: {"encode_mb_s", "decode_mb_s", ...}}}`.
+    """
+    payload = {"next": None, "previous": None, "results": make_payload(size, seed)}
+    results = {}
+    body = None
+    for name, (renderer_class, parser_class) in CODECS.items():
+        renderer, parser = renderer_class(), parser_class()
+        body = renderer.render(payload)
+        encode = _best_of(repeat, lambda: renderer.render(payload))
+        decode = _best_of(repeat, lambda: parser.parse(io.BytesIO(body)))
+        results[name] = {
+            "encode_ms": round(encode * 1000, 2),
+            "decode_ms": round(decode * 1000, 2),
+            "encode_mb_s": round(len(body) / encode / 1e6, 1),
+            "decode_mb_s": round(len(body) / decode / 1e6, 1),
+        }
+    return {"size": size, "bytes": len(body), "orjson": orjson is not None, "results": results}
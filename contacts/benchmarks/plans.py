@@ -0,0 +1,51 @@
+"""
+Query plans of the hot contact queries, with and without their indexes.
+
+`python manage.py query_plans` seeds a throwaway database, prints the plan of every
+query below, then drops the lookup indexes and prints the plans again, so the
+effect of an index shows up as "index scan" vs "full scan" side by side.
+Exact email and phone lookups probe unique / field indexes, which are not dropped.
+"""
+from contextlib import contextmanager
+
+from django.contrib import admin
+from django.db import connection
+from contacts.filters import ContactFilter
+from contacts.models import Contact
+
+# Indexes whose effect is shown (see Contact.Meta.indexes)
+PLAN_INDEXES = ("contact_created_id_idx", "contact_name_lower_idx")
+
+
+def hot_queries():
+    contact_admin = admin.site._registry[Contact]
+    return {
+        "list_page": Contact.objects.order_by("created_at", "id")[:50],
+        "admin_changelist": Contact.objects.order_by("-created_at")[:100],
+        "filter_email": ContactFilter({"email": "User42@Example.com"}, queryset=Contact.objects.all()).qs,
+        "filter_phone_exact": ContactFilter({"phone_exact": "+44 20 7946 0958"}, queryset=Contact.objects.all()).qs,
+        "admin_search": contact_admin.get_search_results(None, Contact.objects.all(), "Alice")[0],
+    }
+
+
+def explain_hot_queries():
+    with connection.cursor() as cursor:
+        # Fresh statistics, so the planner sees the seeded table as it is
+        cursor.execute("ANALYZE")
+    # On the connection whose indexes without_indexes() drops, even with a replica configured
+    return {name: queryset.using(connection.alias).explain() for name, queryset in hot_queries().items()}
+
+
+@contextmanager
+def without_indexes(names=PLAN_INDEXES):
+    """Drops the given Contact indexes for the duration of the block."""
+    indexes = [index for index in Contact._meta.indexes if index.name in names]
+    with connection.schema_editor() as editor:
+        for index in indexes:
+            editor.remove_index(Contact, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(Contact, index)
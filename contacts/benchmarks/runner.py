@@ -0,0 +1,218 @@
+"""
+Benchmark scenarios for the contacts API and comparison between runs.
+
+Each scenario issues one in-process request through DRF's APIClient. For every
+dataset size and scenario we record:
+- p50 / p95 / p99 / mean latency over `iterations` requests
+- the number of SQL queries of one request
+- the peak Python memory allocated by one request (tracemalloc)
+
+Queries and memory come from a separate traced request so that tracing overhead
+doesn't leak into the latency figures.
+"""
+import math
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from contacts.benchmarks.datasets import seed_contacts
+from contacts.models import Contact, PhoneNumber
+from contacts.pagination import KeysetPagination
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class BenchmarkContext:
+    """Random but reproducible inputs for the scenarios, drawn from the seeded data."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.counter = 0
+        bounds = Contact.objects.order_by("pk").values_list("pk", flat=True)
+        self.first_id, self.last_id = bounds.first(), bounds.last()
+        sample = Contact.objects.filter(pk__in=[self.random_id() for _ in range(100)])
+        self.names = [name.split()[1] for name in sample.values_list("name", flat=True)]
+        # Read up front: a lookup inside the update scenario would be timed and counted with it
+        self.update_targets = list(sample.values_list("pk", "email"))
+        self.digits = [
+            digits[-6:] for digits in
+            PhoneNumber.objects.filter(contact__in=sample).values_list("number_digits", flat=True)
+        ]
+        deep = Contact.objects.filter(pk__gte=self.first_id + (self.last_id - self.first_id) * 9 // 10).first()
+        paginator = KeysetPagination()
+        paginator.model, paginator.base_url = Contact, "/api/contacts/?page_size=50"
+        self.deep_page_url = paginator.encode_cursor(paginator.get_position(deep))
+
+    def random_id(self):
+        return self.rng.randint(self.first_id, self.last_id)
+
+    def next_email(self):
+        self.counter += 1
+        return f"bench{self.counter}-{self.rng.random()}@example.com"
+
+
+def scenario_list(client, context):
+    return client.get("/api/contacts/?page_size=50")
+
+
+def scenario_list_deep_page(client, context):
+    return client.get(context.deep_page_url)
+
+
+def scenario_retrieve(client, context):
+    return client.get(f"/api/contacts/{context.random_id()}/")
+
+
+def scenario_create(client, context):
+    payload = {
+        "name": "Bench Create",
+        "email": context.next_email(),
+        "phone_numbers": [{"number": "+44 1234 567890", "type": "mobile"}, {"number": "020 7946 0958", "type": "work"}],
+    }
+    return client.post("/api/contacts/", payload, format="json")
+
+
+def scenario_update(client, context):
+    contact_id, email = context.rng.choice(context.update_targets)
+    payload = {
+        "name": f"Bench Update {context.counter}",
+        "email": email,
+        "phone_numbers": [{"number": f"+44 7700 {context.rng.randint(100000, 999999)}", "type": "mobile"}],
+    }
+    return client.put(f"/api/contacts/{contact_id}/", payload, format="json")
+
+
+def scenario_bulk_upsert_phones(client, context):
+    ids = range(context.first_id, context.last_id + 1)
+    contact_ids = context.rng.sample(ids, min(50, len(ids)))
+    payload = [
+        {"contact": contact_id, "number": f"+44 7700 {context.rng.randint(100000, 999999)}", "type": "mobile"}
+        for contact_id in contact_ids
+    ]
+    return client.post("/api/phone-numbers/bulk/", payload, format="json")
+
+
+def scenario_filter_name(client, context):
+    return client.get("/api/contacts/", {"name": context.rng.choice(context.names), "page_size": 50})
+
+
+def scenario_filter_phone(client, context):
+    return client.get("/api/contacts/", {"phone": context.rng.choice(context.digits), "page_size": 50})
+
+
+SCENARIOS = {
+    "list": scenario_list,
+    "list_deep_page": scenario_list_deep_page,
+    "retrieve": scenario_retrieve,
+    "create": scenario_create,
+    "update": scenario_update,
+    "bulk_upsert_phones": scenario_bulk_upsert_phones,
+    "filter_name": scenario_filter_name,
+    "filter_phone": scenario_filter_phone,
+}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def _call(scenario, client, context):
+    response = scenario(client, context)
+    if response.status_code >= 400:
+        raise BenchmarkError(f"{scenario.__name__} returned {response.status_code}: {response.content[:200]!r}")
+    return response
+
+
+def measure(scenario, client, context, iterations):
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        _call(scenario, client, context)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            _call(scenario, client, context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries": len(queries),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(sizes, iterations=50, scenarios=None, seed=0, progress=None):
+    """
+    Seeds the current database up to each size in turn and measures every scenario.
+    Returns `{"meta": {...}, "results": {size: {scenario: metrics}}}`.
+    """
+    scenarios = scenarios or list(SCENARIOS)
+    client = APIClient()
+    results = {}
+    for size in sorted(sizes):
+        seed_contacts(size, seed=seed, progress=progress and (lambda done, total: progress(f"seeded {done}/{total}")))
+        context = BenchmarkContext(seed=seed)
+        results[str(size)] = {}
+        for name in scenarios:
+            results[str(size)][name] = measure(SCENARIOS[name], client, context, iterations)
+            if progress:
+                progress(f"{size:>9} {name:<16} {results[str(size)][name]}")
+    return {"meta": run_metadata(), "results": results}
+
+
+def run_metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+    }
+
+
+def find_regressions(current, baseline, threshold=0.2):
+    """
+    Compares two benchmark results and describes every scenario that got slower
+    (p95 above `1 + threshold` times the baseline) or runs more queries.
+    """
+    regressions = []
+    for size, scenarios in current["results"].items():
+        for name, metrics in scenarios.items():
+            previous = baseline.get("results", {}).get(size, {}).get(name)
+            if previous is None:
+                continue
+            if metrics["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{name} @ {size}: p95 {previous['p95_ms']}ms -> {metrics['p95_ms']}ms"
+                )
+            if metrics["queries"] > previous["queries"]:
+                regressions.append(
+                    f"{name} @ {size}: queries {previous['queries']} -> {metrics['queries']}"
+                )
+    return regressions
@@ -0,0 +1,104 @@
+"""
+Response caching for contact reads.
+
+Why this exists:
+- Traffic to the contact endpoints is overwhelmingly reads, yet every request hit
+  the database and re-ran ContactSerializer.
+- Serialized payloads are stored in Django's cache framework (LocMem or file based,
+  see `CACHES` in settings), so any configured backend works.
+
+How invalidation works:
+- Detail payloads are keyed by contact id and a per-contact version number.
+  List pages are keyed by a global list generation plus the normalized query
+  (filters, cursor, page size).
+- Any write to a contact or its phone numbers sends `contacts_changed`, which bumps
+  the versions involved. Old entries are never read again and simply expire.
+- Bumps happen immediately and again on commit, so a read racing an open write
+  transaction can't keep a stale page alive.
+- Only reads served by the primary fill the cache. A lagging replica may still return
+  the data from before a write under the version that write bumped, and the cache would
+  then serve it to the client pinned to the primary (see contacts/routers.py).
+  Replica reads still use the entries filled from the primary.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import receiver
+from rest_framework.response import Response
+from contacts.routers import reads_use_replica
+from contacts.signals import contacts_changed
+
+KEY_PREFIX = "contacts"
+LIST_GENERATION_KEY = f"{KEY_PREFIX}:list:generation"
+
+
+def get_cache():
+    return caches[getattr(settings, "CONTACTS_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "CONTACTS_CACHE_TIMEOUT", 300)
+
+
+def _version_key(contact_id):
+    return f"{KEY_PREFIX}:detail:{contact_id}:version"
+
+
+def _current_version(key):
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock: a version evicted from the cache never rewinds onto old entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _query_fingerprint(request):
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    # Paginated responses embed absolute `next`/`previous` links, so the host is part of the key
+    raw = f"{request.get_host()}{request.path}?{urlencode(params)}"
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def detail_key(request, contact_id):
+    version = _current_version(_version_key(contact_id))
+    return f"{KEY_PREFIX}:detail:{contact_id}:{version}:{_query_fingerprint(request)}"
+
+
+def list_key(request):
+    generation = _current_version(LIST_GENERATION_KEY)
+    return f"{KEY_PREFIX}:list:{generation}:{_query_fingerprint(request)}"
+
+
+def cached_response(key, build_response):
+    """Returns the cached payload for `key`, or builds it and caches successful responses read from the primary."""
+    cache = get_cache()
+    data = cache.get(key)
+    if data is not None:
+        return Response(data)
+    response = build_response()
+    if response.status_code == 200 and not reads_use_replica():
+        cache.set(key, response.data, get_timeout())
+    return response
+
+
+def invalidate(contact_ids):
+    cache = get_cache()
+    for key in [*map(_version_key, contact_ids), LIST_GENERATION_KEY]:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read since it was evicted: nothing is cached under it
+            pass
+
+
+@receiver(contacts_changed)
+def invalidate_changed_contacts(sender, contact_ids, **kwargs):
+    contact_ids = list(contact_ids)
+    invalidate(contact_ids)
+    transaction.on_commit(lambda: invalidate(contact_ids))
@@ -0,0 +1,109 @@
+"""
+Change feed for incremental contact sync.
+
+Why this exists:
+- Downstream systems re-pulled the whole of `/api/contacts/` on a schedule, because
+  there was no way to ask what had changed since their last sync.
+- `contacts_changed` notifications (saves, deletes, nested and bulk writes) append
+  one `ContactChange` row per contact and transaction once the write commits.
+  `GET /api/contacts/changes/?since=<token>` pages through them in id order, so
+  sync traffic follows churn, not table size.
+
+Tokens:
+- A token is the id of the last entry a client has seen; `next` links carry it.
+- Ids are assigned on insert but become visible on commit, so an insert that commits
+  late could land below a token already served. The rows are therefore inserted
+  after the write commits, in a statement of their own, which keeps that window to
+  a single INSERT instead of the whole write transaction.
+- `changed_at` is the database's clock at insert, and entries younger than
+  `CONTACTS_CHANGES_SETTLE_SECONDS` by that clock are held back: a page stops at
+  the first one. An entry can only be skipped if its INSERT takes longer than that
+  to commit. SQLite commits one write at a time, so there it never is.
+- A process dying between a write's commit and its INSERT loses the entry.
+
+Compaction (`manage.py compact_changes`):
+- Entries older than `CONTACTS_CHANGES_RETENTION_DAYS` are deleted when a newer
+  entry exists for the same contact. The latest entry of every contact is kept,
+  deletes included, so a client syncing from any old token still ends up with
+  the current state.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from django.db.models.functions import Now
+from django.dispatch import receiver
+from django.utils import timezone
+from contacts.fast_serializers import contact_rows, datetime_formatter, serialize_contact_rows
+from contacts.models import Contact, ContactChange
+from contacts.signals import contacts_changed, on_commit_once
+
+
+def insert_changes(keys):
+    # changed_at comes from the database default, Now()
+    ContactChange.objects.bulk_create(
+        [ContactChange(contact_id=contact_id, deleted=deleted) for contact_id, deleted in keys],
+    )
+
+
+@receiver(contacts_changed)
+def record_changes(sender, contact_ids, deleted=False, **kwargs):
+    # Once per contact and transaction: a contact created with its phone numbers is one entry
+    on_commit_once("changes", [(contact_id, deleted) for contact_id in contact_ids], insert_changes)
+
+
+def latest_token():
+    return ContactChange.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+def read_changes(since, limit):
+    """
+    Returns `(entries, has_more)`: up to `limit` `(id, contact_id, deleted, changed_at)`
+    rows after token `since`, in id order, stopping before the first unsettled one.
+    """
+    settle = timedelta(seconds=getattr(settings, "CONTACTS_CHANGES_SETTLE_SECONDS", 2))
+    # By the database's clock, which also stamped the entries
+    settled = ExpressionWrapper(Q(changed_at__lte=Now() - settle), output_field=BooleanField())
+    rows = list(
+        ContactChange.objects.filter(pk__gt=since).order_by("pk").annotate(settled=settled)
+        .values_list("pk", "contact_id", "deleted", "changed_at", "settled")[:limit + 1]
+    )
+    for position, row in enumerate(rows):
+        if not row[4]:
+            return [row[:4] for row in rows[:position]], False
+    return [row[:4] for row in rows[:limit]], len(rows) > limit
+
+
+def changes_payload(entries):
+    """
+    One item per contact, for its latest entry in `entries`, with the contact's
+    current representation (`None` once it no longer exists).
+    """
+    latest = {}
+    for entry in entries:
+        latest.pop(entry[1], None)  # re-inserted: items stay in the order of their latest entry
+        latest[entry[1]] = entry
+    queryset = Contact.objects.filter(pk__in=list(latest)).order_by()
+    contacts = {item["id"]: item for item in serialize_contact_rows(list(contact_rows(queryset)), queryset.db)}
+    to_representation = datetime_formatter()
+    return [
+        {"id": pk, "contact_id": contact_id, "deleted": deleted, "changed_at": to_representation(changed_at),
+         "contact": contacts.get(contact_id)}
+        for pk, contact_id, deleted, changed_at in latest.values()
+    ]
+
+
+def compact_changes(retention_days=None, batch_size=1000):
+    """Deletes superseded entries older than the retention period. Returns the number deleted."""
+    if retention_days is None:
+        retention_days = getattr(settings, "CONTACTS_CHANGES_RETENTION_DAYS", 7)
+    superseded = ContactChange.objects.filter(
+        changed_at__lt=timezone.now() - timedelta(days=retention_days),
+    ).filter(
+        Exists(ContactChange.objects.filter(contact_id=OuterRef("contact_id"), pk__gt=OuterRef("pk"))),
+    )
+    deleted = 0
+    # In batches: one huge DELETE would hold its locks for the whole run
+    while ids := list(superseded.values_list("pk", flat=True)[:batch_size]):
+        deleted += ContactChange.objects.filter(pk__in=ids).delete()[0]
+    return deleted
@@ -0,0 +1,251 @@
+"""
+Live contact change events, fanned out to server-sent event streams.
+
+Why this exists:
+- Dashboards need to see contact creates, updates and deletes within a second.
+  Polling the change feed (contacts/changes.py) that often would mostly return nothing.
+- Committed writes are published to a broker. Every open
+  `GET /api/events/contacts/` stream (contacts/async_views.py) is a subscription
+  to it. Streams are async, so an idle subscriber costs a coroutine and a small
+  buffer, not a worker thread.
+
+Brokers:
+- `EventBroker` is the backend interface, selected with `CONTACTS_EVENTS_BROKER`.
+- `InProcessBroker` (the default) fans out within one process. It is enough for
+  a single ASGI worker and for tests. With several workers, a backend relaying
+  events between processes (e.g. Redis pub/sub) has to implement the same interface.
+
+Backpressure:
+- Each subscription buffers at most `CONTACTS_EVENTS_QUEUE_SIZE` events. A
+  consumer that falls that far behind is sent an `overflow` event and
+  disconnected, rather than slowing down publishers or growing without bound.
+  It can catch up from the change feed and reconnect.
+
+Events are published on commit, one per contact and transaction: a contact created
+together with its phone numbers is a single `created` event. Deletes are published
+on their own. Events say what changed; the current state comes from the API.
+"""
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from contacts.models import Contact
+from contacts.signals import contacts_changed, on_commit_once
+
+
+class SubscriptionOverflow(Exception):
+    pass
+
+
+class Subscription:
+    """
+    The receiving end of a stream: a bounded buffer owned by the event loop that
+    created it. Brokers hand events over with `deliver`, on that loop.
+    """
+
+    def __init__(self, matches=None, max_pending=None):
+        self.loop = asyncio.get_running_loop()
+        self.matches = matches
+        self.max_pending = max_pending or getattr(settings, "CONTACTS_EVENTS_QUEUE_SIZE", 1000)
+        self.pending = []
+        self.overflowed = False
+        self._ready = asyncio.Event()
+
+    def deliver(self, event):
+        if self.overflowed or (self.matches is not None and not self.matches(event)):
+            return
+        if len(self.pending) >= self.max_pending:
+            self.overflowed = True
+        else:
+            self.pending.append(event)
+        self._ready.set()
+
+    async def next_batch(self, timeout=None):
+        """
+        Returns every buffered event once there is at least one, or `[]` after
+        `timeout` seconds. Raises SubscriptionOverflow once the buffer overflowed.
+        """
+        if not self.pending and not self.overflowed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if self.overflowed:
+            raise SubscriptionOverflow
+        self._ready.clear()
+        events, self.pending = self.pending, []
+        return events
+
+
+class EventBroker:
+    """Interface of the pub/sub backend behind the event streams."""
+
+    def has_subscribers(self):
+        """False only when nobody can be listening, so publishing can be skipped."""
+        return True
+
+    def publish(self, event):
+        """Hands `event` (a JSON-serializable dict) to every subscriber. Callable from any thread."""
+        raise NotImplementedError
+
+    def subscribe(self, matches=None, max_pending=None):
+        """Returns a `Subscription` for the running event loop."""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InProcessBroker(EventBroker):
+    """
+    Fans events out to the subscriptions of this process. Publishing schedules
+    one callback per event loop with subscribers, whatever their number.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}  # event loop -> set of subscriptions
+
+    def has_subscribers(self):
+        return bool(self._subscriptions)
+
+    def subscribe(self, matches=None, max_pending=None):
+        subscription = Subscription(matches, max_pending)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.loop, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.loop, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.loop, None)
+
+    def publish(self, event):
+        with self._lock:
+            targets = [(loop, list(subscriptions)) for loop, subscriptions in self._subscriptions.items()]
+        for loop, subscriptions in targets:
+            try:
+                loop.call_soon_threadsafe(_deliver_all, subscriptions, event)
+            except RuntimeError:
+                # The loop was closed without its streams unsubscribing
+                with self._lock:
+                    self._subscriptions.pop(loop, None)
+
+
+def _deliver_all(subscriptions, event):
+    for subscription in subscriptions:
+        subscription.deliver(event)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, "CONTACTS_EVENTS_BROKER", "contacts.events.InProcessBroker"))()
+    return _broker
+
+
+def email_domain(email):
+    return email.rsplit("@", 1)[-1].lower()
+
+
+def event_filter(contact_ids=None, email_domains=None):
+    """Predicate keeping events about `contact_ids` and/or emails in `email_domains` (None: any)."""
+    contact_ids = set(contact_ids) if contact_ids else None
+    email_domains = {domain.lower() for domain in email_domains} if email_domains else None
+
+    def matches(event):
+        if contact_ids is not None and event["contact_id"] not in contact_ids:
+            return False
+        return email_domains is None or email_domain(event["email"]) in email_domains
+
+    return matches
+
+
+def make_event(event_type, model, contact_id, email):
+    return {
+        "type": event_type,
+        "model": model,
+        "contact_id": contact_id,
+        "email": email,
+        "timestamp": timezone.now().isoformat().replace("+00:00", "Z"),
+    }
+
+
+def format_event(event):
+    """Server-sent event framing: the event type as `event:`, the event as JSON `data:`."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class EventStream:
+    """
+    The server-sent event stream of one subscriber, for StreamingHttpResponse.
+    Sends a comment line after every `heartbeat` seconds of silence so proxies keep
+    the connection open. The subscription starts with the first chunk and ends on
+    `close()`, which Django calls once the response is over, or when the stream is
+    cancelled after a client disconnect.
+    """
+
+    def __init__(self, matches=None, heartbeat=None):
+        self.broker = get_broker()
+        self.matches = matches
+        self.heartbeat = heartbeat or getattr(settings, "CONTACTS_EVENTS_HEARTBEAT_SECONDS", 15)
+        self.subscription = None
+
+    def __aiter__(self):
+        return self._stream()
+
+    async def _stream(self):
+        self.subscription = self.broker.subscribe(self.matches)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    events = await self.subscription.next_batch(timeout=self.heartbeat)
+                except SubscriptionOverflow:
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                yield "".join(map(format_event, events)) if events else ": keep-alive\n\n"
+        finally:
+            self.close()
+
+    def close(self):
+        subscription, self.subscription = self.subscription, None
+        if subscription is not None:
+            self.broker.unsubscribe(subscription)
+
+
+@receiver(contacts_changed)
+def publish_changes(sender, contact_ids, deleted=False, created=False, **kwargs):
+    broker = get_broker()
+    if deleted or not broker.has_subscribers():
+        return  # deletes are published from post_delete, which still knows the email
+    event_type = "created" if created else "updated"
+    model = "phone_number" if sender is not Contact else "contact"
+
+    def publish(contact_ids):
+        emails = dict(Contact.objects.filter(pk__in=contact_ids).values_list("pk", "email"))
+        for contact_id in contact_ids:
+            if contact_id in emails:
+                broker.publish(make_event(event_type, model, contact_id, emails[contact_id]))
+
+    # The transaction's first notification of a contact decides its event
+    on_commit_once("events", contact_ids, publish)
+
+
+@receiver(post_delete, sender=Contact)
+def publish_deletion(sender, instance, **kwargs):
+    broker = get_broker()
+    if broker.has_subscribers():
+        event = make_event("deleted", "contact", instance.pk, instance.email)
+        transaction.on_commit(lambda: broker.publish(event))
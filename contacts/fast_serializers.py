@@ -0,0 +1,93 @@
+"""
+Read-only fast path building ContactSerializer payloads straight from `.values()` rows.
+
+Why this exists:
+- On large list pages most of the CPU went to DRF field machinery: one model
+  instance per contact and per phone number, then a `to_representation` call per
+  field of each of them.
+- Here contacts are read as `.values()` rows and their phone numbers with one
+  `values_list()` query, grouped by `contact_id`. No model instance or serializer
+  field is built.
+
+The output must stay identical to `ContactSerializer(..., many=True).data`:
+same keys in the same order, same value types, phone numbers in primary key order
+(`phone_numbers_prefetch()` gives the serializer path that order too).
+A change to ContactSerializer's fields needs the same change here;
+`FastSerializerParityTests` fails otherwise.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from contacts.metrics import serializer_timer
+from contacts.models import PhoneNumber
+from contacts.serializers import ContactSerializer
+
+FIELDS = ContactSerializer.Meta.fields
+PHONE_FIELDS = ("id", "contact_id", "number", "type")
+
+
+def datetime_formatter():
+    """
+    `DateTimeField().to_representation` for timestamps read from the database.
+    The field looks the time zone up again for every value, which made timestamps
+    most of the cost of a row; here it's looked up once per call.
+    """
+    output_format = api_settings.DATETIME_FORMAT
+    if not isinstance(output_format, str) or output_format.lower() != ISO_8601:
+        return serializers.DateTimeField().to_representation
+    field_timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def to_representation(value):
+        if field_timezone is not None:
+            value = value.astimezone(field_timezone)
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return to_representation
+
+
+def _columns(fields):
+    return [field for field in fields if field != "phone_numbers"]
+
+
+def contact_rows(queryset, fields=FIELDS, extra=()):
+    """
+    The `.values()` rows the fast path serializes, for a (filtered, ordered) contact queryset:
+    the columns among `fields`, plus `id` and any `extra` ones (e.g. the pagination ordering).
+    """
+    return queryset.prefetch_related(None).values(*dict.fromkeys(["id", *_columns(fields), *extra]))
+
+
+def serialize_contact_rows(rows, using=None, fields=FIELDS):
+    """
+    Returns the ContactSerializer representation of contact `rows` (see `contact_rows`),
+    narrowed to `fields`. Phone numbers, when in `fields`, are read with one query on `using`.
+    """
+    if not rows:
+        return []
+    phone_rows = None
+    if "phone_numbers" in fields:
+        queryset = PhoneNumber.objects.using(using) if using else PhoneNumber.objects
+        phone_rows = list(
+            queryset.filter(contact_id__in=[row["id"] for row in rows]).order_by("id").values_list(*PHONE_FIELDS)
+        )
+
+    with serializer_timer():
+        columns = _columns(fields)
+        to_representation = datetime_formatter() if "created_at" in columns else None
+        phones = None
+        if phone_rows is not None:
+            phones = {row["id"]: [] for row in rows}
+            for phone_id, contact_id, number, phone_type in phone_rows:
+                phones[contact_id].append({"id": phone_id, "contact": contact_id, "number": number, "type": phone_type})
+
+        results = []
+        for row in rows:
+            item = {column: row[column] for column in columns}
+            if to_representation is not None:
+                item["created_at"] = to_representation(item["created_at"])
+            if phones is not None:
+                item["phone_numbers"] = phones[row["id"]]
+            results.append(item)
+        return results
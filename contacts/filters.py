@@ -8,24 +8,92 @@ by both name and related phone number.
 Why this exists:
 - We need to allow users to filter contacts by their `name` (a direct field)
   and by `phone number` (a related field on the PhoneNumber model).
-- Using a custom `filter_by_phone` method enables filtering on the related
-  `phone_numbers__number` field, which isn't natively supported by default filters.
+- Custom filter methods narrow the search down through the trigram index in
+  `contacts/search.py` first, so `icontains` only runs against candidate rows
+  instead of scanning every contact and phone number.
+- Phone searches compare digits only, so "020 7946-0958" matches "02079460958".
+- Related-field conditions are correlated `EXISTS` subqueries (`related_exists`)
+  rather than JOINs: a JOIN returns a contact once per matching phone number,
+  while `EXISTS` is a semi-join that returns each contact at most once.
 - We use `icontains` for partial and case-insensitive search.
+- Case-insensitive prefix matches compare `Lower(field)` in byte order
+  (`lower_startswith`) so they can use the functional index on Contact.
+- Exact `email` and `phone_exact` lookups compare the canonical columns
+  (`Contact.email_canonical`, `PhoneNumber.number_canonical`): one index probe each.
+  Substring `phone` searches keep the digits as typed, so "0044..." is found by "0044".
 
 Example usage:
-  /api/test-contacts/?name=John&phone=1234
+  /api/test-contacts/?name=John&phone=1234&email=john@example.com
+  /api/test-contacts/?phone_exact=0044-20-7946-0958
 """
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
 from django_filters import rest_framework as filters
-from contacts.models import Contact
+from contacts.models import (
+    BytewiseOrder, Contact, ContactSearchGram, PhoneNumber, canonical_phone, normalize_email, normalize_phone,
+)
+from contacts.search import matching_contacts
+
+
+def related_exists(relation, **lookups):
+    """
+    Correlated `EXISTS` over a reverse relation of Contact.
+    e.g. `related_exists("phone_numbers", number="123")`
+    Use this for any filter on a related model instead of `relation__field` lookups.
+    """
+    field = Contact._meta.get_field(relation)
+    return Exists(field.related_model.objects.filter(**{field.field.name: OuterRef("pk")}, **lookups))
+
+
+def lower_startswith(field, prefix):
+    """
+    Case-insensitive prefix match written as a range on `Lower(field)`:
+    unlike `LIKE 'abc%'`, a range can use an expression index on every backend.
+    The range is compared in byte order (`BytewiseOrder`), the only order in which
+    it holds exactly the values starting with `prefix`.
+    """
+    prefix = prefix.lower()
+    if not prefix:
+        return Q()
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    value = BytewiseOrder(Lower(field))
+    return Q(GreaterThanOrEqual(value, prefix), LessThan(value, upper))
 
 
 class ContactFilter(filters.FilterSet):
-    name = filters.CharFilter(field_name="name", lookup_expr="icontains")
+    name = filters.CharFilter(method="filter_by_name")
     phone = filters.CharFilter(method="filter_by_phone")
+    phone_exact = filters.CharFilter(method="filter_by_phone_exact")
+    email = filters.CharFilter(method="filter_by_email")
 
     class Meta:
         model = Contact
-        fields = ["name", "phone"]
+        fields = ["name", "phone", "phone_exact", "email"]
+
+    def filter_by_name(self, queryset, name, value):
+        candidates = matching_contacts(ContactSearchGram.NAME, value)
+        if candidates is not None:
+            queryset = queryset.filter(pk__in=candidates)
+        return queryset.filter(name__icontains=value)
 
     def filter_by_phone(self, queryset, name, value):
-        return queryset.filter(phone_numbers__number__icontains=value)
\ No newline at end of file
+        digits = normalize_phone(value)
+        if not digits:
+            # Nothing to normalize (e.g. an extension label): plain text search
+            return queryset.filter(related_exists("phone_numbers", number__icontains=value))
+        candidates = matching_contacts(ContactSearchGram.PHONE, digits)
+        if candidates is not None:
+            queryset = queryset.filter(pk__in=candidates)
+        return queryset.filter(related_exists("phone_numbers", number_digits__contains=digits))
+
+    def filter_by_phone_exact(self, queryset, name, value):
+        key = canonical_phone(value)
+        if not key:
+            return queryset.none()
+        # Uncorrelated `IN` (still a semi-join): the number_canonical index is probed once up front,
+        # whereas a correlated EXISTS would be evaluated for every contact
+        return queryset.filter(pk__in=PhoneNumber.objects.filter(number_canonical=key).values("contact_id"))
+
+    def filter_by_email(self, queryset, name, value):
+        return queryset.filter(email_canonical=normalize_email(value))
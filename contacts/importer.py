@@ -0,0 +1,201 @@
+"""
+Streaming import of contacts from NDJSON or CSV files (plain or gzipped).
+
+Why this exists:
+- Importing through `POST /api/contacts/` costs an HTTP round trip, a full
+  serializer build and one INSERT per contact and per phone number.
+- Here the file is read in batches. Parsing and validation (the CPU-heavy part)
+  can run in a pool of worker processes, while the main process upserts each
+  validated batch with a couple of `bulk_create(update_conflicts=True)` statements.
+
+Rules:
+- Rows are validated like `ContactSerializer` input (`BulkContactSerializer`),
+  including the duplicate phone type check that backs `unique_together`.
+- Contacts are upserted by canonical (lowercased) email: existing contacts get the
+  imported name and keep their stored email.
+  Phone numbers are upserted by `(contact, type)`; types missing from a row are left alone.
+- Within one batch the last row for an email wins, whatever its case.
+
+The file layout matches `contacts/export.py`, so an export can be imported back.
+"""
+import csv
+import gzip
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.db import transaction
+from contacts.export import PHONE_TYPES
+from contacts.models import Contact, PhoneNumber, canonical_phone, normalize_email, normalize_phone
+from contacts.serializers import BulkContactSerializer
+from contacts.signals import contacts_changed
+
+IMPORT_FORMATS = ("ndjson", "csv")
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def detect_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+def open_source(path):
+    """Opens `path` as text, transparently decompressing gzip files."""
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def read_rows(stream, file_format):
+    """
+    Yields `(line_number, raw_row)`. NDJSON lines are yielded unparsed so that
+    decoding happens in the workers along with validation.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(stream, 1):
+            if line.strip():
+                yield line_number, line
+
+
+def csv_row_to_item(row):
+    return {
+        "name": row.get("name") or "",
+        "email": row.get("email") or "",
+        "phone_numbers": [
+            {"number": row[phone_type], "type": phone_type}
+            for phone_type in PHONE_TYPES if row.get(phone_type)
+        ],
+    }
+
+
+_serializer = None
+
+
+def parse_and_validate(file_format, batch):
+    """
+    Parses and validates a batch of raw rows. Runs in worker processes, so it
+    only returns plain, picklable data: `(valid_rows, rejected_rows)`.
+    """
+    global _serializer
+    if _serializer is None:
+        # One instance per process: building serializer fields is the expensive part
+        _serializer = BulkContactSerializer()
+
+    valid, rejected = [], []
+    for line_number, raw in batch:
+        if file_format == "csv":
+            item = csv_row_to_item(raw)
+        else:
+            try:
+                item = json.loads(raw)
+            except ValueError as exc:
+                rejected.append({"line": line_number, "row": raw.rstrip("\n"),
+                                 "errors": {"non_field_errors": [f"Invalid JSON: {exc}"]}})
+                continue
+        data, errors = _serializer.validate_item(item)
+        if errors:
+            rejected.append({"line": line_number, "row": item, "errors": json.loads(json.dumps(errors))})
+        else:
+            valid.append({
+                "name": data["name"],
+                "email": data["email"],
+                "phone_numbers": [
+                    {"number": phone["number"], "type": phone["type"]} for phone in data["phone_numbers"]
+                ],
+            })
+    return valid, rejected
+
+
+def upsert_contacts(rows):
+    """Upserts validated rows by canonical email in one transaction. Returns the number of contacts written."""
+    by_email = {normalize_email(row["email"]): row for row in rows}
+    if not by_email:
+        return 0
+    with transaction.atomic():
+        Contact.objects.bulk_create(
+            [Contact(name=row["name"], email=row["email"], email_canonical=email) for email, row in by_email.items()],
+            update_conflicts=True, unique_fields=["email_canonical"], update_fields=["name"],
+        )
+        # Upserted rows don't reliably report their primary key on every backend
+        ids = dict(Contact.objects.filter(email_canonical__in=list(by_email)).values_list("email_canonical", "id"))
+        PhoneNumber.objects.bulk_create(
+            [
+                PhoneNumber(contact_id=ids[email], number=phone["number"], number_digits=normalize_phone(phone["number"]),
+                            number_canonical=canonical_phone(phone["number"]), type=phone["type"])
+                for email, row in by_email.items()
+                for phone in row["phone_numbers"]
+            ],
+            update_conflicts=True, unique_fields=["contact", "type"],
+            update_fields=["number", "number_digits", "number_canonical"],
+        )
+        # bulk_create skips model signals
+        contacts_changed.send(sender=Contact, contact_ids=list(ids.values()), deleted=False)
+    return len(by_email)
+
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _validated_batches(file_format, batches, workers):
+    if not workers:
+        for batch in batches:
+            yield parse_and_validate(file_format, batch)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        # Bounded look-ahead: reading never runs more than a few batches ahead of writing
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(executor.submit(parse_and_validate, file_format, batch))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def import_contacts(stream, file_format, batch_size=None, workers=0, rejects=None, progress=None):
+    """
+    Imports every row of `stream`.
+    - rejects: optional text file receiving one JSON object per rejected row
+    - progress: optional callable receiving the running stats after every batch
+
+    Returns stats: `{"rows", "imported", "rejected", "seconds", "rows_per_second"}`.
+    """
+    batch_size = batch_size or getattr(settings, "CONTACTS_IMPORT_BATCH_SIZE", 1000)
+    stats = {"rows": 0, "imported": 0, "rejected": 0, "seconds": 0.0, "rows_per_second": 0.0}
+    started = time.monotonic()
+
+    batches = _batches(read_rows(stream, file_format), batch_size)
+    for valid, rejected in _validated_batches(file_format, batches, workers):
+        stats["imported"] += upsert_contacts(valid)
+        stats["rejected"] += len(rejected)
+        stats["rows"] += len(valid) + len(rejected)
+        if rejects is not None:
+            rejects.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rejected)
+
+        stats["seconds"] = time.monotonic() - started
+        stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        if progress is not None:
+            progress(stats)
+    return stats
+
+
+def default_workers():
+    return max((os.cpu_count() or 1) - 1, 0)
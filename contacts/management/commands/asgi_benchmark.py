@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from contacts.benchmarks.asgi import SCENARIOS, run_asgi_benchmarks
+from contacts.benchmarks.runner import BenchmarkError
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares requests per second of the sync and async contact views under uvicorn "
+        "(pip install uvicorn). Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=10_000, help="Number of contacts to seed.")
+        parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive connections.")
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each scenario.")
+        parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), help="Defaults to all of them.")
+        parser.add_argument("--output", "-o", help="Write results as JSON to this file.")
+
+    def handle(self, *args, size, concurrency, seconds, scenarios, output, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            # Every request reaches the views: the response cache would hide the difference
+            with override_settings(CACHES=DUMMY_CACHES):
+                results = run_asgi_benchmarks(size, concurrency, seconds, scenarios, progress=self.stderr.write)
+        except BenchmarkError as exc:
+            raise CommandError(str(exc))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if output:
+            with open(output, "w") as stream:
+                json.dump(results, stream, indent=2)
+        else:
+            self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from contacts.benchmarks.runner import SCENARIOS, find_regressions, run_benchmarks
+
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures latency percentiles, query counts and peak memory of the contacts API "
+        "on seeded datasets. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                            help="Dataset sizes (number of contacts) to measure.")
+        parser.add_argument("--iterations", type=int, default=50, help="Requests per scenario and size.")
+        parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), help="Defaults to all of them.")
+        parser.add_argument("--output", "-o", help="Write results as JSON to this file.")
+        parser.add_argument("--baseline", help="Results file of an earlier run to compare against.")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Relative p95 slowdown reported as a regression (default 0.2 = 20%%).")
+        parser.add_argument("--with-cache", action="store_true",
+                            help="Keep the response cache on (by default every request hits the database).")
+        parser.add_argument("--with-metrics", action="store_true",
+                            help="Turn request metrics on, to measure their overhead against a run without.")
+
+    def handle(self, *args, sizes, iterations, scenarios, output, baseline, threshold, with_cache, with_metrics,
+               **options):
+        baseline_results = None
+        if baseline:
+            with open(baseline) as stream:
+                baseline_results = json.load(stream)
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        overrides = {"CONTACTS_METRICS_ENABLED": with_metrics}
+        if not with_cache:
+            overrides["CACHES"] = DUMMY_CACHES
+        try:
+            with override_settings(**overrides):
+                results = run_benchmarks(sizes, iterations, scenarios, progress=self.stderr.write)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if output:
+            with open(output, "w") as stream:
+                json.dump(results, stream, indent=2)
+        else:
+            self.stdout.write(json.dumps(results, indent=2))
+
+        if baseline_results is not None:
+            regressions = find_regressions(results, baseline_results, threshold)
+            if regressions:
+                raise CommandError("Regressions against baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from contacts.changes import compact_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes change feed entries older than the retention period that a newer entry "
+        "for the same contact supersedes. Run it periodically (e.g. daily from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retention-days", type=float,
+                            help="Defaults to the CONTACTS_CHANGES_RETENTION_DAYS setting.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Entries deleted per statement.")
+
+    def handle(self, *args, retention_days, batch_size, **options):
+        deleted = compact_changes(retention_days, batch_size)
+        self.stdout.write(f"Deleted {deleted} superseded change entries.")
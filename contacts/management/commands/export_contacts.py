@@ -0,0 +1,24 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from contacts.export import EXPORT_FORMATS, export_contacts
+
+
+class Command(BaseCommand):
+    help = "Streams every contact with its phone numbers as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", dest="file_format")
+        parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output.")
+        parser.add_argument("--output", "-o", help="File to write to (defaults to stdout).")
+        parser.add_argument("--chunk-size", type=int, help="Contacts read per query.")
+
+    def handle(self, *args, file_format, gzip, output, chunk_size, **options):
+        blocks = export_contacts(file_format, compress=gzip, chunk_size=chunk_size)
+        if output:
+            with open(output, "wb") as stream:
+                stream.writelines(blocks)
+        else:
+            # Binary output (gzip) can't go through the text-mode self.stdout
+            sys.stdout.buffer.writelines(blocks)
+            sys.stdout.buffer.flush()
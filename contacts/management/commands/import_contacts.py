@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from contacts.importer import IMPORT_FORMATS, default_workers, detect_format, import_contacts, open_source
+
+
+class Command(BaseCommand):
+    help = "Imports contacts from an NDJSON or CSV file (optionally gzipped), upserting by email."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import; gzip is detected automatically.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, dest="file_format",
+                            help="Defaults to the file extension (.csv or .ndjson).")
+        parser.add_argument("--batch-size", type=int, help="Rows validated and written together.")
+        parser.add_argument("--workers", type=int, default=default_workers(),
+                            help="Processes used for parsing and validation (0 runs inline).")
+        parser.add_argument("--rejects", help="File receiving rejected rows with their errors (NDJSON).")
+
+    def handle(self, *args, path, file_format, batch_size, workers, rejects, **options):
+        file_format = file_format or detect_format(path)
+        try:
+            source = open_source(path)
+        except OSError as exc:
+            raise CommandError(exc)
+
+        rejects_file = open(rejects, "w", encoding="utf-8") if rejects else None
+        try:
+            with source:
+                stats = import_contacts(
+                    source, file_format, batch_size=batch_size, workers=workers,
+                    rejects=rejects_file, progress=self.report_progress,
+                )
+        finally:
+            if rejects_file:
+                rejects_file.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['imported']} contacts from {stats['rows']} rows "
+            f"({stats['rejected']} rejected) in {stats['seconds']:.1f}s, "
+            f"{stats['rows_per_second']:.0f} rows/s."
+        ))
+
+    def report_progress(self, stats):
+        self.stderr.write(
+            f"{stats['rows']} rows, {stats['rejected']} rejected, {stats['rows_per_second']:.0f} rows/s",
+            ending="\r",
+        )
@@ -0,0 +1,15 @@
+import json
+
+from django.core.management.base import BaseCommand
+from contacts.benchmarks.json_codecs import run_json_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compares encode and decode throughput of the API's JSON renderer and parser with DRF's."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=10_000, help="Contacts in the payload.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best one is kept.")
+
+    def handle(self, *args, size, repeat, **options):
+        self.stdout.write(json.dumps(run_json_benchmark(size, repeat), indent=2))
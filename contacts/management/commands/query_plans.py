@@ -0,0 +1,33 @@
+from textwrap import indent
+
+from django.core.management.base import BaseCommand
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from contacts.benchmarks.datasets import seed_contacts
+from contacts.benchmarks.plans import explain_hot_queries, without_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the query plans of the hot contact queries with and without their indexes. "
+        "Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=10_000, help="Number of contacts to seed.")
+
+    def handle(self, *args, size, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            seed_contacts(size)
+            with_indexes = explain_hot_queries()
+            with without_indexes():
+                before = explain_hot_queries()
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        for name, plan in with_indexes.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write("  without indexes:\n" + indent(before[name], "    "))
+            self.stdout.write("  with indexes:\n" + indent(plan, "    "))
@@ -0,0 +1,27 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from contacts.benchmarks.concurrency import run_stress
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs concurrent reads and read-modify-write transactions against temporary SQLite "
+        "databases, once per profile in SQLITE_PROFILES, and reports throughput and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", choices=list(settings.SQLITE_PROFILES),
+                            default=list(settings.SQLITE_PROFILES))
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run.")
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of operations that write.")
+        parser.add_argument("--contacts", type=int, default=2000, help="Contacts seeded before each run.")
+
+    def handle(self, *args, profiles, threads, seconds, write_ratio, contacts, **options):
+        results = [
+            run_stress(profile, threads=threads, seconds=seconds, write_ratio=write_ratio, contacts=contacts)
+            for profile in profiles
+        ]
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,159 @@
+"""
+Per-view request metrics, exposed in the Prometheus text format.
+
+Why this exists:
+- We had no view of how many queries each endpoint runs or where its time goes.
+- `contacts.middleware.QueryMetricsMiddleware` measures every request and feeds
+  the histograms below; `GET /metrics` renders them for Prometheus to scrape.
+
+Recorded per view (`resolver_match.view_name`, e.g. "contacts-list"):
+- request duration, DB query count, DB time, serializer time, response size
+
+Metrics live in process memory: with several workers, each one exposes its own.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# The recorder of the request being handled, if metrics are enabled
+current_recorder = ContextVar("contacts_metrics_recorder", default=None)
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = (
+    # (name, help, buckets, recorder attribute)
+    ("contacts_request_duration_seconds", "Time spent handling the request.", DURATION_BUCKETS, "duration"),
+    ("contacts_db_queries", "SQL queries run by the request.", QUERY_BUCKETS, "query_count"),
+    ("contacts_db_duration_seconds", "Time spent in SQL queries.", DURATION_BUCKETS, "db_time"),
+    ("contacts_serializer_duration_seconds", "Time spent serializing responses.", DURATION_BUCKETS,
+     "serializer_time"),
+    ("contacts_response_size_bytes", "Size of the response body.", SIZE_BUCKETS, "response_size"),
+)
+
+
+class QueryRecorder:
+    """
+    Connection execute wrapper that counts and times the queries of one request.
+    SQL text is only kept when `keep_sql` is set (slow request logging).
+    """
+
+    def __init__(self, keep_sql=False):
+        self.keep_sql = keep_sql
+        self.queries = []
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.duration = 0.0
+        self.response_size = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.query_count += 1
+            self.db_time += elapsed
+            if self.keep_sql:
+                self.queries.append((elapsed, sql))
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed once on every connection, reporting to the recorder of
+    the current request. Async ORM calls run in worker threads with a copy of the
+    request's context, so their queries are attributed to the right request too.
+    """
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Installed whether or not metrics are enabled: without a recorder it costs one context variable lookup
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializer_timer():
+    recorder = current_recorder.get()
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.serializer_time += time.perf_counter() - started
+
+
+class TimedDataMixin:
+    """Serializer mixin adding the time spent building `.data` to the current request's metrics."""
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: above every bucket (+Inf)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, view, recorder):
+        with self._lock:
+            for name, _, buckets, attribute in METRICS:
+                histogram = self._histograms.get((name, view))
+                if histogram is None:
+                    histogram = self._histograms[(name, view)] = Histogram(buckets)
+                histogram.observe(getattr(recorder, attribute))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """Renders every histogram in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, help_text, buckets, _ in METRICS:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, view), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    label = view.replace("\\", "\\\\").replace('"', '\\"')
+                    cumulative = 0
+                    for bound, count in zip((*buckets, "+Inf"), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{view="{label}"}} {histogram.total}')
+                    lines.append(f'{name}_count{{view="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,162 @@
+"""
+Middleware for the contacts project.
+
+Both middleware run natively under WSGI and ASGI (`AsyncCapableMiddleware`): a
+sync-only middleware would make Django run every async view through a thread.
+
+QueryMetricsMiddleware:
+- Counts and times the SQL queries of each request through the execute wrapper
+  installed on every new connection (`contacts.metrics.record_query`).
+- Records request duration, DB time, serializer time and response size per view
+  in `contacts.metrics.registry`, which `GET /metrics` exposes.
+- Optionally logs requests slower than `CONTACTS_SLOW_REQUEST_MS` with their SQL.
+
+Enabled with `CONTACTS_METRICS_ENABLED`; when off it removes itself from the
+middleware chain and costs nothing.
+
+ReplicaRoutingMiddleware:
+- Lets safe requests to views with `replica_reads = True` (DRF view classes or
+  plain view functions) read from the replica (see contacts/routers.py).
+- Pins a client to the primary for `CONTACTS_REPLICA_PIN_SECONDS` after each of
+  its writes, so it reads its own writes despite replication lag. The pin travels
+  as a cookie, or as the `X-Primary-Pin` header for clients without cookies.
+- Removes itself from the middleware chain when no replica is configured.
+"""
+import logging
+import math
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import SAFE_METHODS
+from contacts.metrics import QueryRecorder, current_recorder, registry
+from contacts.routers import replica_configured, replica_reads
+
+logger = logging.getLogger("contacts.metrics")
+
+
+class AsyncCapableMiddleware:
+    """
+    Middleware that adapts to the mode of the handler it wraps.
+    Subclasses implement:
+    - `wrap(request)`: a context manager around the rest of the chain, yielding a state
+    - `process(request, response, state)`: returns the response
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.wrap(request) as state:
+            response = self.get_response(request)
+        return self.process(request, response, state)
+
+    async def __acall__(self, request):
+        with self.wrap(request) as state:
+            response = await self.get_response(request)
+        return self.process(request, response, state)
+
+    @contextmanager
+    def wrap(self, request):
+        yield None
+
+    def process(self, request, response, state):
+        return response
+
+
+class QueryMetricsMiddleware(AsyncCapableMiddleware):
+    def __init__(self, get_response):
+        if not getattr(settings, "CONTACTS_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.slow_request_ms = getattr(settings, "CONTACTS_SLOW_REQUEST_MS", None)
+
+    @contextmanager
+    def wrap(self, request):
+        recorder = QueryRecorder(keep_sql=self.slow_request_ms is not None)
+        token = current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            yield recorder
+        finally:
+            recorder.duration = time.perf_counter() - started
+            current_recorder.reset(token)
+
+    def process(self, request, response, recorder):
+        # Streamed bodies are produced after the view returns and can't be sized here
+        recorder.response_size = 0 if response.streaming else len(response.content)
+
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        registry.record(view, recorder)
+
+        if self.slow_request_ms is not None and recorder.duration * 1000 >= self.slow_request_ms:
+            self.log_slow_request(request, view, recorder)
+        return response
+
+    def log_slow_request(self, request, view, recorder):
+        queries = "\n".join(f"  [{elapsed * 1000:.1f}ms] {sql}" for elapsed, sql in recorder.queries)
+        logger.warning(
+            "Slow request %s %s (%s): %.1fms, %d queries in %.1fms, serializer %.1fms\n%s",
+            request.method, request.get_full_path(), view, recorder.duration * 1000,
+            recorder.query_count, recorder.db_time * 1000, recorder.serializer_time * 1000, queries,
+        )
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    pin_cookie = "contacts_primary_pin"
+    # Unix time until which reads stay on the primary; sent back by the client as-is
+    pin_header = "X-Primary-Pin"
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.pin_seconds = getattr(settings, "CONTACTS_REPLICA_PIN_SECONDS", 5)
+
+    @contextmanager
+    def wrap(self, request):
+        token = replica_reads.set(self.reads_from_replica(request))
+        try:
+            yield None
+        finally:
+            replica_reads.reset(token)
+
+    def process(self, request, response, state):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self.pin(response)
+        return response
+
+    def reads_from_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        # Resolved here rather than in process_view, which Django would run in a thread under ASGI
+        try:
+            match = resolve(request.path_info, getattr(request, "urlconf", None))
+        except Resolver404:
+            return False
+        view = getattr(match.func, "cls", match.func)
+        return getattr(view, "replica_reads", False) and not self.is_pinned(request)
+
+    def is_pinned(self, request):
+        value = request.COOKIES.get(self.pin_cookie) or request.headers.get(self.pin_header)
+        try:
+            return float(value) > time.time()
+        except (TypeError, ValueError):
+            return False
+
+    def pin(self, response):
+        until = f"{time.time() + self.pin_seconds:.3f}"
+        response.set_cookie(
+            self.pin_cookie, until, max_age=math.ceil(self.pin_seconds), httponly=True, samesite="Lax",
+        )
+        response[self.pin_header] = until
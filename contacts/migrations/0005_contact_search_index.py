@@ -0,0 +1,85 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:43
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+# Frozen copies of contacts.models.normalize_phone and contacts.search.trigrams as of
+# this migration: the live helpers may change, the data written here must not
+def normalize_phone(number):
+    return re.sub(r"\D", "", number or "")
+
+
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 3 + 1)}
+
+
+def backfill_search_index(apps, schema_editor):
+    Contact = apps.get_model('contacts', 'Contact')
+    PhoneNumber = apps.get_model('contacts', 'PhoneNumber')
+    ContactSearchGram = apps.get_model('contacts', 'ContactSearchGram')
+    db_alias = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        phones = list(PhoneNumber.objects.using(db_alias).filter(pk__gt=last_id).order_by('pk')[:BATCH_SIZE])
+        if not phones:
+            break
+        for phone in phones:
+            phone.number_digits = normalize_phone(phone.number)
+        PhoneNumber.objects.using(db_alias).bulk_update(phones, ['number_digits'])
+        last_id = phones[-1].pk
+
+    last_id = 0
+    while True:
+        contacts = list(
+            Contact.objects.using(db_alias).filter(pk__gt=last_id).order_by('pk').values_list('id', 'name')[:BATCH_SIZE]
+        )
+        if not contacts:
+            break
+        phones = {}
+        for contact_id, digits in PhoneNumber.objects.using(db_alias).filter(
+            contact_id__in=[contact_id for contact_id, _ in contacts]
+        ).values_list('contact_id', 'number_digits'):
+            phones.setdefault(contact_id, set()).update(trigrams(digits))
+        ContactSearchGram.objects.using(db_alias).bulk_create([
+            ContactSearchGram(contact_id=contact_id, field=field, gram=gram)
+            for contact_id, name in contacts
+            for field, grams in (('name', trigrams(name)), ('phone', phones.get(contact_id, ())))
+            for gram in grams
+        ])
+        last_id = contacts[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0004_contact_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phonenumber',
+            name='number_digits',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ContactSearchGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('name', 'Name'), ('phone', 'Phone')], max_length=5)),
+                ('gram', models.CharField(max_length=3)),
+                ('contact', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='search_grams', to='contacts.contact')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['field', 'gram', 'contact'], name='contact_search_gram_idx')],
+                'constraints': [models.UniqueConstraint(fields=('contact', 'field', 'gram'), name='unique_contact_search_gram')],
+            },
+        ),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:03
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0006_contact_revision'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='phonenumber',
+            constraint=models.UniqueConstraint(fields=('contact', 'type'), name='unique_contact_phone_type'),
+        ),
+        # Dropped only once the constraint replacing it exists
+        migrations.AlterUniqueTogether(
+            name='phonenumber',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='contact_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='contact_email_lower_idx'),
+        ),
+    ]
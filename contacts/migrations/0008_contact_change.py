@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0007_contact_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['contact_id', 'id'], name='contact_change_contact_idx'), models.Index(fields=['changed_at'], name='contact_change_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0008_contact_change'),
+    ]
+
+    operations = [
+        # Nullable until backfilled (0010); 0011 makes it unique and required. On its own so the
+        # table lock taken by the ALTER is released before the backfill starts
+        migrations.AddField(
+            model_name='contact',
+            name='email_canonical',
+            field=models.CharField(editable=False, max_length=254, null=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:14
+
+import re
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+# Frozen copies of contacts.models.normalize_email and normalize_phone as of this
+# migration: the live helpers may change, the data written here must not
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def normalize_phone(number):
+    digits = re.sub(r"\D", "", number or "")
+    return digits[2:] if digits.startswith("00") else digits
+
+
+def backfill_canonical_keys(apps, schema_editor):
+    """
+    Each batch commits on its own (the migration isn't atomic), so no lock or
+    transaction outlives a batch. Safe to rerun after an interruption.
+    """
+    Contact = apps.get_model('contacts', 'Contact')
+    PhoneNumber = apps.get_model('contacts', 'PhoneNumber')
+    db_alias = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        with transaction.atomic(using=db_alias):
+            contacts = list(
+                Contact.objects.using(db_alias).filter(pk__gt=last_id, email_canonical__isnull=True)
+                .order_by('pk').only('email')[:BATCH_SIZE]
+            )
+            for contact in contacts:
+                contact.email_canonical = normalize_email(contact.email)
+            Contact.objects.using(db_alias).bulk_update(contacts, ['email_canonical'])
+        if not contacts:
+            break
+        last_id = contacts[-1].pk
+
+    # normalize_phone now drops the "00" international prefix: only those rows change
+    last_id = 0
+    while True:
+        with transaction.atomic(using=db_alias):
+            phones = list(
+                PhoneNumber.objects.using(db_alias).filter(pk__gt=last_id)
+                .order_by('pk').only('number', 'number_digits')[:BATCH_SIZE]
+            )
+            changed = [phone for phone in phones if phone.number_digits != normalize_phone(phone.number)]
+            for phone in changed:
+                phone.number_digits = normalize_phone(phone.number)
+            PhoneNumber.objects.using(db_alias).bulk_update(changed, ['number_digits'])
+        if not phones:
+            break
+        last_id = phones[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('contacts', '0009_contact_email_canonical'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_canonical_keys, migrations.RunPython.noop),
+    ]
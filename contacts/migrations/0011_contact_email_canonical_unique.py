@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:14
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_case_duplicates(apps, schema_editor):
+    """Fails with the offending addresses instead of an opaque IntegrityError from the unique index."""
+    Contact = apps.get_model('contacts', 'Contact')
+    duplicates = list(
+        Contact.objects.using(schema_editor.connection.alias)
+        .values('email_canonical').annotate(count=Count('id')).filter(count__gt=1)
+        .values_list('email_canonical', flat=True)[:10]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Contacts whose emails differ only by case must be merged or renamed before "
+            f"migrating: {', '.join(duplicates)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0010_backfill_canonical_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='contact',
+            name='email_canonical',
+            field=models.CharField(editable=False, max_length=254, unique=True),
+        ),
+        # Email lookups now probe the unique index on email_canonical
+        migrations.RemoveIndex(
+            model_name='contact',
+            name='contact_email_lower_idx',
+        ),
+    ]
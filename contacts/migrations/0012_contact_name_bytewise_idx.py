@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:02
+
+import contacts.models
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0011_contact_email_canonical_unique'),
+    ]
+
+    # Same index on SQLite; on PostgreSQL it is rebuilt in the "C" collation that
+    # lower_startswith compares in
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contact',
+            name='contact_name_lower_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(contacts.models.BytewiseOrder(django.db.models.functions.text.Lower('name')), name='contact_name_lower_idx'),
+        ),
+    ]
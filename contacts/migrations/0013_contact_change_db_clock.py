@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:04
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0012_contact_name_bytewise_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contactchange',
+            name='changed_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now()),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0013_contact_change_db_clock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phonenumber',
+            name='number_canonical',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=20),
+        ),
+    ]
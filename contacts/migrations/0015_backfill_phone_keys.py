@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:16
+
+import re
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+# Frozen copies of contacts.models.normalize_phone and canonical_phone as of this
+# migration: the live helpers may change, the data written here must not
+def normalize_phone(number):
+    return re.sub(r"\D", "", number or "")
+
+
+def canonical_phone(number):
+    digits = normalize_phone(number)
+    return digits[2:] if digits.startswith("00") else digits
+
+
+def backfill_phone_keys(apps, schema_editor):
+    """
+    Fills number_canonical and puts back the digits as typed in number_digits,
+    which 0010 had stripped of the "00" prefix. Each batch commits on its own
+    (the migration isn't atomic). Safe to rerun after an interruption.
+    """
+    PhoneNumber = apps.get_model('contacts', 'PhoneNumber')
+    db_alias = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        with transaction.atomic(using=db_alias):
+            phones = list(
+                PhoneNumber.objects.using(db_alias).filter(pk__gt=last_id)
+                .order_by('pk').only('number', 'number_digits', 'number_canonical')[:BATCH_SIZE]
+            )
+            changed = [
+                phone for phone in phones
+                if (phone.number_digits, phone.number_canonical)
+                != (normalize_phone(phone.number), canonical_phone(phone.number))
+            ]
+            for phone in changed:
+                phone.number_digits = normalize_phone(phone.number)
+                phone.number_canonical = canonical_phone(phone.number)
+            PhoneNumber.objects.using(db_alias).bulk_update(changed, ['number_digits', 'number_canonical'])
+        if not phones:
+            break
+        last_id = phones[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('contacts', '0014_phonenumber_number_canonical'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_phone_keys, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,79 @@
+import re
+
 from django.db import models
-from django.db.models import CASCADE
+from django.db.models import CASCADE, Func, Prefetch
+from django.db.models.functions import Lower, Now
+
+
+def normalize_phone(number):
+    """Digits-only form of a phone number, e.g. "+44 (20) 7946-0958" -> "442079460958"."""
+    return re.sub(r"\D", "", number or "")
+
+
+def canonical_phone(number):
+    """
+    Canonical E.164-like key of a phone number for exact matches: digits only, without the
+    "00" international prefix, e.g. "+44 (20) 7946-0958" and "0044 20 7946 0958" -> "442079460958".
+    """
+    digits = normalize_phone(number)
+    return digits[2:] if digits.startswith("00") else digits
+
+
+def normalize_email(email):
+    """Canonical form of an email address used for lookups and uniqueness, e.g. " Ann@X.com" -> "ann@x.com"."""
+    return (email or "").strip().lower()
+
+
+class BytewiseOrder(Func):
+    """
+    Its text argument, compared byte by byte (code point order): `COLLATE "C"` on
+    PostgreSQL, SQLite's default BINARY collation as is. Range lookups on text only
+    select prefixes under such an order; linguistic collations (en_US, ICU) skip
+    punctuation and fold accents, so "a-c" would sort between "ab" and "ac".
+    """
+    arity = 1
+    template = "%(expressions)s"
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='%(expressions)s COLLATE "C"', **extra_context)
 
 
 class Contact(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField(unique=True, blank=False, null=False)
+    # Kept in sync with `email` on save; bulk writers must set it themselves
+    email_canonical = models.CharField(max_length=254, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every write to the contact or its phone numbers (see contacts/conditional.py)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Only ever incremented in the database (F("revision") + 1); save() never writes it back
+    revision = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination, which orders and seeks on (created_at, id)
+            models.Index(fields=["created_at", "id"], name="contact_created_id_idx"),
+            # Backs case-insensitive name prefix lookups written against Lower(...) (see contacts/filters.py)
+            models.Index(BytewiseOrder(Lower("name")), name="contact_name_lower_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.email_canonical = normalize_email(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # Every loaded column but `revision`: the in-memory copy may be older than the row,
+            # and writing it back would rewind the counter ETags are built from
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred
+            ]
+        if update_fields is not None:
+            update_fields = set(update_fields) - {'revision'}
+            if 'email' in update_fields:
+                update_fields.add('email_canonical')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
 
 
 class PhoneNumber(models.Model):
@@ -16,13 +84,79 @@ class PhoneNumber(models.Model):
         )
     contact = models.ForeignKey(Contact, related_name='phone_numbers', on_delete=CASCADE)
     number = models.CharField(max_length=20)
+    # Kept in sync with `number` on save; bulk writers must set them themselves.
+    # The digits as typed, for substring search...
+    number_digits = models.CharField(max_length=20, blank=True, editable=False, db_index=True)
+    # ...and the canonical key, for exact matches
+    number_canonical = models.CharField(max_length=20, blank=True, editable=False, db_index=True)
     type = models.CharField(max_length=10, choices=PHONE_TYPES)
 
     class Meta:
-        # Prevents multiple numbers of the same type for one contact
-        unique_together = ('contact', 'type')
+        constraints = [
+            # Prevents multiple numbers of the same type for one contact
+            models.UniqueConstraint(fields=['contact', 'type'], name='unique_contact_phone_type'),
+        ]
         verbose_name = "Phone Number"
         verbose_name_plural = "Phone Numbers"
 
     def __str__(self):
-        return f"{self.contact.name} - {self.type}: {self.number}"
\ No newline at end of file
+        return f"{self.contact.name} - {self.type}: {self.number}"
+
+    def save(self, *args, **kwargs):
+        self.number_digits = normalize_phone(self.number)
+        self.number_canonical = canonical_phone(self.number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'number_digits', 'number_canonical'}
+        super().save(*args, **kwargs)
+
+
+def phone_numbers_prefetch():
+    """Prefetches contacts' phone numbers in primary key order, the order every representation uses."""
+    return Prefetch("phone_numbers", queryset=PhoneNumber.objects.order_by("id"))
+
+
+class ContactSearchGram(models.Model):
+    """
+    Trigram posting list used to search contacts by substring (see contacts/search.py).
+    One row per distinct (contact, field, gram); rebuilt whenever a contact or
+    one of its phone numbers changes.
+    """
+    NAME = 'name'
+    PHONE = 'phone'
+    FIELDS = (
+        (NAME, 'Name'),
+        (PHONE, 'Phone'),
+    )
+    # The unique constraint's index already starts with contact_id
+    contact = models.ForeignKey(Contact, related_name='search_grams', on_delete=CASCADE, db_index=False)
+    field = models.CharField(max_length=5, choices=FIELDS)
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['contact', 'field', 'gram'], name='unique_contact_search_gram'),
+        ]
+        indexes = [
+            # Covering index: a lookup never has to touch the table itself
+            models.Index(fields=['field', 'gram', 'contact'], name='contact_search_gram_idx'),
+        ]
+
+
+class ContactChange(models.Model):
+    """
+    Append-only log of contact writes, read by the change feed (see contacts/changes.py).
+    One row per contact and change notification; `id` is the position in the feed.
+    """
+    # Not a foreign key: entries outlive the contacts they describe
+    contact_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    # The database's clock, so that entries and the feed's settle check agree on the time
+    changed_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        indexes = [
+            # Compaction looks up newer entries of the same contact
+            models.Index(fields=['contact_id', 'id'], name='contact_change_contact_idx'),
+            models.Index(fields=['changed_at'], name='contact_change_time_idx'),
+        ]
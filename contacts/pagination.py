@@ -0,0 +1,182 @@
+"""
+Keyset (cursor) pagination for the Contact API.
+
+Why this exists:
+- Returning the whole table on every GET does not scale: every row is built,
+  every related phone number is prefetched and everything is serialized at once.
+- OFFSET pagination still scans and discards all skipped rows, so page N gets
+  slower the deeper a client goes.
+- Keyset pagination remembers the position of the last row served and asks for
+  rows strictly after it. With an index on the ordering columns every page is a
+  single range scan, whatever its depth.
+
+Cursors are opaque (base64-encoded JSON) so clients can't depend on their shape.
+
+Example usage:
+  /api/contacts/?page_size=100
+  /api/contacts/?cursor=eyJwIjpbIjIwMjUtMDctMjJUMTU6Mjc6MDBaIiwiNDIiXX0
+"""
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates on a unique, composite ordering (by default `(created_at, id)`).
+    `id` acts as a tie-breaker so rows sharing a timestamp are never skipped.
+    """
+    ordering = ("created_at", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        default = api_settings.PAGE_SIZE
+        max_page_size = getattr(settings, "CONTACTS_MAX_PAGE_SIZE", default)
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=max_page_size,
+            )
+        except (KeyError, ValueError):
+            return default
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        """`paginate_queryset` for async views: fetches the page with the async ORM."""
+        queryset = self.page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        # aiterator() only prefetches related objects when given a chunk size
+        return self.set_page([obj async for obj in queryset.aiterator(chunk_size=self.page_size + 1)])
+
+    def page_queryset(self, queryset, request):
+        """Orders and seeks `queryset` to the requested page. Doesn't touch the database."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.position, self.reverse = self.decode_cursor(request)
+
+        direction = "-" if self.reverse else ""
+        queryset = queryset.order_by(*[direction + field for field in self.ordering])
+        if self.position is not None:
+            queryset = queryset.filter(self.seek(self.position, self.reverse))
+
+        # One extra row tells us whether there is another page in this direction
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+        self.page = results
+
+        if self.reverse:
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+        return results
+
+    def seek(self, position, reverse):
+        """
+        Builds `(a, b, ...) > (x, y, ...)` (or `<` when paging backwards).
+        The leading `a >= x` term lets the database turn it into an index range scan.
+        """
+        op = "lt" if reverse else "gt"
+        first, *rest = self.ordering
+        condition = Q(**{f"{first}__{op}": position[0]})
+        for index in range(1, len(self.ordering)):
+            equal = {field: position[i] for i, field in enumerate(self.ordering[:index])}
+            condition |= Q(**equal, **{f"{self.ordering[index]}__{op}": position[index]})
+        bound = Q(**{f"{first}__{op}e": position[0]})
+        return bound & condition if rest else condition
+
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            # A `.values()` row (see contacts/fast_serializers.py)
+            obj = self.model(**{field: obj[field] for field in self.ordering})
+        return [self.model._meta.get_field(field).value_to_string(obj) for field in self.ordering]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            raw_position = payload["p"]
+            if len(raw_position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, raw_position)
+            ]
+            return position, bool(payload.get("r", False))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError,
+                binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse=False):
+        payload = {"p": position}
+        if reverse:
+            payload["r"] = 1
+        encoded = urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("ascii"))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode("ascii"))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Stepped past the last row: the first page is the safe way back
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class PhoneNumberKeysetPagination(KeysetPagination):
+    """Phone numbers have no timestamp; the primary key is already a unique ordering."""
+    ordering = ("id",)
@@ -0,0 +1,41 @@
+"""
+JSON renderer for the contacts API backed by orjson, when it is installed.
+
+Why this exists:
+- DRF's JSONRenderer encodes with the stdlib `json` module, which showed up as a
+  hot spot on large list pages and exports.
+- orjson encodes the same payloads several times faster (see
+  `manage.py json_benchmark`). Without it (`pip install -r requirements-speedups.txt`)
+  this is DRF's JSONRenderer.
+
+Output matches DRF's compact, UTF-8 rendering byte for byte: datetimes as ISO 8601
+with a "Z" suffix for UTC, U+2028 / U+2029 escaped, non-string keys turned into
+strings. Types orjson doesn't know (Decimal, timedelta, lazy strings, ...) go
+through DRF's JSONEncoder. Indented or ASCII-only output falls back to DRF.
+
+One difference: orjson renders NaN and infinity as `null` where DRF raises.
+The API has no float fields.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        # Same escaping as JSONRenderer: these are valid JSON but not valid JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
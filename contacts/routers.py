@@ -0,0 +1,53 @@
+"""
+Database routing between the primary ("default") and a read replica ("replica").
+
+Why this exists:
+- Writes keep the primary busy; reads of the contact endpoints can be served by a
+  streaming replica (configured with `DATABASE_REPLICA_URL`, see settings).
+
+Rules:
+- Writes and migrations go to the primary; migrations never run on the replica.
+- Reads go to the replica only while `replica_reads` is set. `ReplicaRoutingMiddleware`
+  sets it for safe requests to views with `replica_reads = True`, unless the client
+  is pinned to the primary after a recent write (read-your-writes).
+- Reads inside a transaction on the primary stay there: a replica can't see rows
+  the transaction hasn't committed yet.
+- Related lookups read from the database their starting object came from.
+"""
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+
+# Whether reads of the current request may use the replica
+replica_reads = ContextVar("contacts_replica_reads", default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections.settings
+
+
+def reads_use_replica():
+    """Whether reads of the current request go to the replica (see `ReplicaRouter.db_for_read`)."""
+    return replica_reads.get() and replica_configured() and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Related lookups (e.g. prefetches) follow the object they start from
+            return instance._state.db
+        return REPLICA_DB_ALIAS if reads_use_replica() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication
+        return db != REPLICA_DB_ALIAS
@@ -0,0 +1,89 @@
+"""
+Trigram search index for contact names and phone numbers.
+
+Why this exists:
+- `icontains` turns into `LIKE '%x%'`, which can't use a B-tree index, so every
+  search scanned the whole contacts table (and the phone table through a JOIN).
+- Instead, each contact's lowercased name and digits-only phone numbers are split
+  into 3-character grams stored in `ContactSearchGram`. A search for "x" looks up
+  the grams of "x" in an index and keeps contacts that have all of them.
+- Having every gram does not prove "x" is a substring, so callers still apply the
+  original `icontains` check, but only to the few candidate rows.
+
+Search terms shorter than a gram can't use the index; callers fall back to a scan.
+"""
+from django.db import connection, transaction
+from django.db.models import Count
+from django.dispatch import receiver
+from contacts.models import Contact, ContactSearchGram, PhoneNumber
+from contacts.signals import contacts_changed
+
+GRAM_SIZE = 3
+
+
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def build_grams(contact_id, name, phone_digits):
+    """Returns `(contact_id, field, gram)` rows for one contact."""
+    rows = [(contact_id, ContactSearchGram.NAME, gram) for gram in trigrams(name)]
+    phone_grams = set().union(*(trigrams(digits) for digits in phone_digits))
+    rows.extend((contact_id, ContactSearchGram.PHONE, gram) for gram in phone_grams)
+    return rows
+
+
+def index_contacts(contact_ids):
+    """Rebuilds the search grams of the given contacts in a constant number of queries."""
+    contact_ids = list(contact_ids)
+    names = dict(Contact.objects.filter(pk__in=contact_ids).values_list('id', 'name'))
+    phones = {}
+    for contact_id, digits in PhoneNumber.objects.filter(contact_id__in=names).values_list(
+        'contact_id', 'number_digits'
+    ):
+        phones.setdefault(contact_id, []).append(digits)
+
+    rows = [
+        row
+        for contact_id, name in names.items()
+        for row in build_grams(contact_id, name, phones.get(contact_id, []))
+    ]
+    with transaction.atomic():
+        ContactSearchGram.objects.filter(contact_id__in=contact_ids).delete()
+        if rows:
+            # Plain executemany: gram rows are tiny and numerous, so building a model
+            # instance for each one (as bulk_create does) would dominate the cost
+            with connection.cursor() as cursor:
+                cursor.executemany(_insert_sql(), rows)
+
+
+def _insert_sql():
+    quote = connection.ops.quote_name
+    meta = ContactSearchGram._meta
+    columns = ", ".join(quote(meta.get_field(name).column) for name in ('contact', 'field', 'gram'))
+    return f"INSERT INTO {quote(meta.db_table)} ({columns}) VALUES (%s, %s, %s)"
+
+
+def matching_contacts(field, term):
+    """
+    Returns a subquery of contact ids having every gram of `term` in `field`,
+    or None when the term is too short to use the index.
+    """
+    grams = trigrams(term)
+    if not grams:
+        return None
+    return (
+        ContactSearchGram.objects.filter(field=field, gram__in=grams)
+        .values('contact')
+        .annotate(hits=Count('gram'))
+        .filter(hits=len(grams))
+        .values('contact')
+    )
+
+
+@receiver(contacts_changed)
+def reindex_changed_contacts(sender, contact_ids, deleted=False, **kwargs):
+    # Grams of deleted contacts go away with them (ON DELETE CASCADE)
+    if not deleted:
+        index_contacts(contact_ids)
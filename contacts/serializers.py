@@ -1,8 +1,18 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email as email_validator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from contacts.models import Contact, PhoneNumber
+from contacts.metrics import TimedDataMixin
+from contacts.models import Contact, PhoneNumber, canonical_phone, normalize_email, normalize_phone
+from contacts.signals import coalesce_changes, contacts_changed
 from rest_framework.exceptions import ValidationError
 
 
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
+
+
 class PhoneNumberNestedSerializer(serializers.ModelSerializer):
     """
     Used only within ContactSerializer for nested read/write.
@@ -14,7 +24,7 @@ class PhoneNumberNestedSerializer(serializers.ModelSerializer):
         read_only_fields = ('contact',)  # injected from Contact serializer during save
 
 
-class PhoneNumberSerializer(serializers.ModelSerializer):
+class PhoneNumberSerializer(TimedDataMixin, serializers.ModelSerializer):
     """
     Used in standalone /api/phone-numbers/ endpoint.
     Requires `contact` to be provided explicitly.
@@ -22,15 +32,20 @@ class PhoneNumberSerializer(serializers.ModelSerializer):
     class Meta:
         model = PhoneNumber
         fields = ('id', 'contact', 'number', 'type')  # contact required here
+        list_serializer_class = TimedListSerializer
 
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(TimedDataMixin, serializers.ModelSerializer):
     """
     Handles full serialization and deserialization of Contact and nested phone numbers.
     Notes:
     - Allows nested creation/update of phone numbers.
     - Prevents duplicate types using `validate_phone_numbers`.
     - `contact` field on nested PhoneNumber is injected explicitly during save.
+    - Time spent building `.data` is reported to request metrics (`TimedDataMixin`).
+    - `fields` narrows the representation to a sparse fieldset (see `sparse_fields`).
+    - Emails are unique regardless of case: `validate_email` checks the canonical
+      column instead of the model's case-sensitive unique validator.
     """
     phone_numbers = PhoneNumberNestedSerializer(many=True)
 
@@ -38,6 +53,23 @@ class ContactSerializer(serializers.ModelSerializer):
         model = Contact
         fields = ('id', 'name', 'email', 'created_at', 'phone_numbers')
         read_only_fields = ('created_at',)
+        extra_kwargs = {'email': {'validators': []}}
+        list_serializer_class = TimedListSerializer
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def validate_email(self, value):
+        # Same single query as the validator it replaces, on the column backing the unique index
+        contacts = Contact.objects.filter(email_canonical=normalize_email(value))
+        if self.instance is not None:
+            contacts = contacts.exclude(pk=self.instance.pk)
+        if contacts.exists():
+            raise ValidationError("contact with this email already exists.")
+        return value
 
     def validate_phone_numbers(self, value):
         # Each phone type (mobile, work, home) appears only once per contact
@@ -48,22 +80,385 @@ class ContactSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         phone_numbers_data = validated_data.pop('phone_numbers', [])
-        contact = Contact.objects.create(**validated_data)
-        # Reinject `contact` into each phone entry
-        for phone_data in phone_numbers_data:
-            PhoneNumber.objects.create(contact=contact, **phone_data)
+        # One notification (and reindex) for the contact and its phone numbers
+        with transaction.atomic(), coalesce_changes():
+            contact = Contact.objects.create(**validated_data)
+            if phone_numbers_data:
+                # Reinject `contact` into each phone entry
+                PhoneNumber.objects.bulk_create([
+                    PhoneNumber(
+                        contact=contact, number_digits=normalize_phone(phone_data['number']),
+                        number_canonical=canonical_phone(phone_data['number']), **phone_data,
+                    )
+                    for phone_data in phone_numbers_data
+                ])
+                # bulk_create skips model signals
+                contacts_changed.send(sender=Contact, contact_ids=[contact.pk], deleted=False)
         return contact
 
     def update(self, instance, validated_data):
         phone_numbers_data = validated_data.pop('phone_numbers', None)
         instance.name = validated_data.get('name', instance.name)
         instance.email = validated_data.get('email', instance.email)
-        instance.save()
 
-        if phone_numbers_data is not None:
-            # Replace all existing phone numbers with new set
-            instance.phone_numbers.all().delete()
-            for phone_data in phone_numbers_data:
-                PhoneNumber.objects.create(contact=instance, **phone_data)
+        # The phone number delete and the contact save are announced once, after both
+        with transaction.atomic(), coalesce_changes():
+            if phone_numbers_data is not None:
+                self.replace_phone_numbers(instance, phone_numbers_data)
+            instance.save()
+
+        return instance
+
+    def replace_phone_numbers(self, instance, phone_numbers_data):
+        """
+        Makes the contact's phone numbers match `phone_numbers_data`.
+        Rows are reconciled by `type` (unique per contact), so unchanged rows keep
+        their primary key and are not rewritten. Runs at most four queries
+        (select, update, insert, delete) whatever the number of phones.
+        """
+        existing = {phone.type: phone for phone in instance.phone_numbers.all()}
+        to_update, to_create = [], []
+        for phone_data in phone_numbers_data:
+            phone = existing.pop(phone_data['type'], None)
+            if phone is None:
+                to_create.append(PhoneNumber(
+                    contact=instance, number_digits=normalize_phone(phone_data['number']),
+                    number_canonical=canonical_phone(phone_data['number']), **phone_data,
+                ))
+            elif phone.number != phone_data['number']:
+                phone.number = phone_data['number']
+                phone.number_digits = normalize_phone(phone.number)
+                phone.number_canonical = canonical_phone(phone.number)
+                to_update.append(phone)
+
+        # Whatever is left in `existing` was not sent and is removed
+        if existing:
+            PhoneNumber.objects.filter(pk__in=[phone.pk for phone in existing.values()]).delete()
+        if to_update:
+            PhoneNumber.objects.bulk_update(to_update, ['number', 'number_digits', 'number_canonical'])
+        if to_create:
+            PhoneNumber.objects.bulk_create(to_create)
+
+        if hasattr(instance, '_prefetched_objects_cache'):
+            instance._prefetched_objects_cache.pop('phone_numbers', None)
+
+
+EXPANDABLE_FIELDS = ('phone_numbers',)
+
+
+def _split_names(values):
+    return {name.strip() for value in values for name in value.split(',') if name.strip()}
+
+
+def sparse_fields(query_params):
+    """
+    ContactSerializer fields requested with `?fields=id,email`, in serializer order.
+    Embedded phone numbers come with a sparse fieldset only when listed in `fields`
+    or asked for with `?expand=phone_numbers`. Without `fields`, every field.
+    Raises ValidationError for unknown names.
+    """
+    all_fields = ContactSerializer.Meta.fields
+    expand = _split_names(query_params.getlist('expand'))
+    unknown = expand - set(EXPANDABLE_FIELDS)
+    if unknown:
+        raise ValidationError({'expand': [
+            f"Unknown field(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(EXPANDABLE_FIELDS)}."
+        ]})
+    if 'fields' not in query_params:
+        return all_fields
+
+    requested = _split_names(query_params.getlist('fields'))
+    unknown = requested - set(all_fields)
+    if unknown:
+        raise ValidationError({'fields': [
+            f"Unknown field(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(all_fields)}."
+        ]})
+    if not requested:
+        raise ValidationError({'fields': ["Select at least one field."]})
+    return tuple(field for field in all_fields if field in requested | expand)
+
+
+class BulkItemMixin:
+    def validate_item(self, item):
+        """
+        Validates one item against this (reused) serializer instance.
+        Building a serializer's fields costs about ten times more than validating
+        a row, so bulk callers build one instance and call this for every item.
+        Returns `(validated_data, None)` or `(None, errors)`.
+        """
+        try:
+            return self.run_validation(item), None
+        except ValidationError as exc:
+            return None, exc.detail
+
+
+class BulkContactSerializer(BulkItemMixin, ContactSerializer):
+    """
+    Validates one item of a bulk import (see `bulk_create_contacts`).
+    Notes:
+    - Same field rules as ContactSerializer, including `validate_phone_numbers`.
+    - The per-item unique email check is skipped: uniqueness is checked
+      for a whole chunk in one query instead of one query per item.
+    - `validate_item` accepts plainly valid items (string values, nothing to
+      coerce) without going through the DRF fields, which is where bulk imports
+      spent most of their validation time. Everything else, including every
+      invalid item, still goes through the serializer and gets its errors.
+    """
+    NAME_MAX_LENGTH = Contact._meta.get_field('name').max_length
+    EMAIL_MAX_LENGTH = Contact._meta.get_field('email').max_length
+    NUMBER_MAX_LENGTH = PhoneNumber._meta.get_field('number').max_length
+    PHONE_TYPES = frozenset(phone_type for phone_type, _ in PhoneNumber.PHONE_TYPES)
+
+    def validate_email(self, value):
+        return value
+
+    def validate_item(self, item):
+        data = self.fast_validated(item)
+        if data is not None:
+            return data, None
+        return super().validate_item(item)
+
+    @staticmethod
+    def _clean_text(value, max_length):
+        # CharField rules (trimmed, not blank, max length, no NUL or lone surrogates) for plain strings
+        if type(value) is not str:
+            return None
+        value = value.strip()
+        if not value or len(value) > max_length or '\x00' in value:
+            return None
+        try:
+            value.encode('utf-8')
+        except UnicodeEncodeError:
+            return None
+        return value
+
+    def fast_validated(self, item):
+        """The data `run_validation(item)` would return, or None when the serializer must decide."""
+        if type(item) is not dict or type(item.get('phone_numbers')) is not list:
+            return None
+        name = self._clean_text(item.get('name'), self.NAME_MAX_LENGTH)
+        email = self._clean_text(item.get('email'), self.EMAIL_MAX_LENGTH)
+        if name is None or email is None:
+            return None
+        try:
+            email_validator(email)
+        except DjangoValidationError:
+            return None
+        phone_numbers, types = [], set()
+        for phone in item['phone_numbers']:
+            if type(phone) is not dict:
+                return None
+            number = self._clean_text(phone.get('number'), self.NUMBER_MAX_LENGTH)
+            phone_type = phone.get('type')
+            if number is None or type(phone_type) is not str or phone_type not in self.PHONE_TYPES:
+                return None
+            if phone_type in types:
+                return None
+            types.add(phone_type)
+            phone_numbers.append({'number': number, 'type': phone_type})
+        return {'name': name, 'email': email, 'phone_numbers': phone_numbers}
+
+
+class BulkPhoneNumberSerializer(BulkItemMixin, serializers.ModelSerializer):
+    """
+    Validates one item of a phone number bulk upsert (see `bulk_upsert_phone_numbers`).
+    Notes:
+    - `contact` is a plain id: the contacts of a whole request are checked in one
+      query instead of one query per item.
+    - No unique `(contact, type)` validator: rows are upserted on that pair.
+    """
+    contact = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = PhoneNumber
+        fields = ('contact', 'number', 'type')
+        validators = []
+
+
+def bulk_create_contacts(items, chunk_size=None):
+    """
+    Validates and inserts a list of nested contacts.
+
+    Items are handled in chunks: each chunk is checked against existing emails in
+    one query, then written with one `bulk_create` for contacts and one for phone
+    numbers inside a single transaction. Invalid items are skipped and reported.
+
+    Returns `(created, errors)`:
+    - created: `{"index": i, "id": pk}` for every inserted contact
+    - errors: `{"index": i, "errors": {...}}` for every rejected item
+    """
+    chunk_size = chunk_size or getattr(settings, "CONTACTS_BULK_CHUNK_SIZE", 500)
+    created, errors = [], []
+    seen_emails = set()
+    serializer = BulkContactSerializer()
+
+    for start in range(0, len(items), chunk_size):
+        valid = []
+        for index, item in enumerate(items[start:start + chunk_size], start):
+            data, item_errors = serializer.validate_item(item)
+            if item_errors:
+                errors.append({"index": index, "errors": item_errors})
+                continue
+            email = normalize_email(data['email'])
+            if email in seen_emails:
+                errors.append({"index": index, "errors": {"email": ["Duplicate email in request."]}})
+                continue
+            seen_emails.add(email)
+            valid.append((index, data))
+
+        existing = set(
+            Contact.objects.filter(email_canonical__in=[normalize_email(data['email']) for _, data in valid])
+            .values_list('email_canonical', flat=True)
+        )
+        pending = []
+        for index, data in valid:
+            if normalize_email(data['email']) in existing:
+                errors.append({"index": index, "errors": {"email": ["contact with this email already exists."]}})
+            else:
+                pending.append((index, data))
+        if not pending:
+            continue
+
+        try:
+            with transaction.atomic():
+                contacts = Contact.objects.bulk_create([
+                    Contact(
+                        email_canonical=normalize_email(data['email']),
+                        **{k: v for k, v in data.items() if k != 'phone_numbers'},
+                    )
+                    for _, data in pending
+                ])
+                PhoneNumber.objects.bulk_create([
+                    PhoneNumber(
+                        contact=contact, number_digits=normalize_phone(phone_data['number']),
+                        number_canonical=canonical_phone(phone_data['number']), **phone_data,
+                    )
+                    for contact, (_, data) in zip(contacts, pending)
+                    for phone_data in data.get('phone_numbers', [])
+                ])
+                # bulk_create skips model signals
+                contacts_changed.send(
+                    sender=Contact, contact_ids=[contact.pk for contact in contacts], deleted=False, created=True,
+                )
+        except IntegrityError:
+            # A concurrent writer took one of the emails between the check and the insert
+            errors.extend(
+                {"index": index, "errors": {"non_field_errors": ["Chunk could not be saved, please retry."]}}
+                for index, _ in pending
+            )
+            continue
+        created.extend({"index": index, "id": contact.pk} for contact, (index, _) in zip(contacts, pending))
+
+    errors.sort(key=lambda error: error["index"])
+    return created, errors
+
+
+def bulk_upsert_phone_numbers(items, chunk_size=None):
+    """
+    Validates a list of phone numbers and upserts them on `(contact, type)`.
+
+    Every referenced contact is checked in one query. Valid items are then written in
+    chunks: one `bulk_create(update_conflicts=True)` per chunk, plus one query before
+    and after it to tell created rows from updated ones and to read their ids.
+
+    Returns `(results, errors)`:
+    - results: `{"index": i, "id": pk, "status": "created" | "updated"}` for every written item
+    - errors: `{"index": i, "errors": {...}}` for every rejected item
+    """
+    chunk_size = chunk_size or getattr(settings, "CONTACTS_BULK_CHUNK_SIZE", 500)
+    results, errors = [], []
+    seen = set()
+    serializer = BulkPhoneNumberSerializer()
+
+    valid = []
+    for index, item in enumerate(items):
+        data, item_errors = serializer.validate_item(item)
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+            continue
+        key = (data['contact'], data['type'])
+        if key in seen:
+            errors.append({"index": index, "errors": {"type": ["Duplicate phone type for this contact in request."]}})
+            continue
+        seen.add(key)
+        valid.append((index, data))
+
+    existing_contacts = set(
+        Contact.objects.filter(pk__in={data['contact'] for _, data in valid}).values_list('pk', flat=True)
+    )
+    pending = []
+    for index, data in valid:
+        if data['contact'] in existing_contacts:
+            pending.append((index, data))
+        else:
+            errors.append({"index": index, "errors": {
+                "contact": [f'Invalid pk "{data["contact"]}" - object does not exist.']
+            }})
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        contact_ids = sorted({data['contact'] for _, data in chunk})
+        phones = PhoneNumber.objects.filter(contact_id__in=contact_ids)
+        try:
+            with transaction.atomic():
+                existing = set(phones.values_list('contact_id', 'type'))
+                PhoneNumber.objects.bulk_create(
+                    [
+                        PhoneNumber(contact_id=data['contact'], number=data['number'],
+                                    number_digits=normalize_phone(data['number']),
+                                    number_canonical=canonical_phone(data['number']), type=data['type'])
+                        for _, data in chunk
+                    ],
+                    update_conflicts=True, unique_fields=['contact', 'type'],
+                    update_fields=['number', 'number_digits', 'number_canonical'],
+                )
+                # Upserted rows don't reliably report their primary key on every backend
+                ids = {(contact_id, phone_type): pk for pk, contact_id, phone_type
+                       in phones.values_list('pk', 'contact_id', 'type')}
+                # bulk_create skips model signals
+                contacts_changed.send(sender=PhoneNumber, contact_ids=contact_ids, deleted=False)
+        except IntegrityError:
+            # A contact was deleted between the check and the write
+            errors.extend(
+                {"index": index, "errors": {"non_field_errors": ["Chunk could not be saved, please retry."]}}
+                for index, _ in chunk
+            )
+            continue
+        for index, data in chunk:
+            key = (data['contact'], data['type'])
+            results.append({"index": index, "id": ids[key], "status": "updated" if key in existing else "created"})
+
+    errors.sort(key=lambda error: error["index"])
+    return results, errors
+
+
+def bulk_delete_phone_numbers(ids, chunk_size=None):
+    """
+    Deletes phone numbers by id, one queryset delete per chunk (each announced
+    with a single `contacts_changed`).
+
+    Returns `(results, errors)`:
+    - results: `{"index": i, "id": pk, "status": "deleted" | "not_found"}` for every valid id
+    - errors: `{"index": i, "errors": {...}}` for every malformed id
+    """
+    chunk_size = chunk_size or getattr(settings, "CONTACTS_BULK_CHUNK_SIZE", 500)
+    results, errors = [], []
+    id_field = serializers.IntegerField(min_value=1)
+
+    valid = []
+    for index, value in enumerate(ids):
+        try:
+            valid.append((index, id_field.run_validation(value)))
+        except ValidationError as exc:
+            errors.append({"index": index, "errors": {"id": exc.detail}})
 
-        return instance
\ No newline at end of file
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        with transaction.atomic():
+            phones = PhoneNumber.objects.filter(pk__in={pk for _, pk in chunk})
+            existing = set(phones.values_list('pk', flat=True))
+            phones.delete()
+        results.extend(
+            {"index": index, "id": pk, "status": "deleted" if pk in existing else "not_found"} for index, pk in chunk
+        )
+    return results, errors
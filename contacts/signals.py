@@ -0,0 +1,139 @@
+"""
+Change notifications for contacts.
+
+Why this exists:
+- Several features (search index, caches, ...) need to react whenever a contact
+  or one of its phone numbers is written or deleted.
+- Django's model signals don't fire for `bulk_create`, `bulk_update` or
+  `QuerySet.update`, so bulk writers send `contacts_changed` themselves.
+
+Receivers get `contact_ids` (the affected contacts) and `deleted` (True when
+the contacts themselves were removed). Senders that know every contact is new
+also pass `created=True`; receivers should default it to False.
+
+A write touching a contact several times (e.g. the contact row, then its phone
+numbers) can wrap them in `coalesce_changes()` so receivers run once per contact.
+Receivers acting on commit can use `on_commit_once()` to act once per contact and
+transaction, whatever the writers did.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from contacts.models import Contact, PhoneNumber
+
+# contact id -> (deleted, created) of the notifications held back by coalesce_changes()
+_pending_changes = ContextVar("contacts_changed_pending", default=None)
+
+
+class ContactsChangedSignal(Signal):
+    """`contacts_changed`: notifications sent inside `coalesce_changes()` are held back and merged."""
+
+    def send(self, sender, contact_ids, deleted=False, created=False, **named):
+        pending = _pending_changes.get()
+        if pending is None:
+            return super().send(sender, contact_ids=contact_ids, deleted=deleted, created=created, **named)
+        for contact_id in contact_ids:
+            _, was_created = pending.get(contact_id, (False, False))
+            pending[contact_id] = (deleted, created or was_created)
+        return []
+
+
+contacts_changed = ContactsChangedSignal()
+
+
+@contextmanager
+def coalesce_changes():
+    """
+    Sends the `contacts_changed` notifications of the block once per contact, when it
+    exits without an error. Nested blocks are merged into the outermost one.
+    """
+    if _pending_changes.get() is not None:
+        yield
+        return
+    pending = {}
+    token = _pending_changes.set(pending)
+    try:
+        yield
+    finally:
+        _pending_changes.reset(token)
+    groups = {}
+    for contact_id, flags in pending.items():
+        groups.setdefault(flags, []).append(contact_id)
+    for (deleted, created), contact_ids in groups.items():
+        contacts_changed.send(sender=Contact, contact_ids=contact_ids, deleted=deleted, created=created)
+
+
+class _OnCommitOnce:
+    """An `on_commit_once()` callback. Those of one transaction and name share `handled`."""
+
+    def __init__(self, name, keys, func, handled):
+        self.name, self.keys, self.func, self.handled = name, keys, func, handled
+
+    def __call__(self):
+        keys = [key for key in dict.fromkeys(self.keys) if key not in self.handled]
+        self.handled.update(keys)
+        if keys:
+            self.func(keys)
+
+
+def on_commit_once(name, keys, func, using=None):
+    """
+    Calls `func(keys)` on commit, leaving out the keys that an earlier call with the same
+    `name` already handled in this transaction. Like `transaction.on_commit()`, a call
+    made inside a savepoint that is rolled back is dropped.
+    """
+    connection = transaction.get_connection(using)
+    # The callbacks of the transaction so far (Django drops those of rolled back savepoints)
+    earlier = (
+        callback for _, callback, _ in reversed(connection.run_on_commit)
+        if isinstance(callback, _OnCommitOnce) and callback.name == name
+    )
+    handled = next((callback.handled for callback in earlier), set())
+    transaction.on_commit(_OnCommitOnce(name, list(keys), func, handled), using=using)
+
+
+@receiver(post_save, sender=Contact)
+def contact_saved(sender, instance, created=False, **kwargs):
+    contacts_changed.send(sender=Contact, contact_ids=[instance.pk], deleted=False, created=created)
+
+
+@receiver(post_delete, sender=Contact)
+def contact_deleted(sender, instance, **kwargs):
+    contacts_changed.send(sender=Contact, contact_ids=[instance.pk], deleted=True)
+
+
+@receiver(post_save, sender=PhoneNumber)
+def phone_number_saved(sender, instance, **kwargs):
+    contacts_changed.send(sender=PhoneNumber, contact_ids=[instance.contact_id], deleted=False)
+
+
+def _is_contact_cascade(origin):
+    # Phone numbers removed along with their contact are covered by the contact's notification
+    return isinstance(origin, Contact) or (isinstance(origin, QuerySet) and origin.model is Contact)
+
+
+@receiver(pre_delete, sender=PhoneNumber)
+def phone_number_deleting(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, QuerySet) and origin.model is PhoneNumber:
+        # Track the rows of a queryset delete so they are announced once, not once per row
+        state = origin.__dict__.setdefault('_phone_deletes', {'remaining': set(), 'contact_ids': set()})
+        state['remaining'].add(instance.pk)
+        state['contact_ids'].add(instance.contact_id)
+
+
+@receiver(post_delete, sender=PhoneNumber)
+def phone_number_deleted(sender, instance, origin=None, **kwargs):
+    if _is_contact_cascade(origin):
+        return
+    state = getattr(origin, '_phone_deletes', None)
+    if state is None:
+        contacts_changed.send(sender=PhoneNumber, contact_ids=[instance.contact_id], deleted=False)
+        return
+    state['remaining'].discard(instance.pk)
+    if not state['remaining']:
+        del origin.__dict__['_phone_deletes']
+        contacts_changed.send(sender=PhoneNumber, contact_ids=sorted(state['contact_ids']), deleted=False)
@@ -0,0 +1,65 @@
+"""
+Query budget assertions for tests.
+
+Why this exists:
+- The list and detail endpoints rely on `prefetch_related` / `select_related` to
+  stay at a constant number of queries. Dropping one silently turns a page into
+  one query per row, and nothing in the response shows it.
+- `assertQueryCountConstant` runs an action against growing data and fails, with
+  the captured SQL, when the query count follows the number of rows.
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def capture_queries(aliases=None):
+    """Captures the queries run on the given databases (default: all of them), in a single list."""
+    captured = []
+    with ExitStack() as stack:
+        contexts = [
+            stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases or connections
+        ]
+        yield captured
+    for context in contexts:
+        captured.extend(context.captured_queries)
+
+
+def format_queries(queries):
+    return "\n".join(f"  {number}. {query['sql']}" for number, query in enumerate(queries, 1))
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for query budgets.
+    Notes:
+    - `grow(size)` brings the data read by the action up to `size` rows and may
+      return a value, which is passed on to `action`.
+    - `action(value)` performs one request; its last result is returned.
+    - A first run at the smallest size is discarded, so one-off lookups that are
+      cached per process (content types, sites) don't count against the budget.
+    """
+    query_budget_sizes = (2, 12)
+
+    def assertQueryCountConstant(self, grow, action, sizes=None, max_queries=None):
+        sizes = sizes or self.query_budget_sizes
+        action(grow(sizes[0]))
+
+        runs = []
+        result = None
+        for size in sizes:
+            value = grow(size)
+            with capture_queries(self.databases) as queries:
+                result = action(value)
+            runs.append((size, queries))
+
+        counts = ", ".join(f"{size} rows -> {len(queries)} queries" for size, queries in runs)
+        (_, first), (largest, last) = runs[0], runs[-1]
+        if len(last) != len(first):
+            self.fail(f"Query count grows with the number of rows ({counts}).\n"
+                      f"Queries for {largest} rows:\n{format_queries(last)}")
+        if max_queries is not None and len(last) > max_queries:
+            self.fail(f"{len(last)} queries exceed the budget of {max_queries}.\n{format_queries(last)}")
+        return result
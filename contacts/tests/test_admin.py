@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+from django.contrib.admin import site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from contacts.admin import EstimatedCountPaginator, PhoneNumberAdmin
+from contacts.models import Contact, PhoneNumber
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            Contact.objects.create(name=f"Contact {index}", email=f"contact{index}@example.com")
+
+    def test_exact_count_without_an_estimate(self):
+        # SQLite has no planner estimate
+        paginator = EstimatedCountPaginator(Contact.objects.order_by("id"), 2)
+        self.assertEqual(paginator.count, 3)
+
+    def test_large_estimates_replace_the_count(self):
+        paginator = EstimatedCountPaginator(Contact.objects.order_by("id"), 2)
+        with mock.patch.object(EstimatedCountPaginator, "estimated_count", return_value=500_000):
+            self.assertEqual(paginator.count, 500_000)
+
+    def test_small_estimates_are_ignored(self):
+        paginator = EstimatedCountPaginator(Contact.objects.order_by("id"), 2)
+        with mock.patch.object(EstimatedCountPaginator, "estimated_count", return_value=5):
+            self.assertEqual(paginator.count, 3)
+
+    def test_filtered_querysets_have_no_estimate(self):
+        paginator = EstimatedCountPaginator(Contact.objects.filter(name="Contact 1").order_by("id"), 2)
+        self.assertIsNone(paginator.estimated_count())
+
+
+class ContactAdminTests(TestCase):
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(admin)
+        self.alice = Contact.objects.create(name="Alice Smith", email="alice@example.com")
+        PhoneNumber.objects.create(contact=self.alice, number="+44 1234", type="mobile")
+        PhoneNumber.objects.create(contact=self.alice, number="+44 5678", type="work")
+        Contact.objects.create(name="Bob Alison", email="bob@example.com")
+
+    def test_changelist_shows_annotated_phone_count(self):
+        response = self.client.get("/admin/contacts/contact/")
+        self.assertEqual(response.status_code, 200)
+        counts = {row.name: row.phone_count for row in response.context["cl"].result_list}
+        self.assertEqual(counts, {"Alice Smith": 2, "Bob Alison": 0})
+
+    def test_search_matches_name_prefix_and_exact_email(self):
+        response = self.client.get("/admin/contacts/contact/", {"q": "ali"})
+        self.assertEqual([row.name for row in response.context["cl"].result_list], ["Alice Smith"])
+        response = self.client.get("/admin/contacts/contact/", {"q": "bob@example.com"})
+        self.assertEqual([row.name for row in response.context["cl"].result_list], ["Bob Alison"])
+
+    def test_phone_number_changelist(self):
+        response = self.client.get("/admin/contacts/phonenumber/", {"q": "441234"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row.number for row in response.context["cl"].result_list], ["+44 1234"])
+
+    def test_phone_number_search_normalizes_the_number_and_matches_name_prefixes(self):
+        bob = Contact.objects.create(name="Bobby Tables", email="bobby@example.com")
+        PhoneNumber.objects.create(contact=bob, number="0044 9999", type="home")
+        for term, numbers in [
+            ("+44 1234", ["+44 1234"]),
+            ("0044-1234", ["+44 1234"]),
+            ("alice", ["+44 1234", "+44 5678"]),
+            ("BOBBY T", ["0044 9999"]),
+            ("1234 5", []),
+        ]:
+            response = self.client.get("/admin/contacts/phonenumber/", {"q": term})
+            self.assertEqual([row.number for row in response.context["cl"].result_list], numbers, term)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_phone_number_search_uses_indexes(self):
+        model_admin = PhoneNumberAdmin(PhoneNumber, site)
+        plan = model_admin.get_search_results(None, PhoneNumber.objects.all(), "+44 1234")[0].explain()
+        self.assertIn("number_canonical=?", plan)
+        self.assertIn("contact_name_lower_idx", plan)
+        self.assertNotIn("SCAN contacts_phonenumber", plan)
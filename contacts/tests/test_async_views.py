@@ -0,0 +1,77 @@
+from django.test import TestCase, override_settings
+from contacts.metrics import registry
+from contacts.models import Contact, PhoneNumber
+from contacts.tests.utils import DUMMY_CACHES
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class AsyncContactViewTests(TestCase):
+    def setUp(self):
+        for index in range(5):
+            contact = Contact.objects.create(name=f"Person {index}", email=f"person{index}@example.com")
+            PhoneNumber.objects.create(contact=contact, number=f"+44 20 000{index}", type="mobile")
+            PhoneNumber.objects.create(contact=contact, number=f"+44 77 000{index}", type="work")
+        self.contact = contact
+
+    def assertSameResponse(self, sync_url, async_url):
+        expected = self.client.get(sync_url)
+        actual = self.client.get(async_url)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(actual["Content-Type"], expected["Content-Type"])
+        # Absolute pagination links carry the path, which differs between the two
+        self.assertEqual(actual.content.replace(b"/api/async/contacts/", b"/api/contacts/"), expected.content)
+        return actual
+
+    async def test_list_under_the_async_client(self):
+        response = await self.async_client.get("/api/async/contacts/", {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+        response = await self.async_client.get(f"/api/async/contacts/{self.contact.id}/")
+        self.assertEqual(response.json()["email"], "person4@example.com")
+
+    def test_list_matches_the_drf_view(self):
+        self.assertSameResponse("/api/contacts/?page_size=2", "/api/async/contacts/?page_size=2")
+        self.assertSameResponse("/api/contacts/?name=Person 3", "/api/async/contacts/?name=Person 3")
+        self.assertSameResponse("/api/contacts/?phone=77 0002", "/api/async/contacts/?phone=77 0002")
+        self.assertSameResponse("/api/contacts/?fields=id,email", "/api/async/contacts/?fields=id,email")
+        self.assertSameResponse(
+            "/api/contacts/?fields=name&expand=phone_numbers", "/api/async/contacts/?fields=name&expand=phone_numbers",
+        )
+        self.assertSameResponse("/api/contacts/?expand=phone_numbers", "/api/async/contacts/?expand=phone_numbers")
+        self.assertSameResponse("/api/contacts/?fields=id,nope", "/api/async/contacts/?fields=id,nope")
+        self.assertSameResponse("/api/contacts/?expand=nope", "/api/async/contacts/?expand=nope")
+
+    def test_pages_follow_the_same_cursors(self):
+        first = self.client.get("/api/async/contacts/", {"page_size": 2}).json()
+        cursor = first["next"].split("cursor=")[1]
+        self.assertSameResponse(
+            f"/api/contacts/?page_size=2&cursor={cursor}", f"/api/async/contacts/?page_size=2&cursor={cursor}",
+        )
+
+    def test_detail_matches_the_drf_view(self):
+        self.assertSameResponse(f"/api/contacts/{self.contact.id}/", f"/api/async/contacts/{self.contact.id}/")
+        self.assertSameResponse("/api/contacts/999999/", "/api/async/contacts/999999/")
+        for query in ("fields=email", "fields=id,phone_numbers", "fields=id&expand=phone_numbers", "fields=nope"):
+            self.assertSameResponse(
+                f"/api/contacts/{self.contact.id}/?{query}", f"/api/async/contacts/{self.contact.id}/?{query}",
+            )
+
+    @override_settings(CONTACTS_METRICS_ENABLED=True)
+    async def test_sparse_list_doesnt_read_phone_numbers(self):
+        registry.reset()
+        response = await self.async_client.get("/api/async/contacts/", {"fields": "id,name"})
+        self.assertEqual(list(response.json()["results"][0]), ["id", "name"])
+        queries = registry._histograms[("contacts_db_queries", "contacts-async-list")]
+        self.assertEqual(queries.total, 1)
+
+    def test_errors(self):
+        self.assertSameResponse("/api/contacts/?cursor=garbage", "/api/async/contacts/?cursor=garbage")
+        self.assertEqual(self.client.post("/api/async/contacts/", {}).status_code, 405)
+
+    @override_settings(CONTACTS_METRICS_ENABLED=True)
+    async def test_metrics_count_async_queries(self):
+        registry.reset()
+        await self.async_client.get("/api/async/contacts/")
+        queries = registry._histograms[("contacts_db_queries", "contacts-async-list")]
+        # The page and its prefetched phone numbers
+        self.assertEqual(queries.total, 2)
@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+import unittest
+
+from django.db import connection, connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from contacts.benchmarks.asgi import generate_load
+from contacts.benchmarks.concurrency import stress, stress_database
+from contacts.benchmarks.datasets import seed_contacts
+from contacts.benchmarks.json_codecs import run_json_benchmark
+from contacts.benchmarks.plans import explain_hot_queries, without_indexes
+from contacts.benchmarks.runner import BenchmarkContext, SCENARIOS, find_regressions, percentile, run_benchmarks
+from contacts.models import Contact, ContactSearchGram
+from contacts.tests.utils import DUMMY_CACHES
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_seeding_grows_the_table(self):
+        seed_contacts(30)
+        seed_contacts(50)
+        self.assertEqual(Contact.objects.count(), 50)
+        self.assertTrue(ContactSearchGram.objects.exists())
+
+    @override_settings(CACHES=DUMMY_CACHES)
+    def test_every_scenario_runs(self):
+        report = run_benchmarks([40], iterations=2)
+        metrics = report["results"]["40"]
+        self.assertEqual(sorted(metrics), sorted(SCENARIOS))
+        for result in metrics.values():
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertIn("commit", report["meta"])
+
+    def test_update_scenario_only_runs_the_request(self):
+        seed_contacts(20)
+        context = BenchmarkContext()
+        with CaptureQueriesContext(connection) as queries:
+            response = SCENARIOS["update"](APIClient(), context)
+        self.assertEqual(response.status_code, 200)
+        # The target's email comes from the context, not from a query timed with the request
+        self.assertFalse([query for query in queries if query["sql"].startswith('SELECT "contacts_contact"."email"')])
+
+    def test_percentile_is_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_json_benchmark_covers_both_codecs(self):
+        result = run_json_benchmark(size=20, repeat=1)
+        self.assertEqual(set(result["results"]), {"drf", "fast"})
+        self.assertGreater(result["results"]["fast"]["encode_mb_s"], 0)
+
+    def test_find_regressions(self):
+        baseline = {"results": {"100": {"list": {"p95_ms": 10.0, "queries": 2}}}}
+        same = {"results": {"100": {"list": {"p95_ms": 11.0, "queries": 2}}}}
+        slower = {"results": {"100": {"list": {"p95_ms": 13.0, "queries": 3}}}}
+        self.assertEqual(find_regressions(same, baseline, threshold=0.2), [])
+        self.assertEqual(len(find_regressions(slower, baseline, threshold=0.2)), 2)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Plans are asserted in SQLite's EXPLAIN QUERY PLAN format")
+class QueryPlanTests(TransactionTestCase):
+    # The SQLite schema editor can't run inside the transaction wrapping a TestCase
+    def test_hot_queries_use_their_indexes(self):
+        seed_contacts(300)
+        plans = explain_hot_queries()
+        self.assertIn("contact_created_id_idx", plans["list_page"])
+        self.assertIn("contact_created_id_idx", plans["admin_changelist"])
+        self.assertIn("(email_canonical=?)", plans["filter_email"])
+        self.assertIn("(number_canonical=?)", plans["filter_phone_exact"])
+        self.assertNotIn("SCAN contacts_contact", plans["filter_phone_exact"])
+        self.assertIn("contact_name_lower_idx", plans["admin_search"])
+
+        with without_indexes():
+            before = explain_hot_queries()
+        self.assertNotIn("contact_name_lower_idx", before["admin_search"])
+        self.assertIn("contact_name_lower_idx", explain_hot_queries()["admin_search"])
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The test runner checks class-level `databases` before any test runs, when the
+        # temporary stress database doesn't exist yet. Registering it first lets
+        # super().setUpClass() validate it like any configured alias.
+        cls.alias = cls.enterClassContext(stress_database("production"))
+        cls.databases = {cls.alias}
+        super().setUpClass()
+
+    def test_production_profile_pragmas(self):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertGreater(cursor.fetchone()[0], 0)
+        self.assertEqual(connections[self.alias].transaction_mode, "IMMEDIATE")
+
+    def test_production_profile_has_no_lock_errors_under_concurrent_writes(self):
+        result = stress(self.alias, threads=4, seconds=0.5, write_ratio=0.5, contacts=50)
+        self.assertGreater(result["writes"], 0)
+        self.assertGreater(result["reads"], 0)
+        self.assertEqual(result["locked"], 0)
+
+
+class LoadGeneratorTests(SimpleTestCase):
+    async def serve(self, reader, writer):
+        try:
+            while request := await reader.readuntil(b"\r\n\r\n"):
+                status = b"404 Not Found" if b"/missing" in request else b"200 OK"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\n\r\n{}")
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass  # the client hung up
+
+    def test_keep_alive_requests_are_counted(self):
+        async def run():
+            server = await asyncio.start_server(
+                self.serve, "127.0.0.1", 0,
+            )
+            port = server.sockets[0].getsockname()[1]
+            paths = itertools.cycle(["/ok", "/missing"])
+            async with server:
+                return await generate_load("127.0.0.1", port, lambda: next(paths), concurrency=2, seconds=0.2)
+
+        result = asyncio.run(run())
+        self.assertGreater(result["requests"], 1)
+        self.assertAlmostEqual(result["errors"], result["requests"] / 2, delta=1)
@@ -0,0 +1,84 @@
+import tempfile
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from contacts.models import Contact, PhoneNumber
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.contact = Contact.objects.create(name="Cached", email="cached@unilink.com")
+        PhoneNumber.objects.create(contact=self.contact, number="1111", type="mobile")
+        self.url = f"/api/contacts/{self.contact.id}/"
+
+    def test_repeated_detail_read_skips_serialization_queries(self):
+        self.client.get(self.url)
+        # Only the revision lookup for ETag / Last-Modified is left
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["name"], "Cached")
+
+    def test_repeated_list_read_skips_database(self):
+        self.client.get("/api/contacts/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/contacts/")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_query_parameters_are_part_of_list_key(self):
+        Contact.objects.create(name="Other", email="other@unilink.com")
+        self.assertEqual(len(self.client.get("/api/contacts/").data["results"]), 2)
+        self.assertEqual(len(self.client.get("/api/contacts/?name=Cached").data["results"]), 1)
+
+    def test_nested_update_invalidates_detail_and_list(self):
+        self.client.get(self.url)
+        self.client.get("/api/contacts/")
+        payload = {"name": "Renamed", "email": "cached@unilink.com",
+                   "phone_numbers": [{"number": "2222", "type": "work"}]}
+        self.client.put(self.url, payload, format="json")
+
+        detail = self.client.get(self.url)
+        self.assertEqual(detail.data["name"], "Renamed")
+        self.assertEqual([phone["number"] for phone in detail.data["phone_numbers"]], ["2222"])
+        self.assertEqual(self.client.get("/api/contacts/").data["results"][0]["name"], "Renamed")
+
+    def test_update_invalidates_every_spelling_of_the_id(self):
+        padded = f"/api/contacts/0{self.contact.id}/"
+        self.assertEqual(self.client.get(padded).data["name"], "Cached")
+        self.client.patch(self.url, {"name": "Renamed"}, format="json")
+        self.assertEqual(self.client.get(padded).data["name"], "Renamed")
+        self.assertEqual(self.client.get("/api/contacts/abc/").status_code, 404)
+
+    def test_standalone_phone_number_post_invalidates_contact(self):
+        self.client.get(self.url)
+        payload = {"contact": self.contact.id, "number": "3333", "type": "home"}
+        self.client.post("/api/phone-numbers/", payload)
+        self.assertEqual(len(self.client.get(self.url).data["phone_numbers"]), 2)
+
+    def test_create_and_delete_invalidate_list(self):
+        self.client.get("/api/contacts/")
+        self.client.post("/api/contacts/", {"name": "New", "email": "new@unilink.com", "phone_numbers": []},
+                         format="json")
+        self.assertEqual(len(self.client.get("/api/contacts/").data["results"]), 2)
+
+        self.client.delete(self.url)
+        self.assertEqual(len(self.client.get("/api/contacts/").data["results"]), 1)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_bulk_create_invalidates_list(self):
+        self.client.get("/api/contacts/")
+        self.client.post("/api/contacts/bulk/", [{"name": "Bulk", "email": "bulk@unilink.com", "phone_numbers": []}], format="json")
+        self.assertEqual(len(self.client.get("/api/contacts/").data["results"]), 2)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            file_cache = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                                      "LOCATION": location}}
+            with override_settings(CACHES=file_cache):
+                self.client.get(self.url)
+                with self.assertNumQueries(1):
+                    self.client.get(self.url)
+                self.contact.name = "Changed"
+                self.contact.save()
+                self.assertEqual(self.client.get(self.url).data["name"], "Changed")
@@ -0,0 +1,148 @@
+import io
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APITransactionTestCase
+from contacts.changes import compact_changes
+from contacts.models import Contact, ContactChange, PhoneNumber
+
+
+@override_settings(CONTACTS_CHANGES_SETTLE_SECONDS=0)
+class ChangeFeedTests(APITransactionTestCase):
+    """Entries are written once the writes commit, so these tests commit for real."""
+    url = "/api/contacts/changes/"
+
+    def create_contact(self, index):
+        response = self.client.post("/api/contacts/", {
+            "name": f"Person {index}", "email": f"person{index}@example.com",
+            "phone_numbers": [{"number": f"+44 20 000{index}", "type": "mobile"}],
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        return response.data["id"]
+
+    def test_feed_lists_changed_contacts_with_their_current_state(self):
+        contact_id = self.create_contact(0)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        [item] = response.data["results"]
+        self.assertEqual(item["contact_id"], contact_id)
+        self.assertFalse(item["deleted"])
+        self.assertEqual(item["contact"]["phone_numbers"][0]["number"], "+44 20 0000")
+        self.assertFalse(response.data["has_more"])
+        self.assertIn(f"since={response.data['token']}", response.data["next"])
+
+    def test_follow_up_pages_only_carry_new_changes(self):
+        first = self.create_contact(0)
+        self.create_contact(1)
+        token = self.client.get(self.url).data["token"]
+        self.assertEqual(self.client.get(self.url, {"since": token}).data["results"], [])
+
+        self.client.post("/api/phone-numbers/bulk/", [{"contact": first, "number": "1", "type": "work"}], format="json")
+        self.client.delete(f"/api/contacts/{first}/")
+        response = self.client.get(self.url, {"since": token})
+        [item] = response.data["results"]
+        self.assertEqual(item["contact_id"], first)
+        self.assertTrue(item["deleted"])
+        self.assertIsNone(item["contact"])
+
+    def test_rolled_back_writes_leave_no_entry(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Contact.objects.create(name="Ghost", email="ghost@example.com")
+            raise RuntimeError
+        self.assertFalse(ContactChange.objects.exists())
+
+    def test_one_entry_per_contact_and_transaction(self):
+        with transaction.atomic():
+            contact = Contact.objects.create(name="Once", email="once@example.com")
+            PhoneNumber.objects.create(contact=contact, number="1", type="home")
+            contact.save()
+            self.assertFalse(ContactChange.objects.exists())  # nothing before the commit
+        self.assertEqual(list(ContactChange.objects.values_list("contact_id", "deleted")), [(contact.pk, False)])
+
+    def test_rolled_back_savepoints_leave_no_entry(self):
+        with transaction.atomic():
+            kept = Contact.objects.create(name="Kept", email="kept@example.com")
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                kept.save()
+                Contact.objects.create(name="Ghost", email="ghost@example.com")
+                raise RuntimeError
+        self.assertEqual(list(ContactChange.objects.values_list("contact_id", flat=True)), [kept.pk])
+
+    def test_entries_are_stamped_by_the_database_clock(self):
+        with mock.patch("django.utils.timezone.now", return_value=datetime(2000, 1, 1, tzinfo=dt_timezone.utc)):
+            self.create_contact(0)
+        self.assertGreater(ContactChange.objects.get().changed_at.year, 2000)
+
+    def test_keyset_paging(self):
+        created = [self.create_contact(index) for index in range(5)]
+        seen, url = [], self.url + "?page_size=2"
+        while True:
+            with self.assertNumQueries(3):  # entries, contacts, phone numbers
+                response = self.client.get(url)
+            seen.extend(item["contact_id"] for item in response.data["results"])
+            url = response.data["next"]
+            if not response.data["has_more"]:
+                break
+        self.assertEqual(seen, created)
+
+    def test_since_latest_starts_at_the_head(self):
+        self.create_contact(0)
+        response = self.client.get(self.url, {"since": "latest"})
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["token"], str(ContactChange.objects.latest("pk").pk))
+
+    def test_invalid_token(self):
+        for token in ("abc", "-1"):
+            self.assertEqual(self.client.get(self.url, {"since": token}).status_code, 400)
+
+    @override_settings(CONTACTS_CHANGES_SETTLE_SECONDS=60)
+    def test_recent_entries_are_held_back(self):
+        self.create_contact(0)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["token"], "0")
+        ContactChange.objects.update(changed_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(len(self.client.get(self.url).data["results"]), 1)
+
+
+@override_settings(CONTACTS_CHANGES_SETTLE_SECONDS=0)
+class ChangeFeedCommitOrderTests(APITestCase):
+    url = "/api/contacts/changes/"
+
+    def test_slow_transactions_land_after_served_tokens(self):
+        # Each block stands for a transaction, committed when its callbacks run
+        with self.captureOnCommitCallbacks() as slow_transaction:
+            slow = Contact.objects.create(name="Slow", email="slow@example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            Contact.objects.create(name="Fast", email="fast@example.com")
+        token = self.client.get(self.url).data["token"]
+
+        for callback in slow_transaction:
+            callback()
+        response = self.client.get(self.url, {"since": token})
+        self.assertEqual([item["contact_id"] for item in response.data["results"]], [slow.pk])
+
+
+class ChangeCompactionTests(APITransactionTestCase):
+    def test_compaction_keeps_the_latest_entry_per_contact(self):
+        contact = Contact.objects.create(name="Churn", email="churn@example.com")
+        PhoneNumber.objects.create(contact=contact, number="1", type="home")
+        other = Contact.objects.create(name="Gone", email="gone@example.com")
+        other_id = other.pk
+        other.delete()
+        ContactChange.objects.update(changed_at=timezone.now() - timedelta(days=30))
+        contact.save()  # a recent entry, inside the retention period
+
+        self.assertEqual(compact_changes(retention_days=7, batch_size=1), 3)
+        remaining = list(ContactChange.objects.order_by("pk").values_list("contact_id", "deleted"))
+        self.assertEqual(remaining, [(other_id, True), (contact.pk, False)])
+
+    def test_command(self):
+        Contact.objects.create(name="Churn", email="churn@example.com").save()
+        ContactChange.objects.update(changed_at=timezone.now() - timedelta(days=30))
+        call_command("compact_changes", "--retention-days", "7", stdout=io.StringIO())
+        self.assertEqual(ContactChange.objects.count(), 1)
@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from contacts.models import Contact, PhoneNumber
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.contact = Contact.objects.create(name="Etag", email="etag@unilink.com")
+        self.phone = PhoneNumber.objects.create(contact=self.contact, number="1111", type="mobile")
+        self.url = f"/api/contacts/{self.contact.id}/"
+
+    def test_detail_sends_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_matching_etag_returns_304_with_one_query(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_contact_update_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.contact.name = "Changed"
+        self.contact.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_phone_number_write_changes_contact_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post("/api/phone-numbers/", {"contact": self.contact.id, "number": "2", "type": "home"})
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(self.url)["ETag"]
+        self.phone.delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_saving_a_stale_instance_doesnt_rewind_the_etag(self):
+        stale = Contact.objects.get(pk=self.contact.pk)
+        self.client.post("/api/phone-numbers/", {"contact": self.contact.id, "number": "2", "type": "home"})
+        etag = self.client.get(self.url)["ETag"]
+
+        stale.name = "Renamed"
+        stale.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "Renamed")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_match_guards_updates(self):
+        etag = self.client.get(self.url)["ETag"]
+        payload = {"name": "First", "email": "etag@unilink.com", "phone_numbers": []}
+        response = self.client.put(self.url, payload, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Same (now stale) ETag again: the second writer must refetch first
+        payload["name"] = "Second"
+        response = self.client.put(self.url, payload, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.contact.refresh_from_db()
+        self.assertEqual(self.contact.name, "First")
+
+    def test_if_match_is_rechecked_with_the_row_locked(self):
+        etag = self.client.get(self.url)["ETag"]
+        stale_version = Contact.objects.values_list("revision", "updated_at").get(pk=self.contact.pk)
+        self.contact.name = "Concurrent"
+        self.contact.save()
+        # A write whose up-front check ran just before the concurrent one committed
+        with mock.patch("contacts.conditional._contact_version", return_value=stale_version):
+            response = self.client.patch(self.url, {"name": "Lost"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.contact.refresh_from_db()
+        self.assertEqual(self.contact.name, "Concurrent")
+
+    def test_if_match_locks_the_contact_row(self):
+        etag = self.client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.url, {"name": "Locked"}, format="json", HTTP_IF_MATCH=etag)
+        if connection.features.has_select_for_update:
+            self.assertTrue(any("FOR UPDATE" in query["sql"] for query in queries))
+        self.contact.refresh_from_db()
+        self.assertEqual(self.contact.name, "Locked")
+
+    def test_if_match_guards_deletes(self):
+        response = self.client.delete(self.url, HTTP_IF_MATCH='"c0"')
+        self.assertEqual(response.status_code, 412)
+        self.assertTrue(Contact.objects.filter(pk=self.contact.pk).exists())
+
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.delete(self.url, HTTP_IF_MATCH=etag).status_code, 204)
+
+    def test_old_if_modified_since_returns_200(self):
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_contact_is_404(self):
+        self.assertEqual(self.client.get("/api/contacts/999999/", HTTP_IF_NONE_MATCH='"c1"').status_code, 404)
+        self.assertEqual(self.client.get("/api/contacts/abc/").status_code, 404)
+
+    def test_phone_number_detail_supports_etag(self):
+        url = f"/api/phone-numbers/{self.phone.id}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.contact.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from contacts.events import (
+    InProcessBroker, SubscriptionOverflow, event_filter, get_broker, make_event, publish_changes,
+)
+from contacts.models import Contact, PhoneNumber
+
+
+def event(contact_id=1, email="a@example.com", event_type="updated"):
+    return make_event(event_type, "contact", contact_id, email)
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    def test_fan_out_with_filters(self):
+        async def run():
+            broker = InProcessBroker()
+            everything = broker.subscribe()
+            by_domain = broker.subscribe(event_filter(email_domains=["Example.org"]))
+            by_id = broker.subscribe(event_filter(contact_ids=[2]))
+            broker.publish(event(1, "a@example.com"))
+            broker.publish(event(2, "b@EXAMPLE.org"))
+            batches = [await subscription.next_batch(timeout=1) for subscription in (everything, by_domain, by_id)]
+            return [[item["contact_id"] for item in batch] for batch in batches]
+
+        self.assertEqual(asyncio.run(run()), [[1, 2], [2], [2]])
+
+    def test_publishing_from_another_thread(self):
+        async def run():
+            broker = InProcessBroker()
+            subscription = broker.subscribe()
+            threading.Thread(target=broker.publish, args=(event(),)).start()
+            return await subscription.next_batch(timeout=1)
+
+        self.assertEqual(len(asyncio.run(run())), 1)
+
+    def test_idle_subscription_times_out_empty(self):
+        async def run():
+            return await InProcessBroker().subscribe().next_batch(timeout=0.01)
+
+        self.assertEqual(asyncio.run(run()), [])
+
+    def test_slow_subscriber_overflows_without_holding_up_others(self):
+        async def run():
+            broker = InProcessBroker()
+            slow, fast = broker.subscribe(max_pending=2), broker.subscribe(max_pending=10)
+            for contact_id in range(3):
+                broker.publish(event(contact_id))
+            await asyncio.sleep(0)
+            with self.assertRaises(SubscriptionOverflow):
+                await slow.next_batch(timeout=1)
+            return len(await fast.next_batch(timeout=1))
+
+        self.assertEqual(asyncio.run(run()), 3)
+
+    def test_unsubscribe(self):
+        async def run():
+            broker = InProcessBroker()
+            broker.unsubscribe(broker.subscribe())
+            return broker.has_subscribers()
+
+        self.assertFalse(asyncio.run(run()))
+
+
+class EventStreamTests(TransactionTestCase):
+    async def read_events(self, stream, count):
+        events = []
+        while len(events) < count:
+            chunk = await asyncio.wait_for(anext(stream), timeout=2)
+            events.extend(
+                json.loads(line[len("data: "):])
+                for line in chunk.decode().splitlines() if line.startswith("data: ")
+            )
+        return events
+
+    async def test_stream_of_contact_writes(self):
+        response = await self.async_client.get("/api/events/contacts/", {"email_domain": "example.com"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        await anext(stream)  # subscribed
+        try:
+            contact = await Contact.objects.acreate(name="Live", email="live@example.com")
+            await Contact.objects.acreate(name="Elsewhere", email="other@example.org")
+            await PhoneNumber.objects.acreate(contact=contact, number="1", type="home")
+            await sync_to_async(contact.delete)()
+
+            events = await self.read_events(stream, 3)
+            self.assertEqual(
+                [(item["type"], item["model"]) for item in events],
+                [("created", "contact"), ("updated", "phone_number"), ("deleted", "contact")],
+            )
+            self.assertEqual({item["email"] for item in events}, {"live@example.com"})
+        finally:
+            response.close()
+        self.assertFalse(get_broker().has_subscribers())
+
+    async def test_one_event_per_contact_and_transaction(self):
+        def write():
+            with transaction.atomic():
+                contact = Contact.objects.create(name="Live", email="live@example.com")
+                PhoneNumber.objects.create(contact=contact, number="1", type="home")
+                contact.save()
+            Contact.objects.create(name="Next", email="next@example.com")
+
+        response = await self.async_client.get("/api/events/contacts/")
+        stream = aiter(response.streaming_content)
+        await anext(stream)  # subscribed
+        try:
+            await sync_to_async(write)()
+            events = await self.read_events(stream, 2)
+            self.assertEqual(
+                [(item["type"], item["model"], item["email"]) for item in events],
+                [("created", "contact", "live@example.com"), ("created", "contact", "next@example.com")],
+            )
+        finally:
+            response.close()
+
+    def test_streams_need_asgi(self):
+        response = self.client.get("/api/events/contacts/")
+        self.assertEqual(response.status_code, 501)
+        self.assertFalse(response.streaming)
+
+    async def test_invalid_contact_id(self):
+        response = await self.async_client.get("/api/events/contacts/", {"contact_id": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_writes_cost_nothing_without_subscribers(self):
+        with self.assertNumQueries(0):
+            publish_changes(sender=Contact, contact_ids=[1])
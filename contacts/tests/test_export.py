@@ -0,0 +1,79 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from contacts.export import export_contacts
+from contacts.models import Contact, PhoneNumber
+
+
+def create_contacts(count):
+    for i in range(count):
+        contact = Contact.objects.create(name=f"Export {i}", email=f"export{i}@unilink.com")
+        PhoneNumber.objects.create(contact=contact, number=f"{i}11", type="mobile")
+        PhoneNumber.objects.create(contact=contact, number=f"{i}22", type="home")
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        create_contacts(5)
+
+    def test_ndjson_has_one_contact_per_line(self):
+        lines = b"".join(export_contacts("ndjson", chunk_size=2)).decode().splitlines()
+        items = [json.loads(line) for line in lines]
+        self.assertEqual([item["email"] for item in items], [f"export{i}@unilink.com" for i in range(5)])
+        self.assertEqual({phone["number"] for phone in items[0]["phone_numbers"]}, {"011", "022"})
+
+    def test_csv_has_one_column_per_phone_type(self):
+        text = b"".join(export_contacts("csv", chunk_size=2)).decode()
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual((rows[1]["mobile"], rows[1]["work"], rows[1]["home"]), ("111", "", "122"))
+
+    def test_gzip_output(self):
+        data = gzip.decompress(b"".join(export_contacts("ndjson", compress=True)))
+        self.assertEqual(len(data.decode().splitlines()), 5)
+
+    def test_queries_grow_with_chunks_not_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(export_contacts("ndjson", chunk_size=2))
+        # 3 chunks of contacts + their phone numbers, then one empty read
+        self.assertEqual(len(queries), 3 * 2 + 1)
+
+    def test_export_contacts_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contacts.csv.gz")
+            call_command("export_contacts", "--format", "csv", "--gzip", "--output", path)
+            with gzip.open(path, "rt") as stream:
+                self.assertEqual(len(list(csv.DictReader(stream))), 5)
+
+
+class ExportEndpointTests(APITestCase):
+    def setUp(self):
+        create_contacts(3)
+
+    def test_streams_ndjson(self):
+        response = self.client.get("/api/contacts/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_streams_gzipped_csv_with_filters(self):
+        response = self.client.get("/api/contacts/export/?file_format=csv&compress=gzip&name=Export%201")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn("contacts.csv.gz", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(b"".join(response.streaming_content)).decode())))
+        self.assertEqual([row["name"] for row in rows], ["Export 1"])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get("/api/contacts/export/?file_format=xml")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,62 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from contacts.fast_serializers import contact_rows, serialize_contact_rows
+from contacts.models import Contact, PhoneNumber, phone_numbers_prefetch
+from contacts.serializers import ContactSerializer
+from contacts.tests.utils import DUMMY_CACHES
+
+
+class FastSerializerParityTests(TestCase):
+    def setUp(self):
+        Contact.objects.create(name="No Phones", email="nophones@example.com")
+        contact = Contact.objects.create(name="Zoë \"Quoted\" Ñandú", email="zoe@example.com")
+        # Inserted out of type order: both paths must list them by primary key
+        for number, phone_type in [("+44 20 7946 0958", "work"), ("07700 900123", "mobile"), ("", "home")]:
+            PhoneNumber.objects.create(contact=contact, number=number, type=phone_type)
+        for index in range(5):
+            contact = Contact.objects.create(name=f"Person {index}", email=f"person{index}@example.com")
+            PhoneNumber.objects.create(contact=contact, number=f"+1 555 010{index}", type="mobile")
+
+    def assertParity(self, queryset):
+        expected = ContactSerializer(queryset.prefetch_related(phone_numbers_prefetch()), many=True).data
+        actual = serialize_contact_rows(list(contact_rows(queryset)))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_output_is_byte_identical_to_contact_serializer(self):
+        self.assertParity(Contact.objects.order_by("created_at", "id"))
+
+    def test_parity_outside_utc(self):
+        with timezone.override("America/New_York"):
+            self.assertParity(Contact.objects.order_by("-id"))
+
+    @override_settings(USE_TZ=False)
+    def test_parity_without_time_zone_support(self):
+        self.assertParity(Contact.objects.order_by("id"))
+
+    @override_settings(REST_FRAMEWORK={"DATETIME_FORMAT": "%d/%m/%Y %H:%M"})
+    def test_parity_with_a_custom_datetime_format(self):
+        self.assertParity(Contact.objects.order_by("id"))
+
+    def test_no_rows_runs_no_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(serialize_contact_rows([]), [])
+
+    def test_phone_numbers_are_read_in_one_query(self):
+        rows = list(contact_rows(Contact.objects.all()))
+        with self.assertNumQueries(1):
+            serialize_contact_rows(rows)
+
+    @override_settings(CACHES=DUMMY_CACHES)
+    def test_list_pages_match_contact_serializer(self):
+        url = "/api/contacts/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            payload = response.json()
+            ids = [item["id"] for item in payload["results"]]
+            queryset = Contact.objects.filter(pk__in=ids).order_by("created_at", "id")
+            expected = ContactSerializer(queryset.prefetch_related(phone_numbers_prefetch()), many=True).data
+            self.assertEqual(payload["results"], json.loads(JSONRenderer().render(expected)))
+            url = payload["next"]
@@ -0,0 +1,119 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from contacts.filters import ContactFilter, lower_startswith
+from contacts.models import Contact, PhoneNumber
+
+
+class PhoneFilterFanOutTests(TestCase):
+    def setUp(self):
+        # Every contact has three numbers that all match "555"
+        for i in range(30):
+            contact = Contact.objects.create(name=f"Fan {i}", email=f"fan{i}@unilink.com")
+            for phone_type in ("mobile", "work", "home"):
+                PhoneNumber.objects.create(contact=contact, number=f"555-{i:03d}", type=phone_type)
+        Contact.objects.create(name="No phone", email="nophone@unilink.com")
+
+    def filtered(self, **params):
+        return ContactFilter(params, queryset=Contact.objects.all()).qs
+
+    def test_contact_with_several_matching_numbers_is_returned_once(self):
+        queryset = self.filtered(phone="555")
+        self.assertEqual(queryset.count(), 30)
+        ids = list(queryset.values_list("id", flat=True))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_short_and_text_searches_are_exact_too(self):
+        self.assertEqual(self.filtered(phone="55").count(), 30)
+        PhoneNumber.objects.create(contact=Contact.objects.get(name="No phone"), number="ext", type="work")
+        self.assertEqual(self.filtered(phone="ext").count(), 1)
+
+    def test_phone_filter_is_a_semi_join(self):
+        queryset = self.filtered(phone="555-007")
+        sql = str(queryset.query).upper()
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("JOIN", sql)
+
+        plan = queryset.explain()
+        if connection.vendor == "sqlite":
+            # The subquery is probed through the contact_id index and stops at the first match
+            self.assertIn("CORRELATED SCALAR SUBQUERY", plan)
+            self.assertRegex(plan, r"SEARCH U0 USING (COVERING )?INDEX \S+ \(contact_id=\?\)")
+        elif connection.vendor == "postgresql":
+            self.assertIn("Semi Join", plan)
+
+    def test_join_lookup_would_fan_out(self):
+        # Documents the bug the EXISTS filter avoids
+        joined = Contact.objects.filter(phone_numbers__number__icontains="555")
+        self.assertEqual(joined.count(), 90)
+        self.assertEqual(self.filtered(phone="555").count(), 30)
+
+
+class LowerLookupTests(TestCase):
+    def setUp(self):
+        Contact.objects.create(name="Alice Smith", email="Alice@Example.com")
+        Contact.objects.create(name="Alina Jones", email="alina@example.com")
+        Contact.objects.create(name="Bob Alison", email="bob@example.com")
+
+    def test_email_filter_is_case_insensitive_and_exact(self):
+        qs = ContactFilter({"email": "alice@example.COM"}, queryset=Contact.objects.all()).qs
+        self.assertEqual([c.name for c in qs], ["Alice Smith"])
+        qs = ContactFilter({"email": "alice@example"}, queryset=Contact.objects.all()).qs
+        self.assertFalse(qs.exists())
+
+    def test_lower_startswith_ignores_linguistic_collation(self):
+        # Under en_US / ICU collations "a-bz" sorts between "ab" and "ac"
+        Contact.objects.create(name="A-bz Jones", email="abz@example.com")
+        Contact.objects.create(name="Äb Jones", email="aeb@example.com")
+        names = Contact.objects.filter(lower_startswith("name", "Ab")).values_list("name", flat=True)
+        self.assertEqual(list(names), [])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "Collations are a PostgreSQL concern")
+    def test_lower_startswith_compares_in_c_collation(self):
+        queryset = Contact.objects.filter(lower_startswith("name", "ali"))
+        self.assertIn('COLLATE "C"', str(queryset.query))
+        self.assertEqual(sorted(queryset.values_list("name", flat=True)), ["Alice Smith", "Alina Jones"])
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                self.assertIn("contact_name_lower_idx", queryset.explain())
+            finally:
+                cursor.execute("SET enable_seqscan = on")
+
+    def test_lower_startswith_matches_prefixes_only(self):
+        names = Contact.objects.filter(lower_startswith("name", "ALI")).order_by("name").values_list("name", flat=True)
+        self.assertEqual(list(names), ["Alice Smith", "Alina Jones"])
+        self.assertEqual(Contact.objects.filter(lower_startswith("name", "")).count(), 3)
+
+
+class CanonicalLookupTests(TestCase):
+    def setUp(self):
+        self.alice = Contact.objects.create(name="Alice", email="Alice@Example.com")
+        PhoneNumber.objects.create(contact=self.alice, number="+44 20 7946 0958", type="work")
+        PhoneNumber.objects.create(contact=self.alice, number="07700 900123", type="mobile")
+        bob = Contact.objects.create(name="Bob", email="bob@example.com")
+        PhoneNumber.objects.create(contact=bob, number="+44 20 7946 0959", type="work")
+
+    def filtered(self, **params):
+        return list(ContactFilter(params, queryset=Contact.objects.all()).qs)
+
+    def test_email_matches_the_canonical_form(self):
+        self.assertEqual(self.filtered(email=" ALICE@example.com "), [self.alice])
+
+    def test_phone_exact_matches_any_formatting_of_the_number(self):
+        for number in ("+44 20 7946 0958", "0044 (20) 7946-0958", "442079460958"):
+            self.assertEqual(self.filtered(phone_exact=number), [self.alice])
+        self.assertEqual(self.filtered(phone_exact="07700-900-123"), [self.alice])
+
+    def test_phone_exact_does_not_match_substrings(self):
+        self.assertEqual(self.filtered(phone_exact="7946"), [])
+        self.assertEqual(self.filtered(phone_exact="ext."), [])
+
+    def test_phone_search_matches_the_digits_as_typed(self):
+        carol = Contact.objects.create(name="Carol", email="carol@example.com")
+        PhoneNumber.objects.create(contact=carol, number="0044 123 456", type="home")
+        self.assertEqual(self.filtered(phone="0441"), [carol])
+        self.assertEqual(self.filtered(phone_exact="+44 123 456"), [carol])
+        # "00" is searched for, not dropped: "58" alone would match Alice's work number
+        self.assertEqual(self.filtered(phone="0058"), [])
@@ -0,0 +1,119 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from contacts.export import export_contacts
+from contacts.importer import import_contacts
+from contacts.models import Contact, ContactSearchGram, PhoneNumber
+
+
+def ndjson(*rows):
+    return io.StringIO("".join(json.dumps(row) + "\n" for row in rows))
+
+
+class ImportContactsTests(TestCase):
+    def test_imports_ndjson_rows(self):
+        stats = import_contacts(ndjson(
+            {"name": "Ann", "email": "ann@unilink.com", "phone_numbers": [{"number": "+44 1234", "type": "mobile"}]},
+            {"name": "Ben", "email": "ben@unilink.com", "phone_numbers": []},
+        ), "ndjson")
+        self.assertEqual((stats["rows"], stats["imported"], stats["rejected"]), (2, 2, 0))
+        phone = PhoneNumber.objects.get(contact__email="ann@unilink.com")
+        self.assertEqual(phone.number_digits, "441234")
+        # bulk writes still reach the search index
+        self.assertTrue(ContactSearchGram.objects.filter(contact=phone.contact, field="phone").exists())
+
+    def test_upserts_by_email(self):
+        contact = Contact.objects.create(name="Old", email="up@unilink.com")
+        PhoneNumber.objects.create(contact=contact, number="111", type="mobile")
+        PhoneNumber.objects.create(contact=contact, number="222", type="home")
+
+        import_contacts(ndjson(
+            {"name": "New", "email": "up@unilink.com",
+             "phone_numbers": [{"number": "999", "type": "mobile"}, {"number": "333", "type": "work"}]},
+        ), "ndjson")
+
+        contact.refresh_from_db()
+        self.assertEqual(contact.name, "New")
+        self.assertEqual(Contact.objects.count(), 1)
+        phones = dict(contact.phone_numbers.values_list("type", "number"))
+        self.assertEqual(phones, {"mobile": "999", "home": "222", "work": "333"})
+
+    def test_upserts_by_canonical_email(self):
+        contact = Contact.objects.create(name="Old", email="case@unilink.com")
+        import_contacts(ndjson(
+            {"name": "New", "email": "Case@Unilink.com", "phone_numbers": []},
+            {"name": "Other", "email": "other@unilink.com", "phone_numbers": []},
+        ), "ndjson")
+        contact.refresh_from_db()
+        self.assertEqual((contact.name, contact.email), ("New", "case@unilink.com"))
+        self.assertEqual(Contact.objects.get(email="other@unilink.com").email_canonical, "other@unilink.com")
+
+    def test_last_row_wins_within_a_batch(self):
+        import_contacts(ndjson(
+            {"name": "First", "email": "same@unilink.com", "phone_numbers": []},
+            {"name": "Second", "email": "same@unilink.com", "phone_numbers": []},
+        ), "ndjson")
+        self.assertEqual(Contact.objects.get().name, "Second")
+
+    def test_rejected_rows_are_reported(self):
+        rejects = io.StringIO()
+        stream = io.StringIO(
+            '{"name": "Ok", "email": "ok@unilink.com", "phone_numbers": []}\n'
+            'not json\n'
+            '{"name": "Dup", "email": "dup@unilink.com", "phone_numbers": '
+            '[{"number": "1", "type": "home"}, {"number": "2", "type": "home"}]}\n'
+            '{"name": "Bad", "email": "not-an-email", "phone_numbers": []}\n'
+        )
+        stats = import_contacts(stream, "ndjson", rejects=rejects)
+        self.assertEqual((stats["imported"], stats["rejected"]), (1, 3))
+        rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+        self.assertEqual([row["line"] for row in rejected], [2, 3, 4])
+        self.assertIn("phone_numbers", rejected[1]["errors"])
+        self.assertIn("email", rejected[2]["errors"])
+
+    def test_batches_and_progress(self):
+        reports = []
+        rows = [{"name": f"B{i}", "email": f"b{i}@unilink.com", "phone_numbers": []} for i in range(5)]
+        import_contacts(ndjson(*rows), "ndjson", batch_size=2, progress=lambda stats: reports.append(stats["rows"]))
+        self.assertEqual(reports, [2, 4, 5])
+        self.assertEqual(Contact.objects.count(), 5)
+
+    def test_worker_pool(self):
+        rows = [{"name": f"W{i}", "email": f"w{i}@unilink.com",
+                 "phone_numbers": [{"number": str(i), "type": "work"}]} for i in range(20)]
+        stats = import_contacts(ndjson(*rows), "ndjson", batch_size=3, workers=2)
+        self.assertEqual(stats["imported"], 20)
+        self.assertEqual(PhoneNumber.objects.count(), 20)
+
+    def test_export_round_trip_through_gzipped_csv(self):
+        contact = Contact.objects.create(name="Round", email="round@unilink.com")
+        PhoneNumber.objects.create(contact=contact, number="555", type="work")
+        exported = b"".join(export_contacts("csv", compress=True))
+        Contact.objects.all().delete()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contacts.csv.gz")
+            rejects = os.path.join(directory, "rejects.ndjson")
+            with open(path, "wb") as stream:
+                stream.write(exported)
+            out = io.StringIO()
+            call_command("import_contacts", path, "--workers", "0", "--rejects", rejects, stdout=out, stderr=io.StringIO())
+            self.assertIn("Imported 1 contacts", out.getvalue())
+            with open(rejects) as stream:
+                self.assertEqual(stream.read(), "")
+
+        contact = Contact.objects.get(email="round@unilink.com")
+        self.assertEqual(list(contact.phone_numbers.values_list("type", "number")), [("work", "555")])
+
+    def test_plain_gzip_detection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "contacts.ndjson")
+            with gzip.open(path, "wt") as stream:
+                stream.write('{"name": "Gz", "email": "gz@unilink.com", "phone_numbers": []}\n')
+            call_command("import_contacts", path, "--workers", "0", stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertTrue(Contact.objects.filter(email="gz@unilink.com").exists())
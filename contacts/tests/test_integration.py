@@ -61,8 +61,8 @@ class ContactIntegrationTests(APITestCase):
         Contact.objects.create(name="EmailFilter", email="findme@example.com")
         response = self.client.get("/api/contacts/?search=findme@example.com")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["email"], "findme@example.com")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["email"], "findme@example.com")
 
     def test_filter_by_phone_number(self):
         contact = Contact.objects.create(name="PhoneFilter", email="pf@example.com")
@@ -70,5 +70,5 @@ class ContactIntegrationTests(APITestCase):
 
         response = self.client.get("/api/contacts/?search=7890")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["name"], "PhoneFilter")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["name"], "PhoneFilter")
@@ -0,0 +1,55 @@
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from contacts.metrics import registry
+from contacts.models import Contact, PhoneNumber
+from contacts.tests.utils import DUMMY_CACHES
+
+
+@override_settings(CONTACTS_METRICS_ENABLED=True, CACHES=DUMMY_CACHES)
+class QueryMetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        contact = Contact.objects.create(name="Alice", email="alice@example.com")
+        PhoneNumber.objects.create(contact=contact, number="+44 1234", type="mobile")
+        self.contact = contact
+
+    def histogram(self, name, view):
+        return registry._histograms[(name, view)]
+
+    def test_records_queries_and_sizes_per_view(self):
+        response = self.client.get("/api/contacts/")
+        self.client.get(f"/api/contacts/{self.contact.id}/")
+
+        queries = self.histogram("contacts_db_queries", "contacts-list")
+        self.assertEqual(queries.count, 1)
+        self.assertGreater(queries.total, 0)
+        self.assertEqual(self.histogram("contacts_response_size_bytes", "contacts-list").total,
+                         len(response.content))
+        self.assertGreater(self.histogram("contacts_serializer_duration_seconds", "contacts-list").total, 0)
+        self.assertEqual(self.histogram("contacts_request_duration_seconds", "contacts-detail").count, 1)
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.client.get("/api/contacts/")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE contacts_db_queries histogram", body)
+        self.assertIn('contacts_db_queries_bucket{view="contacts-list",le="+Inf"} 1', body)
+        self.assertIn('contacts_request_duration_seconds_count{view="contacts-list"} 1', body)
+
+    @override_settings(CONTACTS_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        with self.assertLogs("contacts.metrics", level="WARNING") as logs:
+            self.client.get("/api/contacts/")
+        self.assertIn("Slow request GET /api/contacts/", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+
+class MetricsDisabledTests(APITestCase):
+    def test_metrics_endpoint_is_hidden_when_disabled(self):
+        registry.reset()
+        self.client.get("/api/contacts/")
+        self.assertEqual(registry._histograms, {})
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_404_NOT_FOUND)
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.db import IntegrityError
 from django.core.exceptions import ValidationError
-from contacts.models import Contact, PhoneNumber
+from contacts.models import Contact, PhoneNumber, canonical_phone, normalize_phone
 
 
 class TestContactModel(TestCase):
@@ -14,6 +14,19 @@ class TestContactModel(TestCase):
         with self.assertRaises(IntegrityError):
             Contact.objects.create(name="Jane", email="john@unilink.com")
 
+    def test_email_canonical_follows_email(self):
+        contact = Contact.objects.create(name="John", email="John@Unilink.COM")
+        self.assertEqual(contact.email_canonical, "john@unilink.com")
+        contact.email = "JOHNNY@unilink.com"
+        contact.save(update_fields=["email"])
+        contact.refresh_from_db()
+        self.assertEqual(contact.email_canonical, "johnny@unilink.com")
+
+    def test_emails_differing_only_by_case_fail(self):
+        Contact.objects.create(name="John", email="john@unilink.com")
+        with self.assertRaises(IntegrityError):
+            Contact.objects.create(name="Jane", email="John@Unilink.com")
+
     def test_blank_email_fails(self):
         contact = Contact(name="John", email="")
         with self.assertRaises(Exception):
@@ -50,6 +63,15 @@ class TestPhoneNumber(TestCase):
         except IntegrityError:
             self.fail("Should allow same phone type on different contacts")
 
+    def test_number_canonical_drops_international_prefix(self):
+        contact = Contact.objects.create(name="John", email="john@unilink.com")
+        phone = PhoneNumber.objects.create(contact=contact, number="0044 20 7946 0958", type="work")
+        self.assertEqual(phone.number_digits, "00442079460958")
+        self.assertEqual(phone.number_canonical, "442079460958")
+        self.assertEqual(canonical_phone("+44 (20) 7946-0958"), phone.number_canonical)
+        self.assertEqual(canonical_phone("020 7946 0958"), "02079460958")
+        self.assertEqual(normalize_phone("+44 (20) 7946-0958"), "442079460958")
+
     def test_phone_number_str_representation(self):
         contact = Contact.objects.create(name="Bob", email="bob@unilink.com")
         phone = PhoneNumber.objects.create(contact=contact, number="88888", type="work")
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from contacts.models import Contact, PhoneNumber
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        # Two pairs of contacts share a timestamp to exercise the `id` tie-breaker
+        now = timezone.now()
+        for i in range(5):
+            Contact.objects.create(name=f"Contact {i}", email=f"page{i}@unilink.com")
+        Contact.objects.filter(email__in=["page1@unilink.com", "page2@unilink.com"]).update(created_at=now)
+        Contact.objects.filter(email__in=["page3@unilink.com", "page4@unilink.com"]).update(
+            created_at=now + timedelta(seconds=1)
+        )
+        Contact.objects.filter(email="page0@unilink.com").update(created_at=now - timedelta(seconds=1))
+
+    def collect(self, url):
+        emails = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            emails.extend(item["email"] for item in response.data["results"])
+            url = response.data["next"]
+        return emails
+
+    def test_pages_cover_every_contact_once_in_order(self):
+        emails = self.collect("/api/contacts/?page_size=2")
+        self.assertEqual(emails, [f"page{i}@unilink.com" for i in range(5)])
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get("/api/contacts/?page_size=2")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+
+    def test_first_page_has_no_previous_link(self):
+        response = self.client.get("/api/contacts/?page_size=10")
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 5)
+
+    @override_settings(CONTACTS_MAX_PAGE_SIZE=3)
+    def test_page_size_is_capped(self):
+        response = self.client.get("/api/contacts/?page_size=100")
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get("/api/contacts/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_is_a_single_range_query(self):
+        first = self.client.get("/api/contacts/?page_size=2")
+        # One query for the contacts page, one for the prefetched phone numbers
+        with self.assertNumQueries(2):
+            self.client.get(first.data["next"])
+
+    def test_phone_numbers_paginate_by_id(self):
+        contact = Contact.objects.first()
+        for phone_type in ("mobile", "work", "home"):
+            PhoneNumber.objects.create(contact=contact, number="1", type=phone_type)
+        response = self.client.get("/api/phone-numbers/?page_size=2")
+        self.assertEqual(len(response.data["results"]), 2)
+        rest = self.client.get(response.data["next"])
+        self.assertEqual(len(rest.data["results"]), 1)
+        self.assertIsNone(rest.data["next"])
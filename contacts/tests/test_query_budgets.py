@@ -0,0 +1,138 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from contacts.models import Contact, PhoneNumber
+from contacts.tests.query_budget import QueryBudgetMixin
+from contacts.tests.utils import DUMMY_CACHES
+
+PHONE_TYPES = ("mobile", "work", "home")
+
+
+def add_contacts(total):
+    """Grows the contact table to `total` contacts, each with a phone number of every type."""
+    for index in range(Contact.objects.count(), total):
+        contact = Contact.objects.create(name=f"Contact {index}", email=f"contact{index}@example.com")
+        for phone_type in PHONE_TYPES:
+            PhoneNumber.objects.create(contact=contact, number=f"+44 20 {index:04d}", type=phone_type)
+
+
+def contact_with_phones(phones):
+    """A new contact with `phones` phone numbers (at most one per type)."""
+    index = Contact.objects.count()
+    contact = Contact.objects.create(name=f"Detail {index}", email=f"detail{index}@example.com")
+    contact.phones = [
+        PhoneNumber.objects.create(contact=contact, number=f"+44 77 {index:04d}", type=phone_type)
+        for phone_type in PHONE_TYPES[:phones]
+    ]
+    return contact
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class ContactViewSetQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_list(self):
+        response = self.assertQueryCountConstant(add_contacts, lambda _: self.get("/api/contacts/"))
+        self.assertEqual(len(response.data["results"]), 12)
+
+    def test_list_filtered(self):
+        self.assertQueryCountConstant(add_contacts, lambda _: self.get("/api/contacts/", name="Contact", phone="44"))
+
+    def test_export(self):
+        def export(_):
+            response = self.get("/api/contacts/export/", file_format="csv")
+            return b"".join(response.streaming_content)
+        self.assertQueryCountConstant(add_contacts, export)
+
+    def test_retrieve(self):
+        self.assertQueryCountConstant(
+            contact_with_phones, lambda contact: self.get(f"/api/contacts/{contact.id}/"), sizes=(1, 3),
+        )
+
+    def test_update(self):
+        def update(contact):
+            payload = {
+                "name": "Updated",
+                "email": contact.email,
+                "phone_numbers": [
+                    {"number": f"+1 555 000{index}", "type": phone.type}
+                    for index, phone in enumerate(contact.phones)
+                ],
+            }
+            response = self.client.put(f"/api/contacts/{contact.id}/", payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertQueryCountConstant(contact_with_phones, update, sizes=(1, 3))
+
+    def test_partial_update(self):
+        def partial_update(contact):
+            response = self.client.patch(f"/api/contacts/{contact.id}/", {"name": "Patched"}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertQueryCountConstant(contact_with_phones, partial_update, sizes=(1, 3))
+
+    def test_destroy(self):
+        def destroy(contact):
+            response = self.client.delete(f"/api/contacts/{contact.id}/")
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertQueryCountConstant(contact_with_phones, destroy, sizes=(1, 3))
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class PhoneNumberViewSetQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def test_list(self):
+        def phone_list(_):
+            response = self.client.get("/api/phone-numbers/", {"page_size": 100})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return response
+        response = self.assertQueryCountConstant(add_contacts, phone_list)
+        self.assertEqual(len(response.data["results"]), 36)
+
+    def test_retrieve(self):
+        def retrieve(contact):
+            response = self.client.get(f"/api/phone-numbers/{contact.phones[0].id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertQueryCountConstant(contact_with_phones, retrieve, sizes=(1, 3))
+
+
+class AdminQueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(admin)
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_contact_changelist(self):
+        self.assertQueryCountConstant(add_contacts, lambda _: self.get("/admin/contacts/contact/"))
+
+    def test_contact_change_form(self):
+        self.assertQueryCountConstant(
+            contact_with_phones, lambda contact: self.get(f"/admin/contacts/contact/{contact.id}/change/"),
+            sizes=(1, 3),
+        )
+
+    def test_phone_number_changelist(self):
+        self.assertQueryCountConstant(add_contacts, lambda _: self.get("/admin/contacts/phonenumber/"))
+
+
+class QueryBudgetMixinTests(QueryBudgetMixin, APITestCase):
+    def test_reports_growing_query_counts_with_their_sql(self):
+        add_contacts(3)
+
+        def per_row(_):
+            for contact in Contact.objects.all():
+                list(contact.phone_numbers.all())
+
+        with self.assertRaises(AssertionError) as raised:
+            self.assertQueryCountConstant(add_contacts, per_row, sizes=(3, 5))
+        self.assertIn("3 rows -> 4 queries, 5 rows -> 6 queries", str(raised.exception))
+        self.assertIn('FROM "contacts_phonenumber"', str(raised.exception))
+
+    def test_max_queries(self):
+        with self.assertRaises(AssertionError):
+            self.assertQueryCountConstant(add_contacts, lambda _: list(Contact.objects.all()), max_queries=0)
@@ -0,0 +1,77 @@
+import io
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from contacts.models import Contact
+from contacts.parsers import FastJSONParser
+from contacts.renderers import FastJSONRenderer, orjson
+
+PAYLOAD = {
+    "utc": datetime(2025, 7, 22, 15, 27, 0, 123456, tzinfo=timezone.utc),
+    "zoneinfo_utc": datetime(2025, 7, 22, 15, 27, tzinfo=ZoneInfo("UTC")),
+    "offset": datetime(2025, 7, 22, 15, 27, tzinfo=ZoneInfo("Europe/London")),
+    "naive": datetime(2025, 7, 22, 15, 27),
+    "date": date(2025, 7, 22),
+    "decimal": Decimal("1.50"),
+    "duration": timedelta(minutes=3),
+    "lazy": gettext_lazy("This field is required."),
+    "text": "Zoë \"Ñandú\" \u2028\u2029 </script>",
+    1: [True, None, 1.5, -3],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_matches_drf(self):
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_no_data_renders_nothing(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_indented_output_falls_back_to_drf(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_falls_back_to_drf_without_orjson(self):
+        with mock.patch("contacts.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body, encoding="utf-8"):
+        return FastJSONParser().parse(io.BytesIO(body), parser_context={"encoding": encoding})
+
+    def test_parses_utf8(self):
+        self.assertEqual(self.parse('{"name": "Zoë", "n": [1, 2.5]}'.encode()), {"name": "Zoë", "n": [1, 2.5]})
+
+    def test_honours_the_request_encoding(self):
+        self.assertEqual(self.parse('{"name": "Zoë"}'.encode("latin-1"), encoding="latin-1"), {"name": "Zoë"})
+
+    def test_invalid_json_is_a_parse_error(self):
+        for body in (b"{", b'{"a": NaN}', b"\xff"):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(body)
+
+    def test_falls_back_to_drf_without_orjson(self):
+        with mock.patch("contacts.parsers.orjson", None):
+            self.assertEqual(self.parse(b'{"a": [1]}'), {"a": [1]})
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class FastJSONSettingsTests(TestCase):
+    def test_api_renders_and_parses_with_orjson(self):
+        payload = {"name": "Zoë", "email": "zoe@example.com", "phone_numbers": [{"number": "1", "type": "home"}]}
+        with mock.patch("contacts.parsers.orjson.loads", wraps=orjson.loads) as loads, \
+                mock.patch("contacts.renderers.orjson.dumps", wraps=orjson.dumps) as dumps:
+            response = self.client.post("/api/contacts/", payload, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        loads.assert_called_once()
+        dumps.assert_called_once()
+        created = Contact.objects.get()
+        self.assertEqual(response.json()["created_at"], created.created_at.isoformat().replace("+00:00", "Z"))
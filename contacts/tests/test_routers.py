@@ -0,0 +1,131 @@
+import time
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from contacts.benchmarks.concurrency import temporary_sqlite_database
+from contacts.middleware import ReplicaRoutingMiddleware
+from contacts.models import Contact
+from contacts.routers import ReplicaRouter, replica_reads
+from contacts.tests.utils import DUMMY_CACHES
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    router = ReplicaRouter()
+
+    def setUp(self):
+        patcher = mock.patch("contacts.routers.replica_configured", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_use_the_replica_only_when_allowed(self):
+        self.assertEqual(self.router.db_for_read(Contact), "default")
+        token = replica_reads.set(True)
+        try:
+            self.assertEqual(self.router.db_for_read(Contact), "replica")
+            with mock.patch("contacts.routers.replica_configured", return_value=False):
+                self.assertEqual(self.router.db_for_read(Contact), "default")
+        finally:
+            replica_reads.reset(token)
+
+    def test_writes_and_migrations_use_the_primary(self):
+        self.assertEqual(self.router.db_for_write(Contact), "default")
+        self.assertTrue(self.router.allow_migrate("default", "contacts"))
+        self.assertFalse(self.router.allow_migrate("replica", "contacts"))
+
+    def test_related_lookups_follow_their_instance(self):
+        contact = Contact(name="Alice", email="alice@example.com")
+        contact._state.db = "replica"
+        self.assertEqual(self.router.db_for_read(Contact, instance=contact), "replica")
+
+
+@unittest.skipIf("replica" in settings.DATABASES, "Needs the replica alias for its own SQLite file")
+@override_settings(
+    DATABASE_ROUTERS=["contacts.routers.ReplicaRouter"], CONTACTS_REPLICA_PIN_SECONDS=30, CACHES=DUMMY_CACHES,
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Runs against two SQLite files: the test database as primary and a separate replica."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Allowed after the test database checks, which only know the configured aliases
+        cls.databases = {"default", "replica"}
+        cls.enterClassContext(temporary_sqlite_database("replica"))
+
+    def setUp(self):
+        # The files never replicate, so each row shows which database served a read
+        Contact.objects.create(name="On Primary", email="primary@example.com")
+        # bulk_create: the change signal receivers only write to the primary. The replica isn't
+        # flushed between tests (the router keeps it out of flushes), hence ignore_conflicts
+        Contact.objects.using("replica").bulk_create(
+            [Contact(name="On Replica", email="replica@example.com", email_canonical="replica@example.com")], ignore_conflicts=True,
+        )
+        self.client = APIClient()
+
+    def delete_from_replica(self, pk):
+        # Raw SQL: the change signals of a model delete would write to the primary
+        with connections["replica"].cursor() as cursor:
+            cursor.execute("DELETE FROM contacts_contact WHERE id = %s", [pk])
+
+    def names(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [contact["name"] for contact in response.data["results"]]
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.names(self.client.get("/api/contacts/")), ["On Replica"])
+        self.assertEqual(self.client.get("/api/phone-numbers/").status_code, status.HTTP_200_OK)
+
+    def test_writes_go_to_the_primary_and_pin_the_client(self):
+        payload = {"name": "Created", "email": "created@example.com", "phone_numbers": []}
+        response = self.client.post("/api/contacts/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Contact.objects.filter(email="created@example.com").exists())
+        self.assertIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+        # The cookie sent back keeps this client's reads on the primary
+        self.assertEqual(self.names(self.client.get("/api/contacts/")), ["On Primary", "Created"])
+        self.assertEqual(self.names(APIClient().get("/api/contacts/")), ["On Replica"])
+
+    def test_pin_header_for_clients_without_cookies(self):
+        response = self.client.post(
+            "/api/contacts/", {"name": "Created", "email": "created@example.com", "phone_numbers": []}, format="json",
+        )
+        pin = response[ReplicaRoutingMiddleware.pin_header]
+        response = APIClient().get("/api/contacts/", headers={ReplicaRoutingMiddleware.pin_header: pin})
+        self.assertEqual(self.names(response), ["On Primary", "Created"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_cached_replica_reads_dont_hide_the_clients_own_writes(self):
+        contact = Contact.objects.create(pk=1000, name="Before", email="lag@example.com")
+        # The replica lags behind the write below
+        Contact.objects.using("replica").bulk_create(
+            [Contact(pk=contact.pk, name="Before", email="lag@example.com", email_canonical="lag@example.com")],
+        )
+        self.addCleanup(self.delete_from_replica, contact.pk)
+        response = self.client.patch(f"/api/contacts/{contact.pk}/", {"name": "After"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Another client reads from the replica after the write bumped the cache versions...
+        self.assertEqual(APIClient().get(f"/api/contacts/{contact.pk}/").data["name"], "Before")
+        self.assertEqual(self.names(APIClient().get("/api/contacts/")), ["On Replica", "Before"])
+        # ...without caching what it read for the pinned writer
+        self.assertEqual(self.client.get(f"/api/contacts/{contact.pk}/").data["name"], "After")
+        self.assertEqual(self.names(self.client.get("/api/contacts/")), ["On Primary", "After"])
+        # Whose primary reads fill the cache for everyone
+        self.assertEqual(APIClient().get(f"/api/contacts/{contact.pk}/").data["name"], "After")
+
+    def test_expired_pins_and_failed_writes_dont_pin(self):
+        self.client.cookies[ReplicaRoutingMiddleware.pin_cookie] = str(time.time() - 1)
+        self.assertEqual(self.names(self.client.get("/api/contacts/")), ["On Replica"])
+
+        response = APIClient().post("/api/contacts/", {"name": "No email"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn(ReplicaRoutingMiddleware.pin_cookie, response.cookies)
+
+    def test_reads_outside_replica_views_use_the_primary(self):
+        self.assertEqual(list(Contact.objects.values_list("name", flat=True)), ["On Primary"])
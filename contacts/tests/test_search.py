@@ -0,0 +1,75 @@
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from contacts.models import Contact, ContactSearchGram, PhoneNumber
+from contacts.search import trigrams
+
+
+class SearchIndexTests(TestCase):
+    def grams(self, contact, field):
+        return set(
+            ContactSearchGram.objects.filter(contact=contact, field=field).values_list("gram", flat=True)
+        )
+
+    def test_phone_number_is_normalized_to_digits(self):
+        contact = Contact.objects.create(name="Digits", email="digits@unilink.com")
+        phone = PhoneNumber.objects.create(contact=contact, number="+44 (20) 7946-0958", type="work")
+        self.assertEqual(phone.number_digits, "442079460958")
+
+    def test_grams_follow_contact_and_phone_writes(self):
+        contact = Contact.objects.create(name="Ann", email="ann@unilink.com")
+        self.assertEqual(self.grams(contact, ContactSearchGram.NAME), {"ann"})
+
+        phone = PhoneNumber.objects.create(contact=contact, number="1234", type="mobile")
+        self.assertEqual(self.grams(contact, ContactSearchGram.PHONE), {"123", "234"})
+
+        phone.number = "987"
+        phone.save()
+        self.assertEqual(self.grams(contact, ContactSearchGram.PHONE), {"987"})
+
+        phone.delete()
+        self.assertEqual(self.grams(contact, ContactSearchGram.PHONE), set())
+
+        contact.name = "Anna"
+        contact.save()
+        self.assertEqual(self.grams(contact, ContactSearchGram.NAME), {"ann", "nna"})
+
+    def test_grams_removed_with_contact(self):
+        contact = Contact.objects.create(name="Gone", email="gone@unilink.com")
+        PhoneNumber.objects.create(contact=contact, number="5555", type="home")
+        contact.delete()
+        self.assertEqual(ContactSearchGram.objects.count(), 0)
+
+    def test_trigrams_are_case_insensitive(self):
+        self.assertEqual(trigrams("AbCd"), {"abc", "bcd"})
+        self.assertEqual(trigrams("ab"), set())
+
+
+class SearchFilterTests(APITestCase):
+    def setUp(self):
+        self.alice = Contact.objects.create(name="Alice Smith", email="alice.s@unilink.com")
+        self.bob = Contact.objects.create(name="Bob Smithers", email="bob.s@unilink.com")
+        PhoneNumber.objects.create(contact=self.alice, number="+44 20 7946 0958", type="work")
+        PhoneNumber.objects.create(contact=self.bob, number="07700 900123", type="mobile")
+
+    def names(self, query):
+        response = self.client.get(f"/api/contacts/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return sorted(item["name"] for item in response.data["results"])
+
+    def test_name_substring_is_case_insensitive(self):
+        self.assertEqual(self.names("name=smith"), ["Alice Smith", "Bob Smithers"])
+        self.assertEqual(self.names("name=THERS"), ["Bob Smithers"])
+
+    def test_name_with_all_grams_but_no_substring_is_excluded(self):
+        # "smi" and "ith" are both grams of "Smith", but "smith ith" is not a substring
+        self.assertEqual(self.names("name=smi%20ith"), [])
+
+    def test_short_name_falls_back_to_scan(self):
+        self.assertEqual(self.names("name=bo"), ["Bob Smithers"])
+
+    def test_phone_search_ignores_formatting(self):
+        self.assertEqual(self.names("phone=7946-0958"), ["Alice Smith"])
+        self.assertEqual(self.names("phone=(900)%20123"), ["Bob Smithers"])
+
+    def test_short_phone_search(self):
+        self.assertEqual(self.names("phone=77"), ["Bob Smithers"])
@@ -1,6 +1,9 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from contacts.models import Contact, PhoneNumber
-from contacts.serializers import ContactSerializer
+from contacts.serializers import BulkContactSerializer, BulkItemMixin, ContactSerializer
+from contacts.signals import contacts_changed
 from rest_framework.exceptions import ValidationError
 
 
@@ -97,6 +100,22 @@ class ContactSerializerTests(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn("email", serializer.errors)
 
+    def test_create_contact_email_differing_by_case_fails(self):
+        Contact.objects.create(name="Dupe", email="duplicate@unilink.com")
+        payload = {"name": "New", "email": "Duplicate@Unilink.com", "phone_numbers": []}
+        serializer = ContactSerializer(data=payload)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("email", serializer.errors)
+
+    def test_update_may_change_the_case_of_its_own_email(self):
+        contact = Contact.objects.create(name="Case", email="case@unilink.com")
+        payload = {"name": "Case", "email": "Case@Unilink.com", "phone_numbers": []}
+        serializer = ContactSerializer(contact, data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        contact.refresh_from_db()
+        self.assertEqual((contact.email, contact.email_canonical), ("Case@Unilink.com", "case@unilink.com"))
+
     def test_create_contact_with_non_list_phone_numbers_fails(self):
         payload = {
             "name": "Bad",
@@ -125,4 +144,134 @@ class ContactSerializerTests(TestCase):
         serializer = ContactSerializer(contact, data=payload, partial=True)
         self.assertTrue(serializer.is_valid(), serializer.errors)
         updated = serializer.save()
-        self.assertEqual(updated.phone_numbers.count(), 1)
\ No newline at end of file
+        self.assertEqual(updated.phone_numbers.count(), 1)
+
+    def test_update_reconciles_phone_numbers_by_type(self):
+        contact = Contact.objects.create(name="Diff", email="diff@unilink.com")
+        kept = PhoneNumber.objects.create(contact=contact, number="1000", type="mobile")
+        changed = PhoneNumber.objects.create(contact=contact, number="2000", type="work")
+        PhoneNumber.objects.create(contact=contact, number="3000", type="home")
+
+        payload = {
+            "name": "Diff",
+            "email": "diff@unilink.com",
+            "phone_numbers": [
+                {"number": "1000", "type": "mobile"},
+                {"number": "2001", "type": "work"},
+            ]
+        }
+        serializer = ContactSerializer(contact, data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        phones = {phone.type: phone for phone in contact.phone_numbers.all()}
+        self.assertEqual(sorted(phones), ["mobile", "work"])
+        self.assertEqual(phones["mobile"].pk, kept.pk)
+        self.assertEqual(phones["work"].pk, changed.pk)
+        self.assertEqual(phones["work"].number, "2001")
+
+    def test_update_phone_numbers_query_budget(self):
+        contact = Contact.objects.create(name="Fixed", email="fixed@unilink.com")
+        PhoneNumber.objects.create(contact=contact, number="1", type="mobile")
+        PhoneNumber.objects.create(contact=contact, number="2", type="work")
+
+        payload = {
+            "name": "Fixed",
+            "email": "fixed@unilink.com",
+            "phone_numbers": [
+                {"number": "9", "type": "work"},
+                {"number": "3", "type": "home"},
+            ]
+        }
+        serializer = ContactSerializer(contact, data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        # savepoint, select phones, delete (select + delete), bulk update, bulk insert, contact update,
+        # then one change notification: reindex (select name, select digits, savepoint, delete grams,
+        # insert grams, release), revision bump; release. The change log is written after the commit.
+        with self.assertNumQueries(15):
+            serializer.save()
+
+    def test_update_phone_numbers_uses_constant_queries(self):
+        def update_query_count(email, phone_types):
+            contact = Contact.objects.create(name="Fixed", email=email)
+            for phone_type in phone_types:
+                PhoneNumber.objects.create(contact=contact, number="1", type=phone_type)
+            payload = {
+                "name": "Fixed",
+                "email": email,
+                # Changes one existing number and drops the rest
+                "phone_numbers": [{"number": "9", "type": "mobile"}]
+            }
+            serializer = ContactSerializer(contact, data=payload)
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            with CaptureQueriesContext(connection) as queries:
+                serializer.save()
+            return len(queries)
+
+        self.assertEqual(
+            update_query_count("few@unilink.com", ["mobile", "work"]),
+            update_query_count("many@unilink.com", ["mobile", "work", "home"]),
+        )
+
+
+class ContactSerializerNotificationTests(TestCase):
+    def setUp(self):
+        self.notifications = []
+
+        def receiver(sender, signal, **kwargs):
+            self.notifications.append(kwargs)
+        contacts_changed.connect(receiver, weak=False)
+        self.addCleanup(contacts_changed.disconnect, receiver)
+
+    def test_create_notifies_once(self):
+        payload = {"name": "Once", "email": "once@unilink.com",
+                   "phone_numbers": [{"number": "1", "type": "mobile"}, {"number": "2", "type": "work"}]}
+        serializer = ContactSerializer(data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        contact = serializer.save()
+        self.assertEqual(self.notifications, [{"contact_ids": [contact.pk], "deleted": False, "created": True}])
+
+    def test_update_notifies_once(self):
+        contact = Contact.objects.create(name="Once", email="once@unilink.com")
+        PhoneNumber.objects.create(contact=contact, number="1", type="mobile")
+        self.notifications.clear()
+        payload = {"name": "Twice", "email": "once@unilink.com", "phone_numbers": [{"number": "2", "type": "work"}]}
+        serializer = ContactSerializer(contact, data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(self.notifications, [{"contact_ids": [contact.pk], "deleted": False, "created": False}])
+
+
+class BulkContactSerializerFastPathTests(TestCase):
+    VALID = {"name": " Ann ", "email": "Ann@Example.com ", "phone_numbers": [{"number": " +44 1 ", "type": "home"}]}
+
+    def variants(self):
+        phone = self.VALID["phone_numbers"][0]
+        yield self.VALID
+        yield {**self.VALID, "id": 7, "created_at": "x", "unknown": 1}
+        yield {**self.VALID, "phone_numbers": [{**phone, "id": 3}, {"number": "2", "type": "work"}]}
+        yield {**self.VALID, "phone_numbers": []}
+        for name in ("", "   ", "x" * 101, "a\x00b", "\ud800", 12, None, True, ["a"]):
+            yield {**self.VALID, "name": name}
+        for email in ("not-an-email", "", "a@b", 5, "a@example.com\x00", "x" * 250 + "@example.com"):
+            yield {**self.VALID, "email": email}
+        for phones in (None, "1", {}, [1], [{"number": "1", "type": "fax"}], [{"number": "1", "type": ["home"]}],
+                       [{"number": "1" * 21, "type": "home"}], [{"number": 12, "type": "home"}],
+                       [{"number": "1", "type": "home"}, {"number": "2", "type": "home"}]):
+            yield {**self.VALID, "phone_numbers": phones}
+        yield {key: value for key, value in self.VALID.items() if key != "email"}
+        yield ["not", "a", "dict"]
+
+    def test_fast_path_agrees_with_the_serializer(self):
+        serializer = BulkContactSerializer()
+        for item in self.variants():
+            with self.subTest(item=item):
+                expected = BulkItemMixin.validate_item(serializer, item)
+                self.assertEqual(serializer.validate_item(item), expected)
+                fast = serializer.fast_validated(item)
+                self.assertTrue(fast is None or (fast, None) == expected)
+
+    def test_plain_valid_items_skip_the_fields(self):
+        self.assertEqual(BulkContactSerializer().fast_validated(self.VALID), {
+            "name": "Ann", "email": "Ann@Example.com", "phone_numbers": [{"number": "+44 1", "type": "home"}],
+        })
@@ -0,0 +1,82 @@
+from django.http import QueryDict
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+from contacts.models import Contact, PhoneNumber
+from contacts.serializers import ContactSerializer, sparse_fields
+from contacts.tests.utils import DUMMY_CACHES
+
+
+class SparseFieldsTests(SimpleTestCase):
+    def fields(self, query):
+        return sparse_fields(QueryDict(query))
+
+    def test_every_field_by_default(self):
+        self.assertEqual(self.fields(""), ContactSerializer.Meta.fields)
+        self.assertEqual(self.fields("expand=phone_numbers"), ContactSerializer.Meta.fields)
+
+    def test_requested_fields_in_serializer_order(self):
+        self.assertEqual(self.fields("fields=email, id"), ("id", "email"))
+        self.assertEqual(self.fields("fields=email&fields=name"), ("name", "email"))
+
+    def test_expand_adds_phone_numbers(self):
+        self.assertEqual(self.fields("fields=id&expand=phone_numbers"), ("id", "phone_numbers"))
+
+    def test_unknown_names_are_rejected(self):
+        for query in ("fields=id,password", "fields=", "expand=contact"):
+            with self.subTest(query=query), self.assertRaises(ValidationError):
+                self.fields(query)
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class SparseFieldsetAPITests(APITestCase):
+    def setUp(self):
+        for index in range(3):
+            self.contact = Contact.objects.create(name=f"Person {index}", email=f"person{index}@example.com")
+            PhoneNumber.objects.create(contact=self.contact, number=f"+44 20 000{index}", type="mobile")
+
+    def test_list_without_phone_numbers_takes_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/contacts/", {"fields": "id,email", "page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        first = Contact.objects.get(email="person0@example.com")
+        self.assertEqual(response.data["results"][0], {"id": first.pk, "email": first.email})
+        self.assertIsNotNone(response.data["next"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([item["email"] for item in response.data["results"]], ["person2@example.com"])
+
+    def test_list_with_expanded_phone_numbers(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/contacts/", {"fields": "email", "expand": "phone_numbers"})
+        self.assertEqual(set(response.data["results"][0]), {"email", "phone_numbers"})
+        self.assertEqual(response.data["results"][0]["phone_numbers"][0]["number"], "+44 20 0000")
+
+    def test_retrieve_selects_only_the_requested_columns(self):
+        with self.assertNumQueries(2) as queries:  # conditional request validators, then the contact
+            response = self.client.get(f"/api/contacts/{self.contact.pk}/", {"fields": "name"})
+        self.assertEqual(response.data, {"name": "Person 2"})
+        self.assertNotIn('"email"', queries.captured_queries[-1]["sql"])
+
+    def test_sparse_representations_have_their_own_etag(self):
+        url = f"/api/contacts/{self.contact.pk}/"
+        full = self.client.get(url)["ETag"]
+        sparse = self.client.get(url, {"fields": "id,name"})["ETag"]
+        self.assertNotEqual(full, sparse)
+        response = self.client.get(url, {"fields": "id,name"}, HTTP_IF_NONE_MATCH=sparse)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=sparse)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_field_is_a_bad_request(self):
+        response = self.client.get("/api/contacts/", {"fields": "id,secret"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.data)
+        response = self.client.get(f"/api/contacts/{self.contact.pk}/", {"expand": "everything"})
+        self.assertEqual(response.status_code, 400)
+
+
+class SparseFieldsetCacheTests(APITestCase):
+    def test_cached_pages_are_kept_per_fieldset(self):
+        Contact.objects.create(name="Cached", email="cached@example.com")
+        self.assertEqual(set(self.client.get("/api/contacts/", {"fields": "id"}).data["results"][0]), {"id"})
+        self.assertEqual(set(self.client.get("/api/contacts/").data["results"][0]), set(ContactSerializer.Meta.fields))
@@ -1,6 +1,8 @@
 from rest_framework import status
 from rest_framework.test import APITestCase
 from contacts.models import Contact, PhoneNumber
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 
@@ -37,22 +39,22 @@ class TestContactAPI(APITestCase):
 
         response = self.client.get("/api/contacts/")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertIn("phone_numbers", response.data[0])
-        self.assertEqual(response.data[0]['phone_numbers'][0]['number'], "789")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIn("phone_numbers", response.data["results"][0])
+        self.assertEqual(response.data["results"][0]['phone_numbers'][0]['number'], "789")
 
     def test_filter_contact_by_email(self):
         Contact.objects.create(name="FilterEmail", email="filter@unilink.com")
         response = self.client.get("/api/contacts/?search=filter@unilink.com")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_filter_contact_by_phone_number(self):
         contact = Contact.objects.create(name="FilterPhone", email="phone@unilink.com")
         PhoneNumber.objects.create(contact=contact, number="99999", type="mobile")
         response = self.client.get("/api/contacts/?search=99999")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_filter_by_name_and_phone(self):
         Contact.objects.create(name="Alice", email="a@example.com")
@@ -61,8 +63,8 @@ class TestContactAPI(APITestCase):
 
         response = self.client.get("/api/contacts/?name=Bob&phone=9999")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], "Bob")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]['name'], "Bob")
 
     def test_create_contact_phone_numbers_not_list_fails(self):
         payload = {
@@ -95,8 +97,8 @@ class PhoneNumberViewSetTests(APITestCase):
         PhoneNumber.objects.create(contact=self.contact, number="1234", type="mobile")
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["number"], "1234")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["number"], "1234")
 
     def test_create_phone_number_success(self):
         payload = {"contact": self.contact.id, "number": "5678", "type": "home"}
@@ -121,4 +123,158 @@ class PhoneNumberViewSetTests(APITestCase):
         payload = {"contact": self.contact.id, "number": "9999", "type": "invalid"}
         response = self.client.post(self.url, payload)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("type", response.data)
\ No newline at end of file
+        self.assertIn("type", response.data)
+
+
+class ContactBulkCreateTests(APITestCase):
+    url = "/api/contacts/bulk/"
+
+    def test_bulk_create_contacts_with_phone_numbers(self):
+        payload = [
+            {"name": f"Bulk {i}", "email": f"bulk{i}@unilink.com",
+             "phone_numbers": [{"number": f"{i}00", "type": "mobile"}, {"number": f"{i}01", "type": "work"}]}
+            for i in range(3)
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item["index"] for item in response.data["created"]], [0, 1, 2])
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(Contact.objects.count(), 3)
+        self.assertEqual(PhoneNumber.objects.count(), 6)
+
+    def test_bulk_create_uses_constant_queries(self):
+        def bulk_query_count(prefix, size):
+            payload = [{"name": f"Q {i}", "email": f"{prefix}{i}@unilink.com",
+                        "phone_numbers": [{"number": "1", "type": "home"}]} for i in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, 201)
+            return len(queries)
+
+        self.assertEqual(bulk_query_count("small", 2), bulk_query_count("large", 20))
+
+    def test_bulk_create_reports_errors_per_item(self):
+        Contact.objects.create(name="Taken", email="taken@unilink.com")
+        payload = [
+            {"name": "Ok", "email": "ok@unilink.com", "phone_numbers": []},
+            {"name": "DupType", "email": "duptype@unilink.com",
+             "phone_numbers": [{"number": "1", "type": "home"}, {"number": "2", "type": "home"}]},
+            {"name": "Taken", "email": "taken@unilink.com", "phone_numbers": []},
+            {"name": "Ok again", "email": "ok@unilink.com", "phone_numbers": []},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item["index"] for item in response.data["created"]], [0])
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertIn("phone_numbers", errors[1])
+        self.assertIn("email", errors[2])
+        self.assertIn("email", errors[3])
+
+    def test_bulk_create_compares_emails_regardless_of_case(self):
+        Contact.objects.create(name="Taken", email="taken@unilink.com")
+        payload = [
+            {"name": "Ok", "email": "ok@unilink.com", "phone_numbers": []},
+            {"name": "Taken", "email": "TAKEN@unilink.com", "phone_numbers": []},
+            {"name": "Ok again", "email": "Ok@Unilink.com", "phone_numbers": []},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2])
+        self.assertEqual(Contact.objects.get(name="Ok").email_canonical, "ok@unilink.com")
+
+    def test_bulk_create_all_invalid_returns_400(self):
+        response = self.client.post(self.url, [{"name": "NoEmail"}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Contact.objects.count(), 0)
+
+    def test_bulk_create_requires_list(self):
+        response = self.client.post(self.url, {"name": "Single"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class PhoneNumberBulkTests(APITestCase):
+    upsert_url = "/api/phone-numbers/bulk/"
+    delete_url = "/api/phone-numbers/bulk-delete/"
+
+    def setUp(self):
+        self.contacts = [Contact.objects.create(name=f"Bulk {i}", email=f"phonebulk{i}@unilink.com") for i in range(20)]
+        self.existing = PhoneNumber.objects.create(contact=self.contacts[0], number="111", type="home")
+
+    def test_bulk_upsert_creates_and_updates_on_contact_and_type(self):
+        payload = [
+            {"contact": self.contacts[0].id, "number": "+44 (20) 7946-0958", "type": "home"},
+            {"contact": self.contacts[0].id, "number": "222", "type": "work"},
+        ]
+        response = self.client.post(self.upsert_url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["errors"], [])
+        created = PhoneNumber.objects.get(contact=self.contacts[0], type="work")
+        self.assertEqual(response.data["results"], [
+            {"index": 0, "id": self.existing.id, "status": "updated"},
+            {"index": 1, "id": created.id, "status": "created"},
+        ])
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.number_digits, "442079460958")
+        # bulk writes are announced: the contact's cached detail is refreshed
+        detail = self.client.get(f"/api/contacts/{self.contacts[0].id}/")
+        self.assertEqual(len(detail.data["phone_numbers"]), 2)
+
+    def test_bulk_upsert_uses_constant_queries(self):
+        def upsert_query_count(contacts):
+            payload = [{"contact": contact.id, "number": "1", "type": "mobile"} for contact in contacts]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.upsert_url, payload, format="json")
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        self.assertEqual(upsert_query_count(self.contacts[:2]), upsert_query_count(self.contacts[2:]))
+
+    def test_bulk_upsert_reports_errors_per_item(self):
+        payload = [
+            {"contact": self.contacts[1].id, "number": "1", "type": "mobile"},
+            {"contact": self.contacts[1].id, "number": "2", "type": "mobile"},
+            {"contact": 999999, "number": "3", "type": "mobile"},
+            {"contact": self.contacts[1].id, "number": "4", "type": "fax"},
+        ]
+        response = self.client.post(self.upsert_url, payload, format="json")
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item["index"] for item in response.data["results"]], [0])
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        self.assertIn("type", errors[1])
+        self.assertIn("contact", errors[2])
+        self.assertIn("type", errors[3])
+        self.assertEqual(PhoneNumber.objects.get(contact=self.contacts[1]).number, "1")
+
+    def test_bulk_upsert_requires_list(self):
+        response = self.client.post(self.upsert_url, {"contact": self.contacts[0].id}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete_reports_every_id(self):
+        other = PhoneNumber.objects.create(contact=self.contacts[1], number="2", type="work")
+        response = self.client.post(
+            self.delete_url, {"ids": [self.existing.id, other.id, 999999, "x"]}, format="json",
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["results"], [
+            {"index": 0, "id": self.existing.id, "status": "deleted"},
+            {"index": 1, "id": other.id, "status": "deleted"},
+            {"index": 2, "id": 999999, "status": "not_found"},
+        ])
+        self.assertEqual([error["index"] for error in response.data["errors"]], [3])
+        self.assertFalse(PhoneNumber.objects.exists())
+
+    def test_bulk_delete_uses_constant_queries(self):
+        def delete_query_count(contacts):
+            ids = [PhoneNumber.objects.create(contact=contact, number="1", type="mobile").id for contact in contacts]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.delete_url, {"ids": ids}, format="json")
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        self.assertEqual(delete_query_count(self.contacts[:2]), delete_query_count(self.contacts[2:]))
+
+    def test_bulk_delete_requires_ids(self):
+        response = self.client.post(self.delete_url, [1, 2], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ids", response.data)
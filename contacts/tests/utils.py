@@ -0,0 +1,4 @@
+"""Settings shared by the test modules."""
+
+# Turns off the response cache (contacts/cache.py), so each request reaches the view
+DUMMY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
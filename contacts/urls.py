@@ -1,5 +1,6 @@
 from rest_framework.routers import DefaultRouter
-from contacts.views import ContactViewSet, PhoneNumberViewSet
+from contacts import async_views
+from contacts.views import ContactViewSet, PhoneNumberViewSet, metrics
 from django.urls import path, include
 
 router = DefaultRouter()
@@ -8,4 +9,8 @@ router.register("phone-numbers", PhoneNumberViewSet, basename="phone-number")
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('api/async/contacts/', async_views.contact_list, name='contacts-async-list'),
+    path('api/async/contacts/<int:pk>/', async_views.contact_detail, name='contacts-async-detail'),
+    path('api/events/contacts/', async_views.contact_events, name='contacts-events'),
+    path('metrics', metrics, name='metrics'),
 ]
\ No newline at end of file
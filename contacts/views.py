@@ -1,10 +1,42 @@
-from rest_framework import viewsets
-from contacts.models import Contact, PhoneNumber
-from contacts.serializers import ContactSerializer, PhoneNumberSerializer
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from contacts import cache as response_cache
+from contacts.changes import changes_payload, latest_token, read_changes
+from contacts.conditional import contact_condition, contact_if_match, phone_number_condition
+from contacts.export import CONTENT_TYPES, EXPORT_FORMATS, export_contacts
+from contacts.metrics import registry
+from contacts.fast_serializers import contact_rows, serialize_contact_rows
+from contacts.models import Contact, PhoneNumber, phone_numbers_prefetch
+from contacts.serializers import (
+    ContactSerializer, PhoneNumberSerializer, bulk_create_contacts, bulk_delete_phone_numbers,
+    bulk_upsert_phone_numbers, sparse_fields,
+)
 from contacts.filters import ContactFilter
+from contacts.pagination import KeysetPagination, PhoneNumberKeysetPagination
 from django_filters.rest_framework import DjangoFilterBackend
 
 
+def bulk_status(written, errors, success=status.HTTP_200_OK):
+    """`success` when every item went through, 207 on partial success and 400 when none did."""
+    if not errors:
+        return success
+    return status.HTTP_207_MULTI_STATUS if written else status.HTTP_400_BAD_REQUEST
+
+
+@method_decorator(contact_condition, name="retrieve")
+@method_decorator(contact_condition, name="update")
+@method_decorator(contact_condition, name="partial_update")
+@method_decorator(contact_condition, name="destroy")
+@method_decorator(contact_if_match, name="update")
+@method_decorator(contact_if_match, name="partial_update")
+@method_decorator(contact_if_match, name="destroy")
 class ContactViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing contacts and their phone numbers in one nested API.
@@ -12,13 +44,129 @@ class ContactViewSet(viewsets.ModelViewSet):
     - Nested phone numbers support for create/update.
     - Filtering support via `ContactFilter`.
     - Prefetching improves efficiency when accessing related phone numbers.
+    - Keyset pagination on `(created_at, id)` keeps every page a single index range scan.
+    - List pages and details are served from `contacts.cache` until a write invalidates them.
+    - Details support ETag / Last-Modified (`If-None-Match`, `If-Modified-Since`, `If-Match`).
+    - Safe requests read from the replica, if one is configured (`contacts.routers`).
+    - List pages are built from `.values()` rows (`contacts.fast_serializers`), not ContactSerializer.
+    - `changes/` is a feed of contact writes for incremental sync (`contacts.changes`).
+    - Reads accept sparse fieldsets: `?fields=id,email`, `?expand=phone_numbers`. Columns that
+      weren't asked for aren't selected, and phone numbers aren't read unless asked for.
     """
-    queryset = Contact.objects.all().prefetch_related("phone_numbers")
+    queryset = Contact.objects.all().prefetch_related(phone_numbers_prefetch())
     serializer_class = ContactSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = ContactFilter
+    replica_reads = True
+
+    @cached_property
+    def requested_fields(self):
+        return sparse_fields(self.request.query_params)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            fields = self.requested_fields
+            if "phone_numbers" not in fields:
+                queryset = queryset.prefetch_related(None)
+            queryset = queryset.only(*[field for field in fields if field != "phone_numbers"])
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "retrieve":
+            kwargs.setdefault("fields", self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return response_cache.cached_response(response_cache.list_key(request), lambda: self.list_rows(request))
+
+    def list_rows(self, request):
+        """`ListModelMixin.list` on the read-only fast path: same payload, no model instances."""
+        fields = self.requested_fields
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginator.page_queryset(queryset, request)
+        if page is None:
+            return Response(serialize_contact_rows(list(contact_rows(queryset, fields)), queryset.db, fields))
+        rows = self.paginator.set_page(list(contact_rows(page, fields, extra=self.paginator.ordering)))
+        return self.get_paginated_response(serialize_contact_rows(rows, queryset.db, fields))
+
+    def retrieve(self, request, *args, **kwargs):
+        # Keyed on the integer id that invalidation bumps, so "/05/" can't outlive a write to 5
+        try:
+            contact_id = int(kwargs["pk"])
+        except ValueError:
+            raise Http404
+        return response_cache.cached_response(
+            response_cache.detail_key(request, contact_id),
+            lambda: super(ContactViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Creates many nested contacts in one request.
+        Valid items are inserted in chunks; invalid ones are reported by their index.
+        Responds 201 if everything was created, 207 on partial success and 400 otherwise.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of contacts."]})
+
+        created, errors = bulk_create_contacts(request.data)
+        return Response(
+            {"created": created, "errors": errors}, status=bulk_status(created, errors, status.HTTP_201_CREATED),
+        )
 
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        Contacts changed after `?since=<token>` (default: the start of the log), oldest
+        first, each with its current representation. `?since=latest` only returns the
+        current token, to start following the feed after a full sync.
+        Follow `next` until `has_more` is false, then poll it.
+        """
+        since = request.query_params.get("since", "0")
+        if since == "latest":
+            since, entries, has_more = latest_token(), [], False
+        else:
+            try:
+                since = int(since)
+                if since < 0:
+                    raise ValueError
+            except ValueError:
+                raise ValidationError({"since": ["Invalid token."]})
+            entries, has_more = read_changes(since, self.paginator.get_page_size(request))
 
+        token = entries[-1][0] if entries else since
+        return Response({
+            "results": changes_payload(entries),
+            "token": str(token),
+            "next": replace_query_param(request.build_absolute_uri(), "since", token),
+            "has_more": has_more,
+        })
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Streams every contact (narrowed by the usual filters) as NDJSON or CSV.
+        Query params: `file_format=ndjson|csv` (default ndjson), `compress=gzip`.
+        """
+        file_format = request.query_params.get("file_format", "ndjson")
+        if file_format not in EXPORT_FORMATS:
+            raise ValidationError({"file_format": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]})
+        compress = request.query_params.get("compress") == "gzip"
+
+        queryset = self.filter_queryset(Contact.objects.all())
+        filename = f"contacts.{file_format}{'.gz' if compress else ''}"
+        response = StreamingHttpResponse(
+            export_contacts(file_format, queryset, compress=compress),
+            content_type="application/gzip" if compress else CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+@method_decorator(phone_number_condition, name="retrieve")
 class PhoneNumberViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing PhoneNumber directly (independent from Contact).
@@ -26,7 +174,44 @@ class PhoneNumberViewSet(viewsets.ModelViewSet):
     - `contact` must be provided in the request (POST).
     - DRF will raise 400 if (contact, type) uniqueness is violated.
     - Mainly useful for admin or direct phone number management.
+    - Safe requests read from the replica, if one is configured (`contacts.routers`).
+    - `bulk/` upserts and `bulk-delete/` deletes many rows with batched statements.
     """
     queryset = PhoneNumber.objects.all().select_related("contact")
     serializer_class = PhoneNumberSerializer  # contact required here
-    http_method_names = ['get', 'post']
\ No newline at end of file
+    pagination_class = PhoneNumberKeysetPagination
+    http_method_names = ['get', 'post']
+    replica_reads = True
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Creates or updates many phone numbers, matched on `(contact, type)`.
+        Results and errors are reported by their index in the request.
+        Responds 200 if every item was written, 207 on partial success and 400 otherwise.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of phone numbers."]})
+
+        results, errors = bulk_upsert_phone_numbers(request.data)
+        return Response({"results": results, "errors": errors}, status=bulk_status(results, errors))
+
+    @action(detail=False, methods=["post"], url_path="bulk-delete")
+    def bulk_delete(self, request):
+        """
+        Deletes the phone numbers listed in `{"ids": [...]}`. Ids that don't exist are
+        reported as `not_found`, not as errors.
+        """
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            raise ValidationError({"ids": ["Expected a list of phone number ids."]})
+
+        results, errors = bulk_delete_phone_numbers(ids)
+        return Response({"results": results, "errors": errors}, status=bulk_status(results, errors))
+
+
+def metrics(request):
+    """Prometheus scrape endpoint for the request metrics of this process."""
+    if not getattr(settings, "CONTACTS_METRICS_ENABLED", False):
+        raise Http404
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
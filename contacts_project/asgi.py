@@ -2,6 +2,8 @@
 ASGI config for contacts_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The async contact views and the live event stream (``/api/events/contacts/``)
+need it: ``uvicorn contacts_project.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/